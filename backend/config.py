@@ -19,6 +19,15 @@ class Settings:
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     # Use the new publishable key instead of deprecated anon key
     SUPABASE_PUBLISHABLE_KEY: str = os.getenv("SUPABASE_PUBLISHABLE_KEY", "")
+    # Max in-flight Supabase requests per process (protects PostgREST/PgBouncer pools)
+    SUPABASE_MAX_CONCURRENCY: int = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "32"))
+    # Per-token Supabase clients kept alive for connection reuse (LRU, 0 disables)
+    SUPABASE_CLIENT_CACHE_SIZE: int = int(os.getenv("SUPABASE_CLIENT_CACHE_SIZE", "256"))
+    # Connection pool of the shared async PostgREST transport used for hot RPCs
+    SUPABASE_HTTP_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "128"))
+    SUPABASE_HTTP_MAX_KEEPALIVE: int = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", "64"))
+    # Window in which balance recompute requests for the same account are coalesced
+    BALANCE_RECOMPUTE_DEBOUNCE_MS: int = int(os.getenv("BALANCE_RECOMPUTE_DEBOUNCE_MS", "100"))
 
     # JWT Verification - Using new JWT Signing Keys (ES256 with JWKS)
     # The JWKS URL is automatically derived from SUPABASE_URL
@@ -39,6 +48,8 @@ class Settings:
     # Application Settings
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" (human-readable) or "json" (one JSON object per line, with extra= fields)
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
 
     # CORS Settings
     CORS_ORIGINS: List[str] = os.getenv(
@@ -18,6 +18,6 @@ Includes:
 - Embedding generation and vector search utilities (using text-embedding-3-small)
 """
 
-from .client import get_supabase_client
+from .client import close_rpc_http_client, execute_query, execute_rpc, get_supabase_client
 
-__all__ = ["get_supabase_client"]
+__all__ = ["close_rpc_http_client", "execute_query", "execute_rpc", "get_supabase_client"]
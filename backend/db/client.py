@@ -9,15 +9,54 @@ CRITICAL SECURITY RULES:
 2. ALWAYS use the user's JWT token from Supabase Auth
 3. RLS policies will enforce user_id = auth.uid() automatically
 4. The client MUST be created per-request with the user's token
+   (a client is only ever reused for requests carrying the SAME token)
 """
 
+import asyncio
 import logging
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import httpx
+from postgrest.exceptions import APIError
 
 from backend.config import settings
 from supabase import Client, create_client
 
 logger = logging.getLogger(__name__)
 
+# Caps concurrent Supabase requests (and the worker threads running them).
+# An asyncio.Semaphore belongs to the event loop that first waits on it, so
+# each running loop gets its own, created on first use.
+_query_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Dedicated pool for blocking supabase-py calls, so DB waits never queue behind
+# (or starve) the default executor that FastAPI/anyio use for sync endpoints
+_db_executor = ThreadPoolExecutor(
+    max_workers=settings.SUPABASE_MAX_CONCURRENCY,
+    thread_name_prefix="supabase",
+)
+
+# LRU of authenticated clients keyed by access token. Reusing a client for the
+# same token keeps its HTTP connections alive (no new TCP/TLS handshake) and
+# skips set_session() on every request. Clients are never shared across tokens,
+# so RLS isolation is unchanged.
+_client_cache: "OrderedDict[str, Client]" = OrderedDict()
+_client_cache_lock = threading.Lock()
+
+# Shared async transport for hot RPCs. It carries NO credentials of its own:
+# each request sends the calling client's apikey/Authorization headers. Its
+# pooled connections belong to the event loop that opened them, so (like the
+# semaphores) there is one client per running loop, created on first use.
+_rpc_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def get_supabase_client(access_token: str) -> Client:
     """
@@ -39,6 +78,9 @@ def get_supabase_client(access_token: str) -> Client:
         - Sets the user's access_token in the Authorization header
         - All database operations will be subject to RLS policies
         - The user can ONLY access their own data (user_id = auth.uid())
+        - Clients are cached per access token (bounded LRU) so repeat requests
+          with the same token reuse keep-alive connections; a client is never
+          returned for a different token
 
     Example:
         >>> from backend.auth.dependencies import verify_token
@@ -49,6 +91,14 @@ def get_supabase_client(access_token: str) -> Client:
         >>> # Now all operations respect RLS
         >>> result = client.table("invoice").select("*").execute()
     """
+    cache_size = settings.SUPABASE_CLIENT_CACHE_SIZE
+    if cache_size > 0:
+        with _client_cache_lock:
+            cached = _client_cache.get(access_token)
+            if cached is not None:
+                _client_cache.move_to_end(access_token)
+                return cached
+
     # Create client with publishable key (respects RLS)
     client: Client = create_client(
         supabase_url=settings.SUPABASE_URL,
@@ -65,9 +115,120 @@ def get_supabase_client(access_token: str) -> Client:
         "(RLS enforced)"
     )
 
+    if cache_size > 0:
+        with _client_cache_lock:
+            _client_cache[access_token] = client
+            while len(_client_cache) > cache_size:
+                _client_cache.popitem(last=False)
+
+    return client
+
+
+def _get_query_semaphore() -> asyncio.Semaphore:
+    """Return the concurrency semaphore of the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _query_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.SUPABASE_MAX_CONCURRENCY)
+        _query_semaphores[loop] = semaphore
+    return semaphore
+
+
+async def execute_query(query: Any) -> Any:
+    """
+    Execute a Supabase query builder without blocking the event loop.
+
+    supabase-py's `.execute()` is a blocking HTTP call. This runs it on a
+    dedicated "supabase" thread pool, bounded by SUPABASE_MAX_CONCURRENCY so
+    load spikes queue here instead of exhausting the PostgREST/PgBouncer
+    connection pool or the default executor shared with the framework.
+
+    Args:
+        query: Any Supabase/PostgREST request builder (table query or rpc)
+
+    Returns:
+        The APIResponse returned by `.execute()`
+
+    Example:
+        >>> result = await execute_query(client.rpc("delete_transfer", params))
+    """
+    async with _get_query_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_db_executor, query.execute)
+
+
+def _get_rpc_http_client() -> httpx.AsyncClient:
+    """Return the running loop's PostgREST AsyncClient, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    client = _rpc_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=f"{settings.SUPABASE_URL}/rest/v1",
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_HTTP_MAX_KEEPALIVE,
+            ),
+            timeout=httpx.Timeout(120.0),
+        )
+        _rpc_http_clients[loop] = client
     return client
 
 
+async def execute_rpc(
+    supabase_client: Client,
+    function: str,
+    params: Dict[str, Any]
+) -> Any:
+    """
+    Call a PostgREST RPC over the shared async HTTP/2 transport.
+
+    Unlike execute_query, this does not occupy a worker thread: the request
+    is awaited natively on a pooled keep-alive connection shared by all
+    requests. The caller's apikey and JWT are sent as per-request headers,
+    so RLS and SECURITY DEFINER ownership checks see the same identity as
+    `supabase_client.rpc(...)` would.
+
+    Args:
+        supabase_client: Authenticated Supabase client (source of auth headers)
+        function: RPC function name (e.g. "create_transfer")
+        params: Named RPC arguments
+
+    Returns:
+        The decoded JSON body (a list of rows for set-returning functions)
+
+    Raises:
+        APIError: If PostgREST returns an error response (same type supabase-py raises)
+
+    Security:
+        - The shared client holds no credentials; every call is authenticated
+          with the headers of the client passed in
+    """
+    headers = dict(supabase_client.options.headers)
+    async with _get_query_semaphore():
+        response = await _get_rpc_http_client().post(
+            f"/rpc/{function}", json=params, headers=headers
+        )
+
+    if response.is_error:
+        try:
+            error = response.json()
+        except ValueError:
+            error = {"message": response.text, "code": str(response.status_code)}
+        raise APIError(error)
+
+    if not response.content:
+        return None
+    return response.json()
+
+
+async def close_rpc_http_client() -> None:
+    """Close the running loop's RPC transport (called on application shutdown)."""
+    client = _rpc_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
 def get_service_role_client() -> Client:
     """
     Create a Supabase client with service_role privileges.
@@ -6,13 +6,17 @@ This module creates the FastAPI app instance and registers all routers.
 
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
+from backend.config import settings
+from backend.db.client import close_rpc_http_client
 from backend.routes.accounts import router as accounts_router
 from backend.routes.auth import router as auth_router
 from backend.routes.budgets import router as budgets_router
@@ -26,12 +30,19 @@ from backend.routes.recurring_transactions import sync_router as recurring_sync_
 from backend.routes.transactions import router as transactions_router
 from backend.routes.transfers import router as transfers_router
 from backend.routes.wishlists import router as wishlists_router
+from backend.services.account_service import drain_background_recomputes
+from backend.utils.logging import JsonFormatter
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+if settings.LOG_FORMAT.lower() == "json":
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(JsonFormatter())
+    logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+else:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -75,13 +86,26 @@ def _get_cors_origins() -> list[str]:
         return ["*"]
 
 
+# Seconds shutdown waits for background balance recomputes before cancelling them
+_SHUTDOWN_RECOMPUTE_TIMEOUT = 10.0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Finish background work and release shared outbound connections on shutdown."""
+    yield
+    await drain_background_recomputes(_SHUTDOWN_RECOMPUTE_TIMEOUT)
+    await close_rpc_http_client()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Kashi Finances API",
     description="Backend service for Kashi Finances mobile app",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Custom validation error handler to log detailed errors
@@ -101,7 +125,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "validation_error",
-            "details": exc.errors(),
+            # Error ctx can hold non-JSON values (e.g. the Decimal bound of gt=0)
+            "details": jsonable_encoder(exc.errors()),
             "body": exc.body
         }
     )
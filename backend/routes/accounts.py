@@ -35,9 +35,11 @@ from backend.services.account_service import (
     get_account_by_id,
     get_favorite_account,
     get_user_accounts,
+    schedule_account_recompute,
     set_favorite_account,
     update_account,
 )
+from backend.services.category_service import get_system_category_id
 
 logger = logging.getLogger(__name__)
 
@@ -224,17 +226,14 @@ async def create_new_account(
                 f"account={account_id}, amount={request.initial_balance}"
             )
 
-            # Fetch system category with key="initial_balance" and flow_type="income"
-            # This is a system category (user_id=NULL) used for opening account balances
-            category_response = supabase_client.from_("category").select("id").eq(
-                "key", "initial_balance"
-            ).eq(
-                "flow_type", "income"
-            ).is_(
-                "user_id", "null"
-            ).execute()
-
-            if not category_response.data or len(category_response.data) == 0:
+            # Resolve system category with key="initial_balance" and flow_type="income"
+            # This is a system category (user_id=NULL) used for opening account balances;
+            # its ID is cached per process after the first lookup
+            initial_balance_category_id = await get_system_category_id(
+                supabase_client, "initial_balance", "income"
+            )
+
+            if initial_balance_category_id is None:
                 logger.error("System category 'initial_balance' with flow_type='income' not found")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -244,18 +243,6 @@ async def create_new_account(
                     }
                 )
 
-            category_dict = category_response.data[0]
-            if not isinstance(category_dict, dict):
-                logger.error(f"Unexpected category data type: {type(category_dict)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail={
-                        "error": "system_error",
-                        "details": "Invalid system category data structure"
-                    }
-                )
-
-            initial_balance_category_id = str(category_dict.get("id"))
             logger.debug(f"Using system category for initial balance: {initial_balance_category_id}")
 
             await create_transaction(
@@ -272,19 +259,16 @@ async def create_new_account(
 
             logger.info(f"Initial balance transaction created for account {account_id}")
 
-            # CRITICAL FIX: Re-fetch account to get updated cached_balance
-            # The create_transaction service now calls recompute_account_balance(),
-            # but created_account dict is stale. We must fetch the fresh data.
-            from backend.services.account_service import get_account_by_id
-            updated_account = await get_account_by_id(
-                supabase_client=supabase_client,
-                user_id=auth_user.user_id,
-                account_id=str(account_id)
-            )
-
-            if updated_account:
-                created_account = updated_account
-                logger.debug(f"Account re-fetched after initial balance: cached_balance={created_account.get('cached_balance')}")
+            # CRITICAL FIX: created_account holds the pre-transaction cached_balance.
+            # create_transaction recomputes the balance in the background; join that
+            # (coalesced) recompute so the response reflects the initial balance.
+            try:
+                created_account["cached_balance"] = await schedule_account_recompute(
+                    supabase_client, auth_user.user_id, str(account_id)
+                )
+                logger.debug(f"Account balance after initial balance: cached_balance={created_account.get('cached_balance')}")
+            except Exception as e:
+                logger.warning(f"Failed to recompute balance after initial balance transaction: {e}")
 
         # Helper to coerce DB values to strings
         def _as_str(v: Any) -> str:
@@ -119,24 +119,29 @@ async def process_invoice_ocr(
             }
         )
 
-    # Read image data
-    try:
-        image_bytes = await image.read()
-    except Exception as e:
-        logger.error(f"Failed to read uploaded file: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail={
-                "error": "file_read_error",
-                "details": "Could not read uploaded image file"
-            }
-        )
-
-    # Validate file size (max 10MB for now)
+    # Validate file size (max 10MB for now). Starlette records the size of the
+    # spooled upload, so oversized files are rejected before being read into memory.
     max_size_mb = 10
     max_size_bytes = max_size_mb * 1024 * 1024
-    if len(image_bytes) > max_size_bytes:
-        logger.warning(f"Image too large: {len(image_bytes)} bytes")
+    image_size = image.size
+
+    if image_size is None or image_size <= max_size_bytes:
+        # Read image data
+        try:
+            image_bytes = await image.read()
+        except Exception as e:
+            logger.error(f"Failed to read uploaded file: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error": "file_read_error",
+                    "details": "Could not read uploaded image file"
+                }
+            )
+        image_size = len(image_bytes)
+
+    if image_size > max_size_bytes:
+        logger.warning(f"Image too large: {image_size} bytes")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -238,6 +238,8 @@ async def list_transactions(
     to_date: Optional[str] = Query(None, description="Filter by end date (ISO-8601)"),
     sort_by: str = Query("date", description="Sort field (date|amount)"),
     sort_order: str = Query("desc", description="Sort order (asc|desc)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (overrides offset)"),
+    include_total: bool = Query(False, description="Include an estimated total count"),
 ) -> TransactionListResponse:
     """
     List all transactions for the authenticated user.
@@ -253,6 +255,8 @@ async def list_transactions(
         to_date: Optional filter by end date
         sort_by: Field to sort by (date or amount, default date)
         sort_order: Sort order (asc or desc, default desc)
+        cursor: Optional keyset cursor returned as next_cursor by a previous page
+        include_total: Whether to include an estimated total count
 
     Returns:
         TransactionListResponse with list of transactions and pagination metadata
@@ -268,7 +272,7 @@ async def list_transactions(
 
     try:
         # Fetch transactions from database (RLS enforced)
-        transactions = await get_user_transactions(
+        page = await get_user_transactions(
             supabase_client=supabase_client,
             user_id=auth_user.user_id,
             limit=limit,
@@ -280,11 +284,13 @@ async def list_transactions(
             to_date=to_date,
             sort_by=sort_by,
             sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total,
         )
 
         # Map to response models (validate & coerce required fields)
         transaction_responses = []
-        for txn in transactions:
+        for txn in page["items"]:
             transaction_responses.append(
                 TransactionDetailResponse(
                     id=str(txn.get("id")),
@@ -309,9 +315,21 @@ async def list_transactions(
             transactions=transaction_responses,
             count=len(transaction_responses),
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page["has_more"],
+            next_cursor=page["next_cursor"],
+            total=page.get("total"),
         )
 
+    except ValueError as e:
+        logger.warning(f"Invalid transaction list request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "invalid_request",
+                "details": str(e)
+            }
+        )
     except Exception as e:
         logger.error(f"Failed to fetch transactions: {e}", exc_info=True)
         raise HTTPException(
@@ -468,14 +486,24 @@ async def update_transaction_details(
         f"Updating transaction {transaction_id} for user {auth_user.user_id}"
     )
 
+    if not request.model_dump(exclude_none=True):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "invalid_request",
+                "details": "At least one field must be provided"
+            }
+        )
+
     # Create authenticated Supabase client
     supabase_client = get_supabase_client(auth_user.access_token)
 
     try:
-        # First, check if this is a transfer transaction
+        # First, check if this is a transfer transaction. The category key is
+        # embedded so the transfer check needs no second round trip.
         transaction_check = (
             supabase_client.table("transaction")
-            .select("id, paired_transaction_id, category_id")
+            .select("id, paired_transaction_id, category_id, category:category_id(key)")
             .eq("id", transaction_id)
             .eq("user_id", auth_user.user_id)
             .execute()
@@ -493,32 +521,22 @@ async def update_transaction_details(
         # Type assertion: we know this is a dict from Supabase
         transaction: dict = transaction_check.data[0]  # type: ignore
 
-        # If this is a transfer (has paired_transaction_id), reject the update
+        # If this is a transfer (has paired_transaction_id) in a transfer category, reject the update
         paired_id = transaction.get("paired_transaction_id")
         if paired_id is not None:
-            # Fetch the category to confirm it's a transfer category
-            category_id = transaction.get("category_id")
-            category_check = (
-                supabase_client.table("category")
-                .select("key")
-                .eq("id", category_id)
-                .execute()
-            )
-
-            if category_check.data and len(category_check.data) > 0:
-                category_row: dict = category_check.data[0]  # type: ignore
-                category_key = category_row.get("key")
-                if category_key in ("transfer", "from_recurrent_transaction"):
-                    logger.warning(
-                        f"Attempted to edit transfer transaction {transaction_id} via PATCH /transactions"
-                    )
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail={
-                            "error": "cannot_edit_transfer",
-                            "details": "This transaction is part of an internal transfer. Use PATCH /transfers/{id} to edit it."
-                        }
-                    )
+            category_row: dict = transaction.get("category") or {}
+            category_key = category_row.get("key")
+            if category_key in ("transfer", "from_recurrent_transaction"):
+                logger.warning(
+                    f"Attempted to edit transfer transaction {transaction_id} via PATCH /transactions"
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={
+                        "error": "cannot_edit_transfer",
+                        "details": "This transaction is part of an internal transfer. Use PATCH /transfers/{id} to edit it."
+                    }
+                )
 
         # Update transaction (service handles RLS enforcement)
         updated_transaction = await update_transaction(
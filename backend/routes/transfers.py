@@ -6,9 +6,9 @@ the user's own accounts.
 """
 
 import logging
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 
 from backend.auth.dependencies import AuthenticatedUser, get_authenticated_user
 from backend.db.client import get_supabase_client
@@ -17,6 +17,8 @@ from backend.schemas.transactions import TransactionDetailResponse
 from backend.schemas.transfers import (
     RecurringTransferCreateRequest,
     RecurringTransferCreateResponse,
+    TransferBulkCreateRequest,
+    TransferBulkCreateResponse,
     TransferCreateRequest,
     TransferCreateResponse,
     TransferUpdateRequest,
@@ -37,7 +39,11 @@ router = APIRouter(prefix="/transfers", tags=["transfers"])
 )
 async def create_transfer(
     request: TransferCreateRequest,
-    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)]
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(alias="Idempotency-Key", min_length=1, max_length=255)
+    ] = None
 ):
     """
     Create a one-time internal transfer between two accounts.
@@ -53,9 +59,14 @@ async def create_transfer(
     - Amount must be positive
     - Date must be in ISO-8601 format (YYYY-MM-DD)
 
+    **Retries:**
+    - Send an `Idempotency-Key` header to make the request safe to retry;
+      a repeated key returns the transfer created by the first request
+
     **Returns:**
     - 201 CREATED: Transfer created successfully
     - 400 BAD REQUEST: Invalid accounts or validation error
+    - 409 CONFLICT: Idempotency key already used for a deleted or different transfer
     - 401 UNAUTHORIZED: Missing or invalid authentication
     - 500 INTERNAL SERVER ERROR: Database error
     """
@@ -63,8 +74,8 @@ async def create_transfer(
     supabase_client = get_supabase_client(user.access_token)
 
     logger.info(
-        f"POST /transfers: user {user_id} transferring {request.amount} "
-        f"from {request.from_account_id} to {request.to_account_id}"
+        "POST /transfers: user %s transferring %s from %s to %s",
+        user_id, request.amount, request.from_account_id, request.to_account_id,
     )
 
     try:
@@ -75,7 +86,8 @@ async def create_transfer(
             to_account_id=request.to_account_id,
             amount=request.amount,
             date=request.date,
-            description=request.description
+            description=request.description,
+            idempotency_key=idempotency_key
         )
 
         # Map the two transaction dicts to TransactionDetailResponse
@@ -90,15 +102,79 @@ async def create_transfer(
             message="Transfer created successfully"
         )
 
+    except transfer_service.IdempotencyConflictError as e:
+        logger.warning("Idempotency conflict creating transfer: %s", e)
+        raise HTTPException(status_code=409, detail={"error": "idempotency_conflict", "details": str(e)})
+
     except ValueError as e:
-        logger.warning(f"Validation error creating transfer: {e}")
+        logger.warning("Validation error creating transfer: %s", e)
         raise HTTPException(status_code=400, detail={"error": "validation_error", "details": str(e)})
 
     except Exception as e:
-        logger.error(f"Error creating transfer: {e}")
+        logger.error("Error creating transfer: %s", e)
         raise HTTPException(status_code=500, detail={"error": "internal_error", "details": "Failed to create transfer"})
 
 
+@router.post(
+    "/bulk",
+    response_model=TransferBulkCreateResponse,
+    status_code=201,
+    summary="Create many one-time transfers in one request"
+)
+async def create_transfers_bulk(
+    request: TransferBulkCreateRequest,
+    user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)]
+):
+    """
+    Create up to 1000 internal transfers atomically (e.g. when importing history).
+
+    Each transfer creates the same paired transactions as POST /transfers,
+    but the whole batch is written by a single database call.
+
+    **Requirements:**
+    - Every account must belong to the authenticated user
+    - Every amount must be positive; source and destination must differ
+
+    **Returns:**
+    - 201 CREATED: All transfers created
+    - 400 BAD REQUEST: Any invalid transfer or account (nothing is created)
+    - 401 UNAUTHORIZED: Missing or invalid authentication
+    - 500 INTERNAL SERVER ERROR: Database error
+    """
+    user_id = user.user_id
+    supabase_client = get_supabase_client(user.access_token)
+
+    logger.info("POST /transfers/bulk: user %s creating %s transfers", user_id, len(request.transfers))
+
+    try:
+        pairs = await transfer_service.create_transfers_bulk(
+            supabase_client=supabase_client,
+            user_id=user_id,
+            transfers=[transfer.model_dump() for transfer in request.transfers]
+        )
+
+        transactions = [
+            TransactionDetailResponse(**row)
+            for pair in pairs
+            for row in pair
+        ]
+
+        return TransferBulkCreateResponse(
+            status="CREATED",
+            count=len(pairs),
+            transactions=transactions,
+            message=f"{len(pairs)} transfers created successfully"
+        )
+
+    except ValueError as e:
+        logger.warning("Validation error creating transfers in bulk: %s", e)
+        raise HTTPException(status_code=400, detail={"error": "validation_error", "details": str(e)})
+
+    except Exception as e:
+        logger.error("Error creating transfers in bulk: %s", e)
+        raise HTTPException(status_code=500, detail={"error": "internal_error", "details": "Failed to create transfers"})
+
+
 @router.patch(
     "/{transaction_id}",
     response_model=TransferUpdateResponse,
@@ -141,9 +217,7 @@ async def update_transfer(
     user_id = user.user_id
     supabase_client = get_supabase_client(user.access_token)
 
-    logger.info(
-        f"PATCH /transfers/{transaction_id}: user {user_id} updating transfer"
-    )
+    logger.info("PATCH /transfers/%s: user %s updating transfer", transaction_id, user_id)
 
     # Validate at least one field provided
     if request.amount is None and request.date is None and request.description is None:
@@ -178,7 +252,7 @@ async def update_transfer(
         )
 
     except ValueError as e:
-        logger.warning(f"Validation error updating transfer: {e}")
+        logger.warning("Validation error updating transfer: %s", e)
         error_msg = str(e)
         if "not found" in error_msg.lower() or "not accessible" in error_msg.lower():
             raise HTTPException(status_code=404, detail={"error": "not_found", "details": str(e)})
@@ -188,7 +262,7 @@ async def update_transfer(
             raise HTTPException(status_code=400, detail={"error": "validation_error", "details": str(e)})
 
     except Exception as e:
-        logger.error(f"Error updating transfer: {e}")
+        logger.error("Error updating transfer: %s", e)
         raise HTTPException(status_code=500, detail={"error": "internal_error", "details": "Failed to update transfer"})
 
 
@@ -230,8 +304,9 @@ async def create_recurring_transfer(
     supabase_client = get_supabase_client(user.access_token)
 
     logger.info(
-        f"POST /transfers/recurring: user {user_id} creating {request.frequency} transfer "
-        f"of {request.amount} from {request.from_account_id} to {request.to_account_id}"
+        "POST /transfers/recurring: user %s creating %s transfer of %s from %s to %s",
+        user_id, request.frequency, request.amount,
+        request.from_account_id, request.to_account_id,
     )
 
     # Frequency-specific validation
@@ -278,9 +353,9 @@ async def create_recurring_transfer(
         )
 
     except ValueError as e:
-        logger.warning(f"Validation error creating recurring transfer: {e}")
+        logger.warning("Validation error creating recurring transfer: %s", e)
         raise HTTPException(status_code=400, detail={"error": "validation_error", "details": str(e)})
 
     except Exception as e:
-        logger.error(f"Error creating recurring transfer: {e}")
+        logger.error("Error creating recurring transfer: %s", e)
         raise HTTPException(status_code=500, detail={"error": "internal_error", "details": "Failed to create recurring transfer"})
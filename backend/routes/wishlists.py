@@ -7,7 +7,7 @@ manual save, recommendations without selection, and recommendations with selecti
 """
 
 import logging
-from typing import Annotated, Any, List
+from typing import Annotated, Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 
@@ -30,8 +30,7 @@ from backend.services.wishlist_service import (
     delete_wishlist,
     delete_wishlist_item,
     get_user_wishlists,
-    get_wishlist_by_id,
-    get_wishlist_items,
+    get_wishlist_with_items,
     update_wishlist,
 )
 
@@ -57,7 +56,7 @@ def _as_str(v: Any) -> str:
     - Returns all user's wishlist goals
     - Ordered by creation date (newest first)
     - Only accessible to the wishlist owner (RLS enforced)
-    - Supports pagination via limit/offset
+    - Supports pagination via limit/offset or a keyset cursor (next_cursor)
 
     Security:
     - Requires valid Authorization Bearer token
@@ -67,7 +66,8 @@ def _as_str(v: Any) -> str:
 async def list_wishlists(
     auth_user: Annotated[AuthenticatedUser, Depends(get_authenticated_user)],
     limit: int = Query(50, ge=1, le=100, description="Maximum number of wishlists to return"),
-    offset: int = Query(0, ge=0, description="Number of wishlists to skip for pagination")
+    offset: int = Query(0, ge=0, description="Number of wishlists to skip for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor (overrides offset)")
 ) -> WishlistListResponse:
     """List all wishlists for the authenticated user."""
     logger.info(f"Listing wishlists for user {auth_user.user_id} (limit={limit}, offset={offset})")
@@ -75,11 +75,12 @@ async def list_wishlists(
     supabase_client = get_supabase_client(auth_user.access_token)
 
     try:
-        wishlists = await get_user_wishlists(
+        page = await get_user_wishlists(
             supabase_client=supabase_client,
             user_id=auth_user.user_id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
 
         wishlist_responses = [
@@ -96,7 +97,7 @@ async def list_wishlists(
                 created_at=_as_str(w.get("created_at")),
                 updated_at=_as_str(w.get("updated_at")),
             )
-            for w in wishlists
+            for w in page["items"]
         ]
 
         logger.info(f"Returning {len(wishlist_responses)} wishlists for user {auth_user.user_id}")
@@ -105,9 +106,20 @@ async def list_wishlists(
             wishlists=wishlist_responses,
             count=len(wishlist_responses),
             limit=limit,
-            offset=offset
+            offset=offset,
+            has_more=page["has_more"],
+            next_cursor=page["next_cursor"]
         )
 
+    except ValueError as e:
+        logger.warning(f"Invalid wishlist list request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "invalid_request",
+                "details": str(e)
+            }
+        )
     except Exception as e:
         logger.error(f"Failed to list wishlists for user {auth_user.user_id}: {e}", exc_info=True)
         raise HTTPException(
@@ -290,14 +302,14 @@ async def get_wishlist(
     supabase_client = get_supabase_client(auth_user.access_token)
 
     try:
-        # Get wishlist
-        wishlist = await get_wishlist_by_id(
+        # Get wishlist and its items in one query
+        found = await get_wishlist_with_items(
             supabase_client=supabase_client,
             user_id=auth_user.user_id,
             wishlist_id=wishlist_id
         )
 
-        if not wishlist:
+        if not found:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail={
@@ -306,11 +318,7 @@ async def get_wishlist(
                 }
             )
 
-        # Get items
-        items = await get_wishlist_items(
-            supabase_client=supabase_client,
-            wishlist_id=wishlist_id
-        )
+        wishlist, items = found
 
         wishlist_response = WishlistResponse(
             id=_as_str(wishlist.get("id")),
@@ -406,14 +414,15 @@ async def get_wishlist_items_list(
     supabase_client = get_supabase_client(auth_user.access_token)
 
     try:
-        # First verify that the wishlist exists and belongs to this user
-        wishlist = await get_wishlist_by_id(
+        # Verify the wishlist exists and belongs to this user, fetching its
+        # items in the same query
+        found = await get_wishlist_with_items(
             supabase_client=supabase_client,
             user_id=auth_user.user_id,
             wishlist_id=wishlist_id
         )
 
-        if not wishlist:
+        if not found:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail={
@@ -422,11 +431,7 @@ async def get_wishlist_items_list(
                 }
             )
 
-        # Get items with pagination
-        items = await get_wishlist_items(
-            supabase_client=supabase_client,
-            wishlist_id=wishlist_id
-        )
+        _, items = found
 
         item_responses = [
             WishlistItemResponse(
@@ -640,7 +645,7 @@ async def delete_existing_wishlist(
 
     Security:
     - Requires valid Authorization Bearer token
-    - Verifies wishlist ownership before allowing item deletion
+    - Wishlist ownership enforced by RLS on wishlist_item
     - Returns 404 if item or wishlist doesn't exist
     """
 )
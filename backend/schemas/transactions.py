@@ -107,12 +107,21 @@ class TransactionListResponse(BaseModel):
     """
     Response for GET /transactions - List of user's transactions.
 
-    Supports pagination and filtering.
+    Supports offset and cursor (keyset) pagination and filtering.
     """
     transactions: List[TransactionDetailResponse] = Field(..., description="List of transaction records")
     count: int = Field(..., description="Total number of transactions returned")
     limit: int = Field(..., description="Limit used for pagination")
     offset: int = Field(..., description="Offset used for pagination")
+    has_more: bool = Field(False, description="Whether more transactions exist after this page")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor to pass as ?cursor= for the next page (null on the last page)"
+    )
+    total: Optional[int] = Field(
+        None,
+        description="Estimated total of matching transactions (only when include_total=true)"
+    )
 
 
 # --- Transaction creation response ---
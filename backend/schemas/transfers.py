@@ -5,6 +5,7 @@ Transfers are special transactions that move money between two accounts
 owned by the same user. They are represented as paired transaction records.
 """
 
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
@@ -15,6 +16,26 @@ from backend.schemas.recurring_transactions import RecurringTransactionResponse
 # Import TransactionDetailResponse for reuse
 from backend.schemas.transactions import TransactionDetailResponse
 
+_CENTS = Decimal("0.01")
+
+
+def _round_to_cents(v):
+    """
+    Round an incoming amount to cents (half-up) before NUMERIC(12,2) validation.
+
+    JSON numbers such as 10.005 would otherwise fail decimal_places=2 with a
+    422 even though the float-based API used to accept and round them. Values
+    that are not numeric are returned unchanged so field validation reports
+    them as usual.
+    """
+    if v is None or isinstance(v, bool):
+        return v
+    try:
+        return Decimal(str(v)).quantize(_CENTS, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        return v
+
+
 # --- Normal Transfer Schemas ---
 
 class TransferCreateRequest(BaseModel):
@@ -27,13 +48,19 @@ class TransferCreateRequest(BaseModel):
     """
     from_account_id: str = Field(..., description="Source account UUID (money leaves)")
     to_account_id: str = Field(..., description="Destination account UUID (money enters)")
-    amount: float = Field(..., description="Amount to transfer", gt=0)
+    amount: Decimal = Field(..., description="Amount to transfer", gt=0, max_digits=12, decimal_places=2)
     date: str = Field(..., description="Transfer date (ISO-8601 format)")
     description: Optional[str] = Field(
         None,
         description="Optional description for both transactions"
     )
 
+    @field_validator("amount", mode="before")
+    @classmethod
+    def round_amount_to_cents(cls, v):
+        """Round amount to 2 decimal places, half-up."""
+        return _round_to_cents(v)
+
     @field_validator("description")
     @classmethod
     def validate_description_not_empty_if_provided(cls, v: Optional[str]) -> Optional[str]:
@@ -58,6 +85,36 @@ class TransferCreateResponse(BaseModel):
     message: str = Field(..., description="Success message")
 
 
+class TransferBulkCreateRequest(BaseModel):
+    """
+    Request for creating many one-time transfers at once (e.g. history imports).
+
+    All transfers are created atomically: if any one is invalid, none are created.
+    """
+    transfers: List[TransferCreateRequest] = Field(
+        ...,
+        description="Transfers to create, at most 1000 per request",
+        min_length=1,
+        max_length=1000
+    )
+
+
+class TransferBulkCreateResponse(BaseModel):
+    """
+    Response after creating transfers in bulk.
+
+    Transactions are returned as consecutive pairs in request order:
+    [2i] = outcome from source, [2i + 1] = income to destination of transfer i.
+    """
+    status: Literal["CREATED"] = "CREATED"
+    count: int = Field(..., description="Number of transfers created")
+    transactions: List[TransactionDetailResponse] = Field(
+        ...,
+        description="Outcome/income transaction pairs, in request order"
+    )
+    message: str = Field(..., description="Success message")
+
+
 class TransferUpdateRequest(BaseModel):
     """
     Request for updating a transfer.
@@ -66,10 +123,16 @@ class TransferUpdateRequest(BaseModel):
     Only amount, date, and description can be updated.
     All other fields (category, flow_type, accounts) are immutable.
     """
-    amount: Optional[float] = Field(None, description="New amount (must be > 0)", gt=0)
+    amount: Optional[Decimal] = Field(None, description="New amount (must be > 0)", gt=0, max_digits=12, decimal_places=2)
     date: Optional[str] = Field(None, description="New date (ISO-8601 format)")
     description: Optional[str] = Field(None, description="New description for both transactions")
 
+    @field_validator("amount", mode="before")
+    @classmethod
+    def round_amount_to_cents(cls, v):
+        """Round amount to 2 decimal places, half-up."""
+        return _round_to_cents(v)
+
     @field_validator("description")
     @classmethod
     def validate_description_not_empty_if_provided(cls, v: Optional[str]) -> Optional[str]:
@@ -118,7 +181,7 @@ class RecurringTransferCreateRequest(BaseModel):
     """
     from_account_id: str = Field(..., description="Source account UUID")
     to_account_id: str = Field(..., description="Destination account UUID")
-    amount: float = Field(..., description="Amount to transfer each occurrence", gt=0)
+    amount: Decimal = Field(..., description="Amount to transfer each occurrence", gt=0, max_digits=12, decimal_places=2)
     description_outgoing: Optional[str] = Field(
         None,
         description="Description for outgoing side (if NULL, uses generic 'Transfer out')"
@@ -141,6 +204,12 @@ class RecurringTransferCreateRequest(BaseModel):
     end_date: Optional[str] = Field(None, description="End date (YYYY-MM-DD) or NULL for indefinite")
     is_active: bool = Field(True, description="Active by default")
 
+    @field_validator("amount", mode="before")
+    @classmethod
+    def round_amount_to_cents(cls, v):
+        """Round amount to 2 decimal places, half-up."""
+        return _round_to_cents(v)
+
     @field_validator("by_weekday")
     @classmethod
     def validate_weekdays(cls, v: Optional[List[str]]) -> Optional[List[str]]:
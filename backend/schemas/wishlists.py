@@ -309,6 +309,11 @@ class WishlistListResponse(BaseModel):
     count: int = Field(..., description="Total number of wishlists returned")
     limit: int = Field(..., description="Maximum number of wishlists requested")
     offset: int = Field(..., description="Number of wishlists skipped (pagination)")
+    has_more: bool = Field(False, description="Whether more wishlists exist after this page")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor to pass as ?cursor= for the next page (null on the last page)"
+    )
 
 
 # --- Wishlist with items response (detailed view) ---
@@ -17,6 +17,8 @@ from .account_service import (
     get_account_by_id,
     get_user_accounts,
     recompute_account_balance,
+    recompute_balances_in_background,
+    schedule_account_recompute,
     update_account,
 )
 from .budget_service import (
@@ -31,6 +33,7 @@ from .category_service import (
     delete_category,
     get_all_categories,
     get_category_by_id,
+    get_system_category_id,
     update_category,
 )
 from .invoice_service import (
@@ -71,6 +74,8 @@ __all__ = [
     "delete_account_with_reassignment",
     "delete_account_with_transactions",
     "recompute_account_balance",
+    "recompute_balances_in_background",
+    "schedule_account_recompute",
     "get_all_budgets",
     "get_budget_by_id",
     "create_budget",
@@ -78,6 +83,7 @@ __all__ = [
     "delete_budget",
     "get_all_categories",
     "get_category_by_id",
+    "get_system_category_id",
     "create_category",
     "update_category",
     "delete_category",
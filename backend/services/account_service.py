@@ -6,13 +6,23 @@ Accounts are financial containers (cash, bank, credit card, etc.) that track
 balances via transaction history.
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from supabase import Client
 
+from backend.config import settings
+from backend.db.client import execute_query
+
 logger = logging.getLogger(__name__)
 
+# Balance recomputes still inside their debounce window, keyed by (user_id, account_id)
+_pending_recomputes: Dict[Tuple[str, str], "asyncio.Task[float]"] = {}
+
+# Strong references to fire-and-forget recomputes so they are not garbage collected
+_background_recomputes: Set["asyncio.Task[None]"] = set()
+
 
 async def get_user_accounts(
     supabase_client: Client,
@@ -80,10 +90,11 @@ async def get_account_by_id(
         .select("*")
         .eq("id", account_id)
         .eq("user_id", user_id)
+        .limit(1)
         .execute()
     )
 
-    if not result.data or len(result.data) == 0:
+    if not result.data:
         logger.warning(f"Account {account_id} not found for user {user_id}")
         return None
 
@@ -241,7 +252,7 @@ async def update_account(
         .execute()
     )
 
-    if not result.data or len(result.data) == 0:
+    if not result.data:
         logger.warning(f"Account {account_id} not found for user {user_id}")
         return None
 
@@ -417,13 +428,13 @@ async def recompute_account_balance(
     logger.debug(f"Recomputing balance for account {account_id}, user {user_id}")
 
     try:
-        result = supabase_client.rpc(
+        result = await execute_query(supabase_client.rpc(
             'recompute_account_balance',
             {
                 'p_account_id': account_id,
                 'p_user_id': user_id
             }
-        ).execute()
+        ))
 
         if result.data is None:
             raise Exception("RPC recompute_account_balance returned None")
@@ -447,6 +458,125 @@ async def recompute_account_balance(
         raise
 
 
+async def _debounced_recompute(
+    supabase_client: Client,
+    user_id: str,
+    account_id: str
+) -> float:
+    """Wait out the debounce window, then run a single balance recompute."""
+    try:
+        await asyncio.sleep(settings.BALANCE_RECOMPUTE_DEBOUNCE_MS / 1000)
+    finally:
+        # Writes that land after this point need a recompute that can see them
+        _pending_recomputes.pop((user_id, account_id), None)
+    return await recompute_account_balance(supabase_client, user_id, account_id)
+
+
+async def schedule_account_recompute(
+    supabase_client: Client,
+    user_id: str,
+    account_id: str
+) -> float:
+    """
+    Recompute an account balance, coalescing bursts for the same account.
+
+    The first request for an account starts a recompute after a short
+    debounce window (BALANCE_RECOMPUTE_DEBOUNCE_MS). Requests that arrive
+    while that window is still open share the same recompute instead of
+    queueing their own. Because the recompute sums the full transaction
+    history, the shared run reflects every write made before it starts.
+
+    Args:
+        supabase_client: Authenticated Supabase client
+        user_id: The authenticated user's ID
+        account_id: The account UUID to recompute
+
+    Returns:
+        The new computed balance
+
+    Raises:
+        Exception: If the underlying recompute fails
+    """
+    key = (user_id, account_id)
+    task = _pending_recomputes.get(key)
+    if task is None:
+        task = asyncio.create_task(
+            _debounced_recompute(supabase_client, user_id, account_id)
+        )
+        _pending_recomputes[key] = task
+    else:
+        logger.debug(f"Coalescing balance recompute for account {account_id}")
+
+    # Shield so one cancelled caller does not cancel the shared recompute
+    return await asyncio.shield(task)
+
+
+async def _recompute_accounts(
+    supabase_client: Client,
+    user_id: str,
+    account_ids: List[str]
+) -> None:
+    """Recompute several account balances concurrently, logging failures."""
+    results = await asyncio.gather(
+        *(schedule_account_recompute(supabase_client, user_id, account_id) for account_id in account_ids),
+        return_exceptions=True,
+    )
+    for account_id, outcome in zip(account_ids, results):
+        if isinstance(outcome, BaseException):
+            logger.warning(f"Background balance recompute failed for account {account_id}: {outcome}")
+
+
+def recompute_balances_in_background(
+    supabase_client: Client,
+    user_id: str,
+    *account_ids: Optional[str]
+) -> None:
+    """
+    Schedule balance recomputes without blocking the caller.
+
+    cached_balance is eventually consistent: a failed recompute is only
+    logged and the balance can be recomputed later. Callers that just need
+    the write to succeed can therefore return before the recompute finishes.
+    Duplicate and empty account IDs are ignored.
+
+    Args:
+        supabase_client: Authenticated Supabase client
+        user_id: The authenticated user's ID
+        *account_ids: Account UUIDs whose balances changed
+    """
+    accounts = [account_id for account_id in dict.fromkeys(account_ids) if account_id]
+    if not accounts:
+        return
+
+    task = asyncio.create_task(_recompute_accounts(supabase_client, user_id, accounts))
+    _background_recomputes.add(task)
+    task.add_done_callback(_background_recomputes.discard)
+
+
+async def drain_background_recomputes(timeout: float) -> None:
+    """
+    Wait for the background recomputes started on the running event loop.
+
+    Called on application shutdown. Recomputes still running after timeout
+    seconds are cancelled and logged; like a failed recompute, the balance
+    is corrected by the next recompute of that account.
+
+    Args:
+        timeout: Seconds to wait before cancelling the remaining recomputes
+    """
+    loop = asyncio.get_running_loop()
+    tasks = [task for task in _background_recomputes if task.get_loop() is loop]
+    if not tasks:
+        return
+
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        logger.warning(f"Cancelling {len(pending)} background balance recomputes at shutdown")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
 # --- Favorite Account Management ---
 
 async def set_favorite_account(
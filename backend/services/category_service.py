@@ -26,13 +26,72 @@ SUBCATEGORY RULES:
 6. When deleting a parent, subcategories become top-level (parent_category_id = NULL)
 """
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, List, Optional, Tuple, cast
 
 from supabase import Client
 
+from backend.db.client import execute_query
+
 logger = logging.getLogger(__name__)
 
+# System category IDs keyed by (key, flow_type). System categories are seed
+# data shared by all users, so their IDs never change at runtime.
+_system_category_ids: Dict[Tuple[str, str], str] = {}
+_system_category_lock = asyncio.Lock()
+
+
+async def get_system_category_id(
+    supabase_client: Client,
+    key: str,
+    flow_type: str
+) -> Optional[str]:
+    """
+    Resolve a system category ID by key and flow_type, cached per process.
+
+    Only the first call for a given (key, flow_type) queries the database;
+    later calls are served from memory. Missing categories are not cached,
+    so a category seeded after startup is picked up on the next call.
+
+    Args:
+        supabase_client: Authenticated Supabase client
+        key: System category key (e.g. 'initial_balance', 'transfer')
+        flow_type: 'income' or 'outcome'
+
+    Returns:
+        The category UUID, or None if no such system category exists
+
+    Security:
+        - Only matches system categories (user_id IS NULL), which every user can read
+    """
+    cache_key = (key, flow_type)
+    category_id = _system_category_ids.get(cache_key)
+    if category_id is not None:
+        return category_id
+
+    async with _system_category_lock:
+        # Another request may have filled the cache while we waited
+        category_id = _system_category_ids.get(cache_key)
+        if category_id is not None:
+            return category_id
+
+        result = await execute_query(
+            supabase_client.table("category")
+            .select("id")
+            .eq("key", key)
+            .eq("flow_type", flow_type)
+            .is_("user_id", "null")
+            .limit(1)
+        )
+        if not result.data:
+            return None
+
+        category_id = str(cast(Dict[str, Any], result.data[0])["id"])
+        _system_category_ids[cache_key] = category_id
+        logger.debug(f"Cached system category {key}/{flow_type}: {category_id}")
+        return category_id
+
 
 async def get_all_categories(
     supabase_client: Client,
@@ -53,6 +53,9 @@ logger = logging.getLogger(__name__)
 # Initialize Gemini client (lazy initialization)
 _gemini_client = None
 
+# Model used for live and batch recommendation requests
+RECOMMENDATION_MODEL = "gemini-2.5-flash"
+
 
 # =============================================================================
 # PYDANTIC MODELS FOR STRUCTURED OUTPUT
@@ -330,6 +333,239 @@ def _extract_language_from_locale(locale: str, country: str) -> str:
     return LANGUAGE_NAMES.get(lang_code, "Spanish")
 
 
+def build_generation_config() -> types.GenerateContentConfig:
+    """
+    Build the Gemini request config shared by live and batch recommendation calls.
+
+    NOTE: Google Search grounding doesn't support response_mime_type='application/json'
+    or response_schema. We ask for JSON in the prompt and parse it from text.
+    """
+    return types.GenerateContentConfig(
+        system_instruction=RECOMMENDATION_SYSTEM_PROMPT,
+        temperature=0.3,  # Slightly higher for more variety in recommendations
+        max_output_tokens=4096,  # Ensure complete responses with multiple products
+        tools=[
+            types.Tool(google_search=types.GoogleSearch())
+        ],
+    )
+
+
+async def build_recommendation_prompt(
+    supabase_client: Client,
+    user_id: str,
+    query_raw: str,
+    budget_hint: Optional[Decimal] = None,
+    preferred_store: Optional[str] = None,
+    user_note: Optional[str] = None,
+    extra_details: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Build the localized user prompt for a recommendation query.
+
+    Fetches the user profile for country/currency/locale context and renders
+    the prompt sent to Gemini alongside build_generation_config().
+    """
+    profile = await _get_user_profile(supabase_client, user_id)
+    country = profile["country"]
+    currency = profile["currency_preference"]
+    locale = profile["locale"]
+
+    # Extract language from locale for response language
+    language = _extract_language_from_locale(locale, country)
+
+    return build_recommendation_user_prompt(
+        query_raw=query_raw,
+        country=country,
+        currency=currency,
+        language=language,
+        budget_hint=float(budget_hint) if budget_hint else None,
+        preferred_store=preferred_store,
+        user_note=user_note,
+        extra_details=extra_details,
+    )
+
+
+def parse_recommendation_response(
+    response: Any,
+) -> RecommendationQueryResponseOK | RecommendationQueryResponseNoValidOption:
+    """
+    Parse a Gemini GenerateContentResponse into a typed recommendation result.
+
+    Handles JSON wrapped in markdown code blocks, common LLM formatting
+    mistakes and truncated output (partial product recovery).
+    """
+    # Check for valid response
+    if not response.candidates or not response.candidates[0].content:
+        logger.error("Empty response from Gemini API")
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason="No response from recommendation service."
+        )
+
+    # Extract grounding info for logging
+    grounding_info = _extract_grounding_info(response)
+    if grounding_info["web_search_queries"]:
+        logger.info(f"Web search queries: {grounding_info['web_search_queries']}")
+    if grounding_info["source_urls"]:
+        logger.info(f"Found {len(grounding_info['source_urls'])} source URLs")
+
+    # Get the response text - extract from parts directly for reliability
+    # The response.text property can sometimes be None even when parts have text
+    content = None
+
+    # First try to get text from parts (more reliable)
+    candidate = response.candidates[0]
+    if candidate.content and candidate.content.parts:
+        for part in candidate.content.parts:
+            if hasattr(part, 'text') and part.text:
+                content = part.text
+                break
+
+    # Fall back to response.text if parts didn't work
+    if not content:
+        content = response.text
+
+    if not content:
+        logger.error("Empty text in Gemini response")
+        logger.debug(f"Response candidate content: {candidate.content if candidate else 'No candidate'}")
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason="No response from recommendation service."
+        )
+
+    return parse_recommendation_text(content)
+
+
+def parse_recommendation_text(
+    content: str,
+) -> RecommendationQueryResponseOK | RecommendationQueryResponseNoValidOption:
+    """
+    Parse the model's text output into a typed recommendation result.
+
+    Used directly for streamed responses, where the text is accumulated from
+    chunks instead of read from a single GenerateContentResponse.
+    """
+    # Parse JSON response - may be wrapped in markdown code blocks or have text before
+    try:
+        # First, try to find JSON block in the response
+        json_content = content.strip()
+
+        # If there's text before the JSON block, extract just the JSON
+        # Look for ```json ... ``` pattern anywhere in the response
+        json_block_match = re.search(r'```json\s*([\s\S]*?)```', json_content, re.IGNORECASE)
+        if json_block_match:
+            json_content = json_block_match.group(1).strip()
+        else:
+            # Try ``` ... ``` pattern
+            code_block_match = re.search(r'```\s*([\s\S]*?)```', json_content)
+            if code_block_match:
+                json_content = code_block_match.group(1).strip()
+            else:
+                # No code blocks - try to find raw JSON (starting with {)
+                json_start = json_content.find('{')
+                if json_start > 0:
+                    json_content = json_content[json_start:]
+
+        # Remove trailing commas before } or ] (common LLM mistake)
+        json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
+
+        # Clean control characters that can break JSON parsing
+        # This includes: NUL, SOH, STX, ETX, EOT, ENQ, ACK, BEL, BS, VT, FF, CR, SO-US, DEL
+        json_content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', json_content)
+
+        # Replace curly/smart quotes with regular quotes (common LLM output issue)
+        json_content = json_content.replace('"', '"').replace('"', '"')
+        json_content = json_content.replace(''', "'").replace(''', "'")
+
+        # Replace special dashes with regular dashes
+        json_content = json_content.replace('–', '-').replace('—', '-')
+
+        response_data = json.loads(json_content)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse JSON response: {e}")
+        logger.error(f"Raw content: {content[:500]}")
+
+        # Try to recover partial product data from truncated JSON
+        # This happens when the response is cut off mid-stream
+        if '"status": "OK"' in content and '"products"' in content:
+            try:
+                # Try to extract at least one complete product
+                product_matches = re.findall(
+                    r'\{\s*"product_title":\s*"([^"]+)"[^}]*"price_total":\s*([\d.]+)[^}]*"seller_name":\s*"([^"]+)"[^}]*"url":\s*"([^"]+)"',
+                    content,
+                    re.DOTALL
+                )
+                if product_matches:
+                    logger.warning(f"Recovered {len(product_matches)} partial products from truncated response")
+                    # Build a minimal valid response
+                    products = []
+                    for title, price, seller, url in product_matches[:3]:
+                        products.append(ProductRecommendation(
+                            product_title=title,
+                            price_total=float(price),
+                            seller_name=seller,
+                            url=url,
+                            pickup_available=False,
+                            warranty_info="Información no disponible",
+                            copy_for_user=title,
+                            badges=[]
+                        ))
+                    if products:
+                        return RecommendationQueryResponseOK(
+                            status="OK",
+                            results_for_user=products,
+                        )
+            except Exception as recovery_error:
+                logger.debug(f"Failed to recover partial products: {recovery_error}")
+
+        # Try to extract a meaningful reason from the text response
+        # This can happen when the model explains why it can't fulfill the request
+        extracted_reason = _extract_reason_from_text(content)
+
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason=extracted_reason
+        )
+
+    # Validate response structure
+    if not _validate_llm_response(response_data):
+        logger.error("Invalid response structure from Gemini")
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason="Invalid response format from recommendation service."
+        )
+
+    # Handle NO_VALID_OPTION status
+    if response_data["status"] == "NO_VALID_OPTION":
+        logger.info("Gemini returned NO_VALID_OPTION")
+        reason = response_data.get("metadata", {}).get("reason", "No valid products found.")
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason=reason
+        )
+
+    # Build product list from response
+    products = []
+    for p in response_data["products"]:
+        products.append(ProductRecommendation(
+            product_title=p["product_title"],
+            price_total=float(p["price_total"]),
+            seller_name=p["seller_name"],
+            url=p["url"],
+            pickup_available=p["pickup_available"],
+            warranty_info=p["warranty_info"],
+            copy_for_user=p["copy_for_user"],
+            badges=p["badges"][:3] if p["badges"] else [],
+        ))
+
+    logger.info(f"Returning {len(products)} product recommendations")
+
+    return RecommendationQueryResponseOK(
+        status="OK",
+        results_for_user=products,
+    )
+
+
 async def query_recommendations(
     supabase_client: Client,
     user_id: str,
@@ -371,22 +607,12 @@ async def query_recommendations(
             reason="Recommendation service is not configured. Please contact support."
         )
 
-    # Fetch user profile for localization
-    profile = await _get_user_profile(supabase_client, user_id)
-    country = profile["country"]
-    currency = profile["currency_preference"]
-    locale = profile["locale"]
-
-    # Extract language from locale for response language
-    language = _extract_language_from_locale(locale, country)
-
-    # Build the user prompt with full context
-    user_prompt = build_recommendation_user_prompt(
-        query_raw=query_raw,
-        country=country,
-        currency=currency,
-        language=language,
-        budget_hint=float(budget_hint) if budget_hint else None,
+    # Build the user prompt with full context (fetches the profile for localization)
+    user_prompt = await build_recommendation_prompt(
+        supabase_client,
+        user_id,
+        query_raw,
+        budget_hint=budget_hint,
         preferred_store=preferred_store,
         user_note=user_note,
         extra_details=extra_details,
@@ -395,183 +621,14 @@ async def query_recommendations(
     try:
         logger.info("Calling Gemini API with Google Search grounding...")
 
-        # Configure the request with Google Search tool
-        # NOTE: Google Search grounding doesn't support response_mime_type='application/json'
-        # or response_schema. We ask for JSON in the prompt and parse it from text.
-        config = types.GenerateContentConfig(
-            system_instruction=RECOMMENDATION_SYSTEM_PROMPT,
-            temperature=0.3,  # Slightly higher for more variety in recommendations
-            max_output_tokens=4096,  # Ensure complete responses with multiple products
-            tools=[
-                types.Tool(google_search=types.GoogleSearch())
-            ],
-        )
-
-        # Make the API call
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
+        # Async client: the request doesn't block the event loop while waiting
+        response = await client.aio.models.generate_content(
+            model=RECOMMENDATION_MODEL,
             contents=user_prompt,
-            config=config,
+            config=build_generation_config(),
         )
 
-        # Check for valid response
-        if not response.candidates or not response.candidates[0].content:
-            logger.error("Empty response from Gemini API")
-            return RecommendationQueryResponseNoValidOption(
-                status="NO_VALID_OPTION",
-                reason="No response from recommendation service."
-            )
-
-        # Extract grounding info for logging
-        grounding_info = _extract_grounding_info(response)
-        if grounding_info["web_search_queries"]:
-            logger.info(f"Web search queries: {grounding_info['web_search_queries']}")
-        if grounding_info["source_urls"]:
-            logger.info(f"Found {len(grounding_info['source_urls'])} source URLs")
-
-        # Get the response text - extract from parts directly for reliability
-        # The response.text property can sometimes be None even when parts have text
-        content = None
-
-        # First try to get text from parts (more reliable)
-        candidate = response.candidates[0]
-        if candidate.content and candidate.content.parts:
-            for part in candidate.content.parts:
-                if hasattr(part, 'text') and part.text:
-                    content = part.text
-                    break
-
-        # Fall back to response.text if parts didn't work
-        if not content:
-            content = response.text
-
-        if not content:
-            logger.error("Empty text in Gemini response")
-            logger.debug(f"Response candidate content: {candidate.content if candidate else 'No candidate'}")
-            return RecommendationQueryResponseNoValidOption(
-                status="NO_VALID_OPTION",
-                reason="No response from recommendation service."
-            )
-
-        # Parse JSON response - may be wrapped in markdown code blocks or have text before
-        try:
-            # First, try to find JSON block in the response
-            json_content = content.strip()
-
-            # If there's text before the JSON block, extract just the JSON
-            # Look for ```json ... ``` pattern anywhere in the response
-            json_block_match = re.search(r'```json\s*([\s\S]*?)```', json_content, re.IGNORECASE)
-            if json_block_match:
-                json_content = json_block_match.group(1).strip()
-            else:
-                # Try ``` ... ``` pattern
-                code_block_match = re.search(r'```\s*([\s\S]*?)```', json_content)
-                if code_block_match:
-                    json_content = code_block_match.group(1).strip()
-                else:
-                    # No code blocks - try to find raw JSON (starting with {)
-                    json_start = json_content.find('{')
-                    if json_start > 0:
-                        json_content = json_content[json_start:]
-
-            # Remove trailing commas before } or ] (common LLM mistake)
-            json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
-
-            # Clean control characters that can break JSON parsing
-            # This includes: NUL, SOH, STX, ETX, EOT, ENQ, ACK, BEL, BS, VT, FF, CR, SO-US, DEL
-            json_content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', json_content)
-
-            # Replace curly/smart quotes with regular quotes (common LLM output issue)
-            json_content = json_content.replace('"', '"').replace('"', '"')
-            json_content = json_content.replace(''', "'").replace(''', "'")
-
-            # Replace special dashes with regular dashes
-            json_content = json_content.replace('–', '-').replace('—', '-')
-
-            response_data = json.loads(json_content)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON response: {e}")
-            logger.error(f"Raw content: {content[:500]}")
-
-            # Try to recover partial product data from truncated JSON
-            # This happens when the response is cut off mid-stream
-            if '"status": "OK"' in content and '"products"' in content:
-                try:
-                    # Try to extract at least one complete product
-                    product_matches = re.findall(
-                        r'\{\s*"product_title":\s*"([^"]+)"[^}]*"price_total":\s*([\d.]+)[^}]*"seller_name":\s*"([^"]+)"[^}]*"url":\s*"([^"]+)"',
-                        content,
-                        re.DOTALL
-                    )
-                    if product_matches:
-                        logger.warning(f"Recovered {len(product_matches)} partial products from truncated response")
-                        # Build a minimal valid response
-                        products = []
-                        for title, price, seller, url in product_matches[:3]:
-                            products.append(ProductRecommendation(
-                                product_title=title,
-                                price_total=float(price),
-                                seller_name=seller,
-                                url=url,
-                                pickup_available=False,
-                                warranty_info="Información no disponible",
-                                copy_for_user=title,
-                                badges=[]
-                            ))
-                        if products:
-                            return RecommendationQueryResponseOK(
-                                status="OK",
-                                results_for_user=products,
-                            )
-                except Exception as recovery_error:
-                    logger.debug(f"Failed to recover partial products: {recovery_error}")
-
-            # Try to extract a meaningful reason from the text response
-            # This can happen when the model explains why it can't fulfill the request
-            extracted_reason = _extract_reason_from_text(content)
-
-            return RecommendationQueryResponseNoValidOption(
-                status="NO_VALID_OPTION",
-                reason=extracted_reason
-            )
-
-        # Validate response structure
-        if not _validate_llm_response(response_data):
-            logger.error("Invalid response structure from Gemini")
-            return RecommendationQueryResponseNoValidOption(
-                status="NO_VALID_OPTION",
-                reason="Invalid response format from recommendation service."
-            )
-
-        # Handle NO_VALID_OPTION status
-        if response_data["status"] == "NO_VALID_OPTION":
-            logger.info("Gemini returned NO_VALID_OPTION")
-            reason = response_data.get("metadata", {}).get("reason", "No valid products found.")
-            return RecommendationQueryResponseNoValidOption(
-                status="NO_VALID_OPTION",
-                reason=reason
-            )
-
-        # Build product list from response
-        products = []
-        for p in response_data["products"]:
-            products.append(ProductRecommendation(
-                product_title=p["product_title"],
-                price_total=float(p["price_total"]),
-                seller_name=p["seller_name"],
-                url=p["url"],
-                pickup_available=p["pickup_available"],
-                warranty_info=p["warranty_info"],
-                copy_for_user=p["copy_for_user"],
-                badges=p["badges"][:3] if p["badges"] else [],
-            ))
-
-        logger.info(f"Returning {len(products)} product recommendations")
-
-        return RecommendationQueryResponseOK(
-            status="OK",
-            results_for_user=products,
-        )
+        return parse_recommendation_response(response)
 
     except Exception as e:
         logger.error(f"Error calling Gemini API: {e}")
@@ -9,13 +9,133 @@ CRITICAL RULES:
 5. After transaction CRUD, recompute both account balance AND budget consumption
 """
 
+import base64
+import json
 import logging
-from typing import Any, Dict, List, Optional, cast
+import uuid
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, cast
 
 from supabase import Client
 
+from backend.services.account_service import recompute_balances_in_background
+
 logger = logging.getLogger(__name__)
 
+_FLOW_TYPES: FrozenSet[str] = frozenset({"income", "outcome"})
+_SORT_FIELDS: FrozenSet[str] = frozenset({"date", "amount"})
+_SORT_ORDERS: FrozenSet[str] = frozenset({"asc", "desc"})
+
+# Server-side cap on page size, regardless of what the caller asks for
+MAX_LIST_LIMIT = 200
+
+# Optional list filters: (kwarg name, column, postgrest operator), in the
+# order they are applied to the query builder.
+_LIST_FILTERS: Tuple[Tuple[str, str, str], ...] = (
+    ("account_id", "account_id", "eq"),
+    ("category_id", "category_id", "eq"),
+    ("flow_type", "flow_type", "eq"),
+    ("from_date", "date", "gte"),
+    ("to_date", "date", "lte"),
+)
+
+
+@lru_cache(maxsize=32)
+def _compile_filters(present: FrozenSet[str]) -> Callable[[Any, Dict[str, Any]], Any]:
+    """
+    Build (once per filter combination) a function that applies the given filters.
+
+    The handful of filter shapes seen in practice (unfiltered, by account,
+    by category + date range, by flow_type + date range) each resolve to a
+    cached applier, so get_user_transactions doesn't re-walk every optional
+    filter on each request.
+
+    Args:
+        present: Names of the filters supplied by the caller
+
+    Returns:
+        Callable taking (query, filter_values) and returning the filtered query
+    """
+    steps = tuple(
+        (name, column, op) for name, column, op in _LIST_FILTERS if name in present
+    )
+
+    def apply(query: Any, values: Dict[str, Any]) -> Any:
+        for name, column, op in steps:
+            query = getattr(query, op)(column, values[name])
+        return query
+
+    return apply
+
+
+def _encode_cursor(sort_by: str, row: Dict[str, Any]) -> str:
+    """
+    Encode the keyset position of a row as an opaque, URL-safe cursor.
+
+    Args:
+        sort_by: Sort field the page was ordered by
+        row: Last row of the page
+
+    Returns:
+        Cursor string carrying (sort_by, sort value, id)
+    """
+    payload = json.dumps([sort_by, row.get(sort_by), row.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str) -> Tuple[Any, str]:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        sort_by: Sort field of the current request
+
+    Returns:
+        Tuple of (sort value, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed, was issued for another sort
+            field, or carries values that are not a UUID id and a sort value
+            of the sort field's type
+
+    Security:
+        The cursor is client-supplied and its values are interpolated into a
+        PostgREST filter, so they are parsed (UUID, ISO datetime or decimal)
+        before use and anything else is rejected.
+    """
+    try:
+        cursor_sort_by, value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if cursor_sort_by != sort_by or value is None or not row_id:
+        raise ValueError("Invalid cursor for the requested sort order")
+    try:
+        row_id = str(uuid.UUID(str(row_id)))
+        if sort_by == "amount":
+            if isinstance(value, bool) or not Decimal(str(value)).is_finite():
+                raise ValueError
+        else:
+            datetime.fromisoformat(str(value))
+    except (TypeError, ValueError, InvalidOperation):
+        raise ValueError("Invalid cursor")
+    return str(value), row_id
+
+
+def _first(result: Any) -> Optional[Dict[str, Any]]:
+    """
+    Return the first row of a Supabase response, or None if it has no rows.
+
+    Args:
+        result: Response object returned by ``.execute()``
+
+    Returns:
+        The first row as a dict, or None when ``result.data`` is empty or None
+    """
+    return cast(Optional[Dict[str, Any]], (result.data or [None])[0])
+
 
 async def _recompute_budgets_for_category(
     supabase_client: Client,
@@ -111,7 +231,7 @@ async def create_transaction(
         - No other user can see this transaction
     """
     # Validate flow_type
-    if flow_type not in ("income", "outcome"):
+    if flow_type not in _FLOW_TYPES:
         raise ValueError(f"Invalid flow_type: {flow_type}. Must be 'income' or 'outcome'")
 
     # Prepare transaction record
@@ -135,25 +255,17 @@ async def create_transaction(
     # Insert into Supabase (RLS enforced automatically)
     result = supabase_client.table("transaction").insert(transaction_data).execute()
 
-    if not result.data or len(result.data) == 0:
+    created_transaction = _first(result)
+    if created_transaction is None:
         raise Exception("Failed to create transaction: no data returned")
 
-    created_transaction = cast(Dict[str, Any], result.data[0])
-
     logger.info(
         f"Transaction created successfully: id={created_transaction.get('id')}, "
         f"user_id={user_id}"
     )
 
-    # Recompute account balance after creating transaction
-    try:
-        from backend.services.account_service import recompute_account_balance
-        await recompute_account_balance(supabase_client, user_id, account_id)
-        logger.debug(f"Account balance recomputed for account {account_id} after transaction creation")
-    except Exception as e:
-        logger.warning(f"Failed to recompute account balance after transaction creation: {e}")
-        # Don't fail the transaction creation, just log the warning
-        # The balance can be recomputed later if needed
+    # Recompute account balance in the background; the response does not wait on it
+    recompute_balances_in_background(supabase_client, user_id, account_id)
 
     # Recompute budget consumption for all budgets tracking this category
     # Only applies to outcome transactions (expenses affect budget consumption)
@@ -182,15 +294,21 @@ async def get_user_transactions(
     to_date: Optional[str] = None,
     sort_by: str = "date",
     sort_order: str = "desc",
-) -> List[Dict[str, Any]]:
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+) -> Dict[str, Any]:
     """
-    Fetch transactions for the authenticated user with optional filters and sorting.
+    Fetch a page of transactions for the authenticated user with optional filters and sorting.
+
+    Pages are fetched with limit + 1 rows to detect whether more exist, so no
+    COUNT(*) is issued. When a cursor is given, the page starts after the
+    (sort value, id) it encodes and offset is ignored (keyset pagination).
 
     Args:
         supabase_client: Authenticated Supabase client
         user_id: The authenticated user's ID
-        limit: Maximum number of transactions to return
-        offset: Number of transactions to skip (for pagination)
+        limit: Maximum number of transactions to return (clamped to 1..MAX_LIST_LIMIT)
+        offset: Number of transactions to skip (for pagination, clamped to >= 0)
         account_id: Optional filter by account
         category_id: Optional filter by category
         flow_type: Optional filter by flow type ('income' or 'outcome')
@@ -198,14 +316,33 @@ async def get_user_transactions(
         to_date: Optional filter by end date (ISO-8601)
         sort_by: Field to sort by ('date' or 'amount', default 'date')
         sort_order: Sort order ('asc' or 'desc', default 'desc')
+        cursor: Optional next_cursor from a previous page
+        include_total: If True, also return an estimated total row count
+            (planner estimate, not an exact COUNT)
 
     Returns:
-        List of transaction records (RLS ensures only user's own transactions)
+        Dict with:
+        - items: List of transaction records (RLS ensures only user's own transactions)
+        - next_cursor: Cursor for the next page, or None if this is the last page
+        - has_more: Whether more transactions exist after this page
+        - total: Estimated total matching rows (only when include_total is True)
+
+    Raises:
+        ValueError: If the cursor is invalid
 
     Security:
         - RLS automatically filters to user_id = auth.uid()
         - User can only see their own transactions
     """
+    if limit < 1 or limit > MAX_LIST_LIMIT or offset < 0:
+        clamped_limit = max(1, min(limit, MAX_LIST_LIMIT))
+        clamped_offset = max(0, offset)
+        logger.warning(
+            f"Clamping transaction list pagination for user {user_id}: "
+            f"limit {limit} -> {clamped_limit}, offset {offset} -> {clamped_offset}"
+        )
+        limit, offset = clamped_limit, clamped_offset
+
     logger.debug(
         f"Fetching transactions for user {user_id} "
         f"(limit={limit}, offset={offset}, sort_by={sort_by}, sort_order={sort_order}, "
@@ -213,39 +350,69 @@ async def get_user_transactions(
     )
 
     # Build query with filters
-    query = supabase_client.table("transaction").select("*")
-
-    if account_id:
-        query = query.eq("account_id", account_id)
-    if category_id:
-        query = query.eq("category_id", category_id)
-    if flow_type:
-        query = query.eq("flow_type", flow_type)
-    if from_date:
-        query = query.gte("date", from_date)
-    if to_date:
-        query = query.lte("date", to_date)
+    filters = {
+        "account_id": account_id,
+        "category_id": category_id,
+        "flow_type": flow_type,
+        "from_date": from_date,
+        "to_date": to_date,
+    }
+    filters = {name: value for name, value in filters.items() if value}
+    apply_filters = _compile_filters(frozenset(filters))
+    base_query = (
+        supabase_client.table("transaction").select("*", count="estimated")
+        if include_total
+        else supabase_client.table("transaction").select("*")
+    )
+    query = apply_filters(base_query, filters)
 
     # Validate sort_by field
-    allowed_sort_fields = ["date", "amount"]
-    if sort_by not in allowed_sort_fields:
+    if sort_by not in _SORT_FIELDS:
         logger.warning(f"Invalid sort_by '{sort_by}', defaulting to 'date'")
         sort_by = "date"
 
     # Validate sort_order
-    if sort_order not in ["asc", "desc"]:
+    if sort_order not in _SORT_ORDERS:
         logger.warning(f"Invalid sort_order '{sort_order}', defaulting to 'desc'")
         sort_order = "desc"
 
-    # Apply ordering and pagination
     is_desc = sort_order == "desc"
-    result = query.order(sort_by, desc=is_desc).range(offset, offset + limit - 1).execute()
 
-    transactions = cast(List[Dict[str, Any]], result.data)
+    # Keyset pagination: continue strictly after the previous page's last row
+    if cursor:
+        last_value, last_id = _decode_cursor(cursor, sort_by)
+        op = "lt" if is_desc else "gt"
+        query = query.or_(
+            f'{sort_by}.{op}."{last_value}",'
+            f'and({sort_by}.eq."{last_value}",id.{op}."{last_id}")'
+        )
+        offset = 0
+
+    # Apply ordering (id breaks ties so cursors are stable) and fetch one extra
+    # row to know whether another page exists
+    result = (
+        query.order(sort_by, desc=is_desc)
+        .order("id", desc=is_desc)
+        .range(offset, offset + limit)
+        .execute()
+    )
+
+    transactions = cast(List[Dict[str, Any]], result.data or [])
+    has_more = len(transactions) > limit
+    if has_more:
+        transactions = transactions[:limit]
+
+    page: Dict[str, Any] = {
+        "items": transactions,
+        "next_cursor": _encode_cursor(sort_by, transactions[-1]) if has_more else None,
+        "has_more": has_more,
+    }
+    if include_total:
+        page["total"] = result.count
 
-    logger.info(f"Fetched {len(transactions)} transactions for user {user_id}")
+    logger.info(f"Fetched {len(transactions)} transactions for user {user_id} (has_more={has_more})")
 
-    return transactions
+    return page
 
 
 async def get_transaction_by_id(
@@ -275,10 +442,12 @@ async def get_transaction_by_id(
         supabase_client.table("transaction")
         .select("*")
         .eq("id", transaction_id)
+        .limit(1)
         .execute()
     )
 
-    if not result.data or len(result.data) == 0:
+    transaction = _first(result)
+    if transaction is None:
         logger.warning(
             f"Transaction {transaction_id} not found or not accessible by user {user_id}"
         )
@@ -286,7 +455,7 @@ async def get_transaction_by_id(
 
     logger.info(f"Fetched transaction {transaction_id} for user {user_id}")
 
-    return cast(Dict[str, Any], result.data[0])
+    return transaction
 
 
 async def update_transaction(
@@ -304,9 +473,12 @@ async def update_transaction(
     Update an existing transaction record.
 
     This function:
-    1. Fetches the current transaction to ensure it exists and belongs to the user
-    2. Updates only the provided fields
-    3. RLS automatically enforces user_id = auth.uid()
+    1. Rejects calls with no fields to update before touching the database
+    2. Fetches the current transaction only when account_id or category_id
+       changes (the previous values are needed to recompute the old
+       account balance / category budgets)
+    3. Updates only the provided fields
+    4. RLS automatically enforces user_id = auth.uid()
 
     Args:
         supabase_client: Authenticated Supabase client (with user token)
@@ -323,7 +495,7 @@ async def update_transaction(
         The updated transaction record from Supabase, or None if not found
 
     Raises:
-        ValueError: If flow_type is invalid
+        ValueError: If flow_type is invalid or no fields were provided
         Exception: If the database operation fails
 
     Security:
@@ -331,19 +503,6 @@ async def update_transaction(
         - User can only update their own transactions
         - Attempting to update another user's transaction will fail silently (return None)
     """
-    # First, verify the transaction exists and belongs to the user
-    existing = await get_transaction_by_id(supabase_client, user_id, transaction_id)
-    if not existing:
-        logger.warning(
-            f"Cannot update transaction {transaction_id}: "
-            f"not found or not accessible by user {user_id}"
-        )
-        return None
-
-    # Validate flow_type if provided
-    if flow_type and flow_type not in ("income", "outcome"):
-        raise ValueError(f"Invalid flow_type: {flow_type}. Must be 'income' or 'outcome'")
-
     # Build update payload with only provided fields
     update_data: Dict[str, Any] = {}
     if account_id is not None:
@@ -360,8 +519,25 @@ async def update_transaction(
         update_data["description"] = description
 
     if not update_data:
-        logger.warning(f"No fields to update for transaction {transaction_id}")
-        return existing
+        raise ValueError("No fields provided to update")
+
+    # Validate flow_type if provided
+    if flow_type and flow_type not in _FLOW_TYPES:
+        raise ValueError(f"Invalid flow_type: {flow_type}. Must be 'income' or 'outcome'")
+
+    # The previous row is only needed to recompute the old account/category
+    # when those change; otherwise the UPDATE itself tells us if the
+    # transaction exists (RLS returns no rows for other users' transactions)
+    existing: Dict[str, Any] = {}
+    if account_id is not None or category_id is not None:
+        fetched = await get_transaction_by_id(supabase_client, user_id, transaction_id)
+        if not fetched:
+            logger.warning(
+                f"Cannot update transaction {transaction_id}: "
+                f"not found or not accessible by user {user_id}"
+            )
+            return None
+        existing = fetched
 
     logger.info(
         f"Updating transaction {transaction_id} for user {user_id}: "
@@ -376,12 +552,11 @@ async def update_transaction(
         .execute()
     )
 
-    if not result.data or len(result.data) == 0:
+    updated_transaction = _first(result)
+    if updated_transaction is None:
         logger.warning(f"Failed to update transaction {transaction_id}: no data returned")
         return None
 
-    updated_transaction = cast(Dict[str, Any], result.data[0])
-
     logger.info(f"Transaction {transaction_id} updated successfully for user {user_id}")
 
     # Recompute account balance if amount, account, or flow_type changed
@@ -392,25 +567,16 @@ async def update_transaction(
     )
 
     if should_recompute:
-        try:
-            from backend.services.account_service import recompute_account_balance
-
-            # Recompute balance for current account
-            current_account = updated_transaction.get("account_id")
-            if current_account:
-                await recompute_account_balance(supabase_client, user_id, current_account)
-                logger.debug(f"Account balance recomputed for account {current_account} after update")
-
-            # If account changed, also recompute old account balance
-            if account_id is not None and existing.get("account_id") != account_id:
-                old_account = existing.get("account_id")
-                if old_account:
-                    await recompute_account_balance(supabase_client, user_id, old_account)
-                    logger.debug(f"Account balance recomputed for old account {old_account} after transfer")
-
-        except Exception as e:
-            logger.warning(f"Failed to recompute account balance after transaction update: {e}")
-            # Don't fail the update, just log the warning
+        # Recompute balance for current account and, if the account changed,
+        # the old one. Both run concurrently in the background.
+        old_account = (
+            existing.get("account_id")
+            if account_id is not None and existing.get("account_id") != account_id
+            else None
+        )
+        recompute_balances_in_background(
+            supabase_client, user_id, updated_transaction.get("account_id"), old_account
+        )
 
     # TODO(db-team): regenerate and save embedding for transaction.embedding field using text-embedding-3-small
     # The embedding should be regenerated if description, amount, category, or date changed
@@ -515,7 +681,7 @@ async def delete_transaction(
     )
 
     # Verify deletion actually removed a row
-    if not result.data or len(result.data) == 0:
+    if _first(result) is None:
         logger.warning(
             f"Deletion of transaction {transaction_id} returned no rows for user {user_id}"
         )
@@ -523,16 +689,8 @@ async def delete_transaction(
 
     logger.info(f"Transaction {transaction_id} deleted successfully for user {user_id}")
 
-    # Recompute account balance after deletion
-    try:
-        from backend.services.account_service import recompute_account_balance
-        account_id_for_recompute = existing.get("account_id")
-        if account_id_for_recompute:
-            await recompute_account_balance(supabase_client, user_id, account_id_for_recompute)
-            logger.debug(f"Account balance recomputed for account {account_id_for_recompute} after deletion")
-    except Exception as e:
-        logger.warning(f"Failed to recompute account balance after transaction deletion: {e}")
-        # Don't fail the deletion, just log the warning
+    # Recompute account balance in the background after deletion
+    recompute_balances_in_background(supabase_client, user_id, existing.get("account_id"))
 
     # Recompute budget consumption for affected category
     category_id = existing.get("category_id")
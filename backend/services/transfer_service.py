@@ -6,10 +6,147 @@ paired recurring_transaction rules (recurring transfers).
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+import uuid
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from postgrest.exceptions import APIError
+from pydantic import TypeAdapter, ValidationError
+from typing_extensions import TypedDict
+
+from backend.db.client import execute_query, execute_rpc
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to build TransactionDetailResponse (skips the embedding vector)
+TRANSACTION_FIELDS = (
+    "id,user_id,account_id,category_id,invoice_id,flow_type,amount,date,"
+    "description,paired_transaction_id,created_at,updated_at"
+)
+
+# RPC parameter names, in the positional order each call site supplies values
+# (zipped with strict=True, so a key/value count mismatch raises instead of
+# silently dropping a parameter to its SQL DEFAULT)
+_CREATE_TRANSFER_KEYS = (
+    'p_user_id', 'p_from_account_id', 'p_to_account_id',
+    'p_amount', 'p_date', 'p_description', 'p_idempotency_key',
+)
+_UPDATE_TRANSFER_KEYS = (
+    'p_transaction_id', 'p_user_id', 'p_amount', 'p_date', 'p_description',
+)
+_DELETE_TRANSFER_KEYS = ('p_transaction_id', 'p_user_id')
+_CREATE_TRANSFERS_BULK_KEYS = ('p_user_id', 'p_rows')
+_CREATE_RECURRING_TRANSFER_KEYS = (
+    'p_user_id', 'p_from_account_id', 'p_to_account_id', 'p_amount',
+    'p_description_outgoing', 'p_description_incoming',
+    'p_frequency', 'p_interval', 'p_start_date',
+    'p_by_weekday', 'p_by_monthday', 'p_end_date', 'p_is_active',
+)
+
+
+# --- RPC result payloads ---
+# typing_extensions.TypedDict is required by pydantic on Python < 3.12
+
+class CreatedPairRow(TypedDict):
+    """Row returned by create_transfer / create_recurring_transfer."""
+    outgoing: Dict[str, Any]
+    incoming: Dict[str, Any]
+
+
+class BulkCreatedPairRow(CreatedPairRow):
+    """Row returned by create_transfers_bulk (ord is the 1-based input position)."""
+    ord: int
+
+
+class UpdatedPairRow(TypedDict):
+    """Row returned by update_transfer."""
+    updated: Dict[str, Any]
+    paired: Dict[str, Any]
+
+
+class DeletedTransferRow(TypedDict):
+    """Row returned by delete_transfer."""
+    deleted_transaction_id: str
+    paired_transaction_id: str
+    from_account_id: Optional[str]
+    to_account_id: Optional[str]
+
+
+# Compiled once; validation runs in pydantic-core
+_RPC_RESULT_ADAPTERS: Dict[str, TypeAdapter[Any]] = {
+    'create_transfer': TypeAdapter(List[CreatedPairRow]),
+    'update_transfer': TypeAdapter(List[UpdatedPairRow]),
+    'delete_transfer': TypeAdapter(List[DeletedTransferRow]),
+    'create_transfers_bulk': TypeAdapter(List[BulkCreatedPairRow]),
+    'create_recurring_transfer': TypeAdapter(List[CreatedPairRow]),
+}
+
+# Unpack the jsonb columns returned by the transfer RPCs in one C-level call
+_get_created_pair = itemgetter('outgoing', 'incoming')
+_get_updated_pair = itemgetter('updated', 'paired')
+_get_deleted_ids = itemgetter('deleted_transaction_id', 'paired_transaction_id')
+
+# Upper bound enforced by the create_transfers_bulk RPC
+MAX_BULK_TRANSFERS = 1000
+
+# SQLSTATE of a plpgsql RAISE EXCEPTION without an explicit ERRCODE; the
+# transfer RPCs use it for ownership and validation failures
+_RPC_VALIDATION_SQLSTATE = 'P0001'
+
+# SQLSTATE raised by create_transfer when an idempotency key is replayed
+# for a deleted transfer or with different transfer details
+_RPC_CONFLICT_SQLSTATE = 'KS409'
+
+
+class IdempotencyConflictError(ValueError):
+    """An idempotency key was reused for a deleted or different transfer."""
+
+
+def _money_param(amount: Union[Decimal, str]) -> str:
+    """
+    Serialize an amount for a NUMERIC RPC parameter.
+
+    Amounts travel as decimal strings so PostgreSQL parses them straight
+    into NUMERIC; a JSON float would carry binary rounding error.
+    """
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation as e:
+        raise ValueError(f"Invalid amount: {amount!r}") from e
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    return str(value)
+
+
+async def _call_transfer_rpc(
+    supabase_client: Any,
+    function: str,
+    params: Dict[str, Any]
+) -> List[Any]:
+    """
+    Call a transfer RPC and validate its rows against the payload TypedDict.
+
+    RPC validation errors (SQLSTATE P0001) surface as ValueError, and
+    idempotency conflicts (KS409) as IdempotencyConflictError. A payload
+    that doesn't match the expected shape is a server-side bug, so it is
+    raised as a plain Exception (pydantic's ValidationError is a ValueError
+    and would otherwise be reported to the client as a 400).
+    """
+    try:
+        rows = await execute_rpc(supabase_client, function, params)
+    except APIError as e:
+        if e.code == _RPC_CONFLICT_SQLSTATE:
+            raise IdempotencyConflictError(e.message) from e
+        if e.code == _RPC_VALIDATION_SQLSTATE:
+            raise ValueError(e.message) from e
+        raise
+
+    try:
+        return _RPC_RESULT_ADAPTERS[function].validate_python(rows or [])
+    except ValidationError as e:
+        raise Exception(f"RPC {function} returned an unexpected payload: {e}") from e
+
 
 # --- Normal Transfer Service Functions ---
 
@@ -18,14 +155,16 @@ async def create_transfer(
     user_id: str,
     from_account_id: str,
     to_account_id: str,
-    amount: float,
+    amount: Union[Decimal, str],
     date: str,
-    description: Optional[str] = None
+    description: Optional[str] = None,
+    idempotency_key: Optional[str] = None
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Create a one-time internal transfer between two accounts.
 
-    Uses RPC function `create_transfer` for atomic paired transaction creation.
+    Uses RPC function `create_transfer` for atomic paired transaction creation;
+    the RPC returns both created rows, so no follow-up fetch is needed.
     The RPC automatically assigns the correct 'transfer' category based on flow_type:
     - Outgoing transaction (outcome): Uses 'transfer' + 'outcome' category
     - Incoming transaction (income): Uses 'transfer' + 'income' category
@@ -35,14 +174,18 @@ async def create_transfer(
         user_id: User UUID from auth token
         from_account_id: Source account UUID
         to_account_id: Destination account UUID
-        amount: Amount to transfer (must be > 0)
+        amount: Amount to transfer (must be > 0), as Decimal or decimal string
         date: Transfer date (ISO-8601 format)
         description: Optional description for both transactions
+        idempotency_key: Optional client key; repeating a call with the same
+            key and details returns the transfer created by the first call
 
     Returns:
         Tuple of (outgoing_transaction, incoming_transaction) dicts
 
     Raises:
+        IdempotencyConflictError: If idempotency_key belongs to a deleted
+            transfer or to one with a different amount, accounts or date
         ValueError: If accounts don't belong to user or validation fails
         Exception: If RPC call fails
 
@@ -50,68 +193,43 @@ async def create_transfer(
         - RPC validates both accounts belong to user_id
         - All operations happen atomically in DB
         - Categories are flow-aware: same key='transfer', different flow_type
+        - Both account balances are adjusted inside the RPC
+        - Idempotency keys are unique per user, never across users
     """
     logger.info(
-        f"Creating transfer for user {user_id}: "
-        f"{amount} from {from_account_id} to {to_account_id}"
+        "Creating transfer for user %s: %s from %s to %s",
+        user_id, amount, from_account_id, to_account_id,
     )
 
     # Call RPC function for atomic transfer creation
     # RPC handles category selection internally (flow-aware)
-    result = supabase_client.rpc(
+    rows = await _call_transfer_rpc(
+        supabase_client,
         'create_transfer',
-        {
-            'p_user_id': user_id,
-            'p_from_account_id': from_account_id,
-            'p_to_account_id': to_account_id,
-            'p_amount': amount,
-            'p_date': date,
-            'p_description': description
-        }
-    ).execute()
-
-    if not result.data or len(result.data) == 0:
-        raise Exception("RPC create_transfer failed: no data returned")
-
-    rpc_result = result.data[0]
-    outgoing_id = rpc_result['outgoing_transaction_id']
-    incoming_id = rpc_result['incoming_transaction_id']
-
-    # Fetch both transactions for return value consistency
-    outgoing_result = (
-        supabase_client.table("transaction")
-        .select("*")
-        .eq("id", outgoing_id)
-        .execute()
-    )
-
-    incoming_result = (
-        supabase_client.table("transaction")
-        .select("*")
-        .eq("id", incoming_id)
-        .execute()
+        dict(zip(_CREATE_TRANSFER_KEYS, (
+            user_id, from_account_id, to_account_id, _money_param(amount), date, description,
+            idempotency_key,
+        ), strict=True))
     )
 
-    if not outgoing_result.data or not incoming_result.data:
-        raise Exception("Failed to fetch created transactions")
+    if not rows:
+        raise Exception("RPC create_transfer failed: no data returned")
 
-    outgoing_transaction = outgoing_result.data[0]
-    incoming_transaction = incoming_result.data[0]
+    # RPC returns both created rows
+    outgoing_transaction, incoming_transaction = _get_created_pair(rows[0])
+    outgoing_id = outgoing_transaction['id']
+    incoming_id = incoming_transaction['id']
 
     logger.info(
-        f"Transfer created via RPC: {outgoing_id} (out) <-> {incoming_id} (in)"
+        "Transfer created via RPC: %s (out) <-> %s (in)", outgoing_id, incoming_id,
+        extra={
+            "event": "transfer.created",
+            "user_id": user_id,
+            "outgoing_id": outgoing_id,
+            "incoming_id": incoming_id,
+        },
     )
 
-    # Recompute balances for both accounts after transfer
-    try:
-        from backend.services.account_service import recompute_account_balance
-        await recompute_account_balance(supabase_client, user_id, from_account_id)
-        await recompute_account_balance(supabase_client, user_id, to_account_id)
-        logger.debug("Account balances recomputed for both accounts after transfer creation")
-    except Exception as e:
-        logger.warning(f"Failed to recompute account balances after transfer creation: {e}")
-        # Don't fail the transfer creation, just log the warning
-
     return (outgoing_transaction, incoming_transaction)
 
 
@@ -119,20 +237,21 @@ async def update_transfer(
     supabase_client: Any,
     user_id: str,
     transaction_id: str,
-    amount: Optional[float] = None,
+    amount: Optional[Union[Decimal, str]] = None,
     date: Optional[str] = None,
     description: Optional[str] = None
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     Update a transfer by updating both paired transactions atomically.
 
-    Uses RPC function `update_transfer` for atomic update.
+    Uses RPC function `update_transfer` for atomic update; the RPC returns
+    both updated rows.
 
     Args:
         supabase_client: Authenticated Supabase client
         user_id: User UUID from auth token
         transaction_id: UUID of either transaction in the pair
-        amount: New amount (optional, must be > 0 if provided)
+        amount: New amount (optional, must be > 0 if provided), as Decimal or decimal string
         date: New date in ISO-8601 format (optional)
         description: New description (optional)
 
@@ -147,77 +266,69 @@ async def update_transfer(
         - RPC validates ownership and atomicity
         - Only amount, date, and description can be updated
         - Both transactions receive identical updates
+        - Both account balances are adjusted inside the RPC, and only when
+          the amount changes (date/description edits never touch balances)
 
     Notes:
         - category_id, flow_type, paired_transaction_id, and account_id are immutable
         - If any field is not provided (None), it remains unchanged
+        - If no field is provided, nothing is written: the current pair is
+          returned from a single read
     """
-    logger.info(f"Updating transfer for user {user_id}: transaction {transaction_id}")
+    logger.info("Updating transfer for user %s: transaction %s", user_id, transaction_id)
 
     # Validate amount if provided
-    if amount is not None and amount <= 0:
+    amount_param = _money_param(amount) if amount is not None else None
+    if amount_param is not None and Decimal(amount_param) <= 0:
         raise ValueError("Amount must be greater than 0")
 
+    # Nothing to change: return the current pair from one read, skip the RPC
+    if amount is None and date is None and description is None:
+        # transaction_id goes into a PostgREST filter string, so only a
+        # UUID is accepted (anything else could append filter clauses)
+        try:
+            transaction_id = str(uuid.UUID(transaction_id))
+        except ValueError:
+            raise ValueError("Transaction not found, not accessible, or not a transfer")
+        result = await execute_query(
+            supabase_client.table("transaction")
+            .select(TRANSACTION_FIELDS)
+            .or_(f"id.eq.{transaction_id},paired_transaction_id.eq.{transaction_id}")
+        )
+        by_id = {row["id"]: row for row in result.data or []}
+        transaction = by_id.pop(transaction_id, None)
+        paired = by_id.get(transaction.get("paired_transaction_id")) if transaction else None
+        if transaction is None or paired is None:
+            raise ValueError("Transaction not found, not accessible, or not a transfer")
+        return (transaction, paired)
+
     # Call RPC function for atomic transfer update
-    result = supabase_client.rpc(
+    rows = await _call_transfer_rpc(
+        supabase_client,
         'update_transfer',
-        {
-            'p_transaction_id': transaction_id,
-            'p_user_id': user_id,
-            'p_amount': amount,
-            'p_date': date,
-            'p_description': description
-        }
-    ).execute()
-
-    if not result.data or len(result.data) == 0:
-        raise Exception("RPC update_transfer failed: no data returned")
-
-    rpc_result = result.data[0]
-    updated_id = rpc_result['updated_transaction_id']
-    paired_id = rpc_result['updated_paired_transaction_id']
-
-    # Fetch both updated transactions for return value
-    updated_result = (
-        supabase_client.table("transaction")
-        .select("*")
-        .eq("id", updated_id)
-        .execute()
-    )
-
-    paired_result = (
-        supabase_client.table("transaction")
-        .select("*")
-        .eq("id", paired_id)
-        .execute()
+        dict(zip(_UPDATE_TRANSFER_KEYS, (
+            transaction_id, user_id, amount_param, date, description,
+        ), strict=True))
     )
 
-    if not updated_result.data or not paired_result.data:
-        raise Exception("Failed to fetch updated transactions")
+    if not rows:
+        raise Exception("RPC update_transfer failed: no data returned")
 
-    updated_transaction = updated_result.data[0]
-    paired_transaction = paired_result.data[0]
+    # RPC returns both updated rows
+    updated_transaction, paired_transaction = _get_updated_pair(rows[0])
+    updated_id = updated_transaction['id']
+    paired_id = paired_transaction['id']
 
     logger.info(
-        f"Transfer updated via RPC: {updated_id} <-> {paired_id}"
+        "Transfer updated via RPC: %s <-> %s", updated_id, paired_id,
+        extra={
+            "event": "transfer.updated",
+            "user_id": user_id,
+            "transaction_id": updated_id,
+            "paired_id": paired_id,
+        },
     )
 
-    # Recompute balances for both accounts after transfer update
-    try:
-        from backend.services.account_service import recompute_account_balance
-        from_account = updated_transaction.get("account_id")
-        to_account = paired_transaction.get("account_id")
-
-        if from_account:
-            await recompute_account_balance(supabase_client, user_id, from_account)
-        if to_account:
-            await recompute_account_balance(supabase_client, user_id, to_account)
-
-        logger.debug("Account balances recomputed for both accounts after transfer update")
-    except Exception as e:
-        logger.warning(f"Failed to recompute account balances after transfer update: {e}")
-        # Don't fail the transfer update, just log the warning
-
     return (updated_transaction, paired_transaction)
 
 
@@ -229,7 +340,9 @@ async def delete_transfer(
     """
     Delete a transfer by deleting both paired transactions.
 
-    Uses RPC function `delete_transfer` for atomic deletion.
+    Uses RPC function `delete_transfer` for atomic deletion. The RPC validates
+    the transaction, soft-deletes both legs, reverses their balance effect
+    and reports the affected accounts in a single round trip.
 
     Args:
         supabase_client: Authenticated Supabase client
@@ -240,71 +353,108 @@ async def delete_transfer(
         Tuple of (deleted_transaction_id, paired_transaction_id)
 
     Raises:
-        ValueError: If transaction not found or not a transfer
+        ValueError: If the transaction is not found, not owned, or not a transfer
         Exception: If RPC call fails
 
     Security:
-        RPC validates ownership and atomicity
+        RPC validates ownership and atomicity, and reverses both account
+        balance effects in the same database transaction
     """
-    logger.info(f"Deleting transfer for user {user_id}: transaction {transaction_id}")
-
-    # Fetch the transaction and its pair BEFORE deletion to get account IDs
-    transaction_result = (
-        supabase_client.table("transaction")
-        .select("account_id, paired_transaction_id")
-        .eq("id", transaction_id)
-        .execute()
+    logger.info("Deleting transfer for user %s: transaction %s", user_id, transaction_id)
+
+    # Call RPC function for atomic transfer deletion
+    rows = await _call_transfer_rpc(
+        supabase_client,
+        'delete_transfer',
+        dict(zip(_DELETE_TRANSFER_KEYS, (transaction_id, user_id), strict=True))
     )
 
-    if not transaction_result.data or len(transaction_result.data) == 0:
-        raise ValueError(f"Transaction {transaction_id} not found")
+    if not rows:
+        raise Exception("RPC delete_transfer failed: no data returned")
 
-    transaction = transaction_result.data[0]
-    account_1 = transaction.get("account_id")
-    paired_id_for_lookup = transaction.get("paired_transaction_id")
+    rpc_result = rows[0]
+    deleted_id, paired_id = _get_deleted_ids(rpc_result)
 
-    account_2 = None
-    if paired_id_for_lookup:
-        paired_result = (
-            supabase_client.table("transaction")
-            .select("account_id")
-            .eq("id", paired_id_for_lookup)
-            .execute()
+    logger.info(
+        "Transfer deleted via RPC: %s and %s (accounts %s -> %s)",
+        deleted_id, paired_id,
+        rpc_result.get('from_account_id'), rpc_result.get('to_account_id'),
+        extra={
+            "event": "transfer.deleted",
+            "user_id": user_id,
+            "transaction_id": deleted_id,
+            "paired_id": paired_id,
+        },
+    )
+
+    return (deleted_id, paired_id)
+
+
+async def create_transfers_bulk(
+    supabase_client: Any,
+    user_id: str,
+    transfers: List[Dict[str, Any]]
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Create many transfers in a single RPC call.
+
+    Intended for imports: all transfers are written atomically by one
+    create_transfers_bulk RPC (one round trip, balances adjusted once per
+    account), instead of one create_transfer call per transfer.
+
+    Args:
+        supabase_client: Authenticated Supabase client
+        user_id: User UUID from auth token
+        transfers: List of dicts with from_account_id, to_account_id,
+            amount, date and optional description
+
+    Returns:
+        List of (outgoing_transaction, incoming_transaction) tuples, in the
+        same order as `transfers`
+
+    Raises:
+        ValueError: If the batch is too large, a row is invalid, or any
+            account doesn't belong to the user (nothing is written)
+        Exception: If RPC call fails
+
+    Security:
+        RPC validates every account belongs to user_id before inserting.
+    """
+    if not transfers:
+        return []
+    if len(transfers) > MAX_BULK_TRANSFERS:
+        raise ValueError(
+            f"At most {MAX_BULK_TRANSFERS} transfers can be created per call (got {len(transfers)})"
         )
-        if paired_result.data and len(paired_result.data) > 0:
-            account_2 = paired_result.data[0].get("account_id")
 
-    # Call RPC function for atomic transfer deletion
-    result = supabase_client.rpc(
-        'delete_transfer',
+    logger.info("Creating %s transfers in bulk for user %s", len(transfers), user_id)
+
+    payload = [
         {
-            'p_transaction_id': transaction_id,
-            'p_user_id': user_id
+            'from_account_id': transfer['from_account_id'],
+            'to_account_id': transfer['to_account_id'],
+            'amount': _money_param(transfer['amount']),
+            'date': transfer['date'],
+            'description': transfer.get('description'),
         }
-    ).execute()
+        for transfer in transfers
+    ]
 
-    if not result.data or len(result.data) == 0:
-        raise Exception("RPC delete_transfer failed: no data returned")
-
-    rpc_result = result.data[0]
-    deleted_id = rpc_result['deleted_transaction_id']
-    paired_id = rpc_result['paired_transaction_id']
+    rows = await _call_transfer_rpc(
+        supabase_client,
+        'create_transfers_bulk',
+        dict(zip(_CREATE_TRANSFERS_BULK_KEYS, (user_id, payload), strict=True))
+    )
 
-    logger.info(f"Transfer deleted via RPC: {deleted_id} and {paired_id}")
+    if not rows or len(rows) != len(transfers):
+        raise Exception("RPC create_transfers_bulk failed: unexpected number of rows returned")
 
-    # Recompute balances for both accounts after transfer deletion
-    try:
-        from backend.services.account_service import recompute_account_balance
-        if account_1:
-            await recompute_account_balance(supabase_client, user_id, account_1)
-        if account_2:
-            await recompute_account_balance(supabase_client, user_id, account_2)
-        logger.debug("Account balances recomputed for both accounts after transfer deletion")
-    except Exception as e:
-        logger.warning(f"Failed to recompute account balances after transfer deletion: {e}")
-        # Don't fail the deletion, just log the warning
+    logger.info(
+        "Bulk transfer created via RPC: %s transfers", len(rows),
+        extra={"event": "transfer.bulk_created", "user_id": user_id, "count": len(rows)},
+    )
 
-    return (deleted_id, paired_id)
+    return [_get_created_pair(row) for row in rows]
 
 
 # --- Recurring Transfer Service Functions ---
@@ -314,7 +464,7 @@ async def create_recurring_transfer(
     user_id: str,
     from_account_id: str,
     to_account_id: str,
-    amount: float,
+    amount: Union[Decimal, str],
     description_outgoing: Optional[str],
     description_incoming: Optional[str],
     frequency: str,
@@ -328,7 +478,8 @@ async def create_recurring_transfer(
     """
     Create a recurring internal transfer.
 
-    Uses RPC function `create_recurring_transfer` for atomic paired rule creation.
+    Uses RPC function `create_recurring_transfer` for atomic paired rule creation;
+    the RPC returns both created rules.
     The RPC automatically assigns the correct 'transfer' category based on flow_type:
     - Outgoing rule (outcome): Uses 'transfer' + 'outcome' category
     - Incoming rule (income): Uses 'transfer' + 'income' category
@@ -338,7 +489,7 @@ async def create_recurring_transfer(
         user_id: User UUID from auth token
         from_account_id: Source account UUID
         to_account_id: Destination account UUID
-        amount: Amount per occurrence
+        amount: Amount per occurrence, as Decimal or decimal string
         description_outgoing: Description for outgoing side (optional)
         description_incoming: Description for incoming side (optional)
         frequency: 'daily', 'weekly', 'monthly', or 'yearly'
@@ -362,61 +513,39 @@ async def create_recurring_transfer(
         - Categories are flow-aware: same key='transfer', different flow_type
     """
     logger.info(
-        f"Creating recurring transfer for user {user_id}: "
-        f"{amount} from {from_account_id} to {to_account_id}, {frequency}"
+        "Creating recurring transfer for user %s: %s from %s to %s, %s",
+        user_id, amount, from_account_id, to_account_id, frequency,
     )
 
     # Call RPC function for atomic recurring transfer creation
     # RPC handles category selection internally (flow-aware)
-    result = supabase_client.rpc(
+    rows = await _call_transfer_rpc(
+        supabase_client,
         'create_recurring_transfer',
-        {
-            'p_user_id': user_id,
-            'p_from_account_id': from_account_id,
-            'p_to_account_id': to_account_id,
-            'p_amount': amount,
-            'p_description_outgoing': description_outgoing,
-            'p_description_incoming': description_incoming,
-            'p_frequency': frequency,
-            'p_interval': interval,
-            'p_start_date': start_date,
-            'p_by_weekday': by_weekday,
-            'p_by_monthday': by_monthday,
-            'p_end_date': end_date,
-            'p_is_active': is_active
-        }
-    ).execute()
-
-    if not result.data or len(result.data) == 0:
-        raise Exception("RPC create_recurring_transfer failed: no data returned")
-
-    rpc_result = result.data[0]
-    outgoing_id = rpc_result['outgoing_rule_id']
-    incoming_id = rpc_result['incoming_rule_id']
-
-    # Fetch both rules for return value consistency
-    outgoing_result = (
-        supabase_client.table("recurring_transaction")
-        .select("*")
-        .eq("id", outgoing_id)
-        .execute()
+        dict(zip(_CREATE_RECURRING_TRANSFER_KEYS, (
+            user_id, from_account_id, to_account_id, _money_param(amount),
+            description_outgoing, description_incoming,
+            frequency, interval, start_date,
+            by_weekday, by_monthday, end_date, is_active,
+        ), strict=True))
     )
 
-    incoming_result = (
-        supabase_client.table("recurring_transaction")
-        .select("*")
-        .eq("id", incoming_id)
-        .execute()
-    )
-
-    if not outgoing_result.data or not incoming_result.data:
-        raise Exception("Failed to fetch created recurring rules")
+    if not rows:
+        raise Exception("RPC create_recurring_transfer failed: no data returned")
 
-    outgoing_rule = outgoing_result.data[0]
-    incoming_rule = incoming_result.data[0]
+    # RPC returns both created rules
+    outgoing_rule, incoming_rule = _get_created_pair(rows[0])
+    outgoing_id = outgoing_rule['id']
+    incoming_id = incoming_rule['id']
 
     logger.info(
-        f"Recurring transfer created via RPC: {outgoing_id} (out) <-> {incoming_id} (in)"
+        "Recurring transfer created via RPC: %s (out) <-> %s (in)", outgoing_id, incoming_id,
+        extra={
+            "event": "transfer.recurring_created",
+            "user_id": user_id,
+            "outgoing_id": outgoing_id,
+            "incoming_id": incoming_id,
+        },
     )
 
     return (outgoing_rule, incoming_rule)
@@ -8,13 +8,48 @@ Wishlists represent user purchase goals (what they want to buy), and
 wishlist_items represent specific store options saved from recommendation flow.
 """
 
-import logging
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Dict, List, Optional, cast
+import base64
+import json
+import uuid
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Context, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from supabase import Client
 
-logger = logging.getLogger(__name__)
+from backend.db.client import execute_query
+from backend.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Columns needed to build WishlistResponse (list views skip item_count)
+WISHLIST_FIELDS = (
+    "id,user_id,goal_title,budget_hint,currency_code,target_date,"
+    "preferred_store,user_note,status,created_at,updated_at"
+)
+
+# Columns update_wishlist may write; id, item_count and timestamps are not
+_UPDATABLE_WISHLIST_FIELDS = frozenset({
+    "goal_title", "budget_hint", "currency_code", "target_date",
+    "preferred_store", "user_note", "status",
+})
+
+# Most recommendation items a single create may save (mirrors the schema and RPC)
+_MAX_SELECTED_ITEMS = 3
+
+# Parameter names of create_wishlist_with_items, in call order (zipped with
+# strict=True so a key/value count mismatch raises instead of dropping a param)
+_CREATE_WISHLIST_KEYS = (
+    "p_user_id", "p_goal_title", "p_budget_hint", "p_currency_code",
+    "p_target_date", "p_preferred_store", "p_user_note", "p_items",
+)
+
+_NUMERIC_12_2_QUANTUM = Decimal("0.01")
+_NUMERIC_12_2_MAX = Decimal("9999999999.99")
+# NUMERIC(12,2) needs 12 significant digits; a small private context keeps
+# quantize cheap and avoids the thread-local default-context lookup
+_NUMERIC_12_2_CONTEXT = Context(prec=14, rounding=ROUND_HALF_UP)
 
 
 def _normalize_numeric_12_2(value: Any) -> str:
@@ -27,55 +62,151 @@ def _normalize_numeric_12_2(value: Any) -> str:
     Decimal is performed for precise rounding.
     """
     if not isinstance(value, Decimal):
-        try:
-            value = Decimal(str(value))
-        except Exception as exc:  # pragma: no cover - defensive
-            raise ValueError("numeric value required") from exc
+        return _normalize_numeric_12_2_text(str(value))
+
+    # At most 2 decimal places already: nothing to round
+    exponent = value.as_tuple().exponent
+    if isinstance(exponent, int) and exponent >= -2:
+        if value.copy_abs() > _NUMERIC_12_2_MAX:
+            raise ValueError("value exceeds NUMERIC(12,2) range")
+        return f"{value:.2f}"
+
+    return _quantize_numeric_12_2(value)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_numeric_12_2_text(text: str) -> str:
+    """Cached _normalize_numeric_12_2 for str/int/float inputs (keyed by their text)."""
+    try:
+        value = Decimal(text)
+    except Exception as exc:  # pragma: no cover - defensive
+        raise ValueError("numeric value required") from exc
+    return _quantize_numeric_12_2(value)
+
 
-    quantized = value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    max_val = Decimal("9999999999.99")
-    if quantized.copy_abs() > max_val:
+def _quantize_numeric_12_2(value: Decimal) -> str:
+    try:
+        # Raises InvalidOperation when the result needs more than 14 digits
+        quantized = _NUMERIC_12_2_CONTEXT.quantize(value, _NUMERIC_12_2_QUANTUM)
+        out_of_range = quantized.copy_abs() > _NUMERIC_12_2_MAX
+    except InvalidOperation as exc:
+        raise ValueError("value exceeds NUMERIC(12,2) range") from exc
+    if out_of_range:
         raise ValueError("value exceeds NUMERIC(12,2) range")
     return f"{quantized:.2f}"
 
 
+def _encode_cursor(row: Dict[str, Any]) -> str:
+    """
+    Encode the keyset position of a wishlist as an opaque, URL-safe cursor.
+
+    Args:
+        row: Last wishlist of the page
+
+    Returns:
+        Cursor string carrying (created_at, id)
+    """
+    payload = json.dumps([row.get("created_at"), row.get("id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a cursor produced by _encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (created_at, id) of the last wishlist of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed, or its values are not an ISO
+            timestamp and a UUID (they are interpolated into a PostgREST filter)
+    """
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        datetime.fromisoformat(created_at)
+        row_id = str(uuid.UUID(row_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
+
+
 async def get_user_wishlists(
     supabase_client: Client,
     user_id: str,
     limit: int = 50,
-    offset: int = 0
-) -> List[Dict[str, Any]]:
+    offset: int = 0,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Fetch all wishlists belonging to the user with pagination support.
+    Fetch a page of wishlists belonging to the user, newest first.
+
+    Pages are fetched with limit + 1 rows to detect whether more exist. When
+    a cursor is given, the page starts after the (created_at, id) it encodes
+    and offset is ignored (keyset pagination), so deep pages cost the same
+    as the first one.
 
     Args:
         supabase_client: Authenticated Supabase client
         user_id: The authenticated user's ID
         limit: Maximum number of wishlists to return (default 50)
         offset: Number of wishlists to skip for pagination (default 0)
+        cursor: Optional next_cursor from a previous page
 
     Returns:
-        List of wishlist dicts
+        Dict with:
+        - items: List of wishlist dicts
+        - next_cursor: Cursor for the next page, or None if this is the last page
+        - has_more: Whether more wishlists exist after this page
+
+    Raises:
+        ValueError: If the cursor is invalid
 
     Security:
         - RLS enforces user_id = auth.uid()
         - User can only access their own wishlists
     """
-    logger.debug(f"Fetching wishlists for user {user_id} (limit={limit}, offset={offset})")
+    logger.debug(
+        "Fetching wishlists for user %s (limit=%s, offset=%s, cursor=%s)",
+        user_id, limit, offset, "yes" if cursor else "no",
+    )
 
-    result = (
+    query = (
         supabase_client.table("wishlist")
-        .select("*")
+        .select(WISHLIST_FIELDS)
         .eq("user_id", user_id)
-        .order("created_at", desc=True)
-        .range(offset, offset + limit - 1)
-        .execute()
     )
 
-    wishlists: List[Dict[str, Any]] = cast(List[Dict[str, Any]], result.data or [])
-    logger.info(f"Found {len(wishlists)} wishlists for user {user_id}")
+    # Keyset pagination: continue strictly after the previous page's last row
+    if cursor:
+        last_created_at, last_id = _decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{last_created_at}",'
+            f'and(created_at.eq."{last_created_at}",id.lt."{last_id}")'
+        )
+        offset = 0
+
+    # id breaks ties so cursors are stable; one extra row signals another page
+    result = await execute_query(
+        query.order("created_at", desc=True)
+        .order("id", desc=True)
+        .range(offset, offset + limit)
+    )
+
+    wishlists: List[Dict[str, Any]] = result.data or []
+    has_more = len(wishlists) > limit
+    if has_more:
+        wishlists = wishlists[:limit]
 
-    return wishlists
+    logger.info("Found %d wishlists for user %s (has_more=%s)", len(wishlists), user_id, has_more)
+
+    return {
+        "items": wishlists,
+        "next_cursor": _encode_cursor(wishlists[-1]) if has_more else None,
+        "has_more": has_more,
+    }
 
 
 async def get_wishlist_by_id(
@@ -98,22 +229,21 @@ async def get_wishlist_by_id(
         - RLS enforces user_id = auth.uid()
         - User can only access their own wishlists
     """
-    logger.debug(f"Fetching wishlist {wishlist_id} for user {user_id}")
+    logger.debug("Fetching wishlist %s for user %s", wishlist_id, user_id)
 
-    result = (
+    result = await execute_query(
         supabase_client.table("wishlist")
         .select("*")
         .eq("id", wishlist_id)
         .eq("user_id", user_id)
-        .execute()
     )
 
-    if not result.data or len(result.data) == 0:
-        logger.warning(f"Wishlist {wishlist_id} not found for user {user_id}")
+    wishlist: Optional[Dict[str, Any]] = next(iter(result.data or []), None)
+    if wishlist is None:
+        logger.warning("Wishlist %s not found for user %s", wishlist_id, user_id)
         return None
 
-    wishlist: Dict[str, Any] = cast(Dict[str, Any], result.data[0])
-    logger.info(f"Wishlist {wishlist_id} found for user {user_id}")
+    logger.info("Wishlist %s found for user %s", wishlist_id, user_id)
 
     return wishlist
 
@@ -136,22 +266,68 @@ async def get_wishlist_items(
         RLS is handled by the parent wishlist query. This assumes
         the caller has already verified wishlist ownership.
     """
-    logger.debug(f"Fetching items for wishlist {wishlist_id}")
+    logger.debug("Fetching items for wishlist %s", wishlist_id)
 
-    result = (
+    result = await execute_query(
         supabase_client.table("wishlist_item")
         .select("*")
         .eq("wishlist_id", wishlist_id)
         .order("created_at", desc=False)
-        .execute()
     )
 
-    items: List[Dict[str, Any]] = cast(List[Dict[str, Any]], result.data or [])
-    logger.info(f"Found {len(items)} items for wishlist {wishlist_id}")
+    items: List[Dict[str, Any]] = result.data or []
+    logger.info("Found %d items for wishlist %s", len(items), wishlist_id)
 
     return items
 
 
+async def get_wishlist_with_items(
+    supabase_client: Client,
+    user_id: str,
+    wishlist_id: str
+) -> Optional[tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Fetch a wishlist and all its items in a single query.
+
+    Uses PostgREST resource embedding (wishlist_item via its FK), so the
+    wishlist and its items come back in one round trip instead of
+    get_wishlist_by_id followed by get_wishlist_items.
+
+    Args:
+        supabase_client: Authenticated Supabase client
+        user_id: The authenticated user's ID
+        wishlist_id: The wishlist UUID
+
+    Returns:
+        Tuple of (wishlist_dict, items) with items oldest first, or None if
+        the wishlist is not found
+
+    Security:
+        - RLS enforces user_id = auth.uid() on wishlist
+        - RLS on wishlist_item only returns items of the user's own wishlists
+    """
+    logger.debug("Fetching wishlist %s with items for user %s", wishlist_id, user_id)
+
+    result = await execute_query(
+        supabase_client.table("wishlist")
+        .select("*, wishlist_item(*)")
+        .eq("id", wishlist_id)
+        .eq("user_id", user_id)
+        .order("created_at", desc=False, foreign_table="wishlist_item")
+        .limit(1)
+    )
+
+    wishlist: Optional[Dict[str, Any]] = next(iter(result.data or []), None)
+    if wishlist is None:
+        logger.warning("Wishlist %s not found for user %s", wishlist_id, user_id)
+        return None
+
+    items: List[Dict[str, Any]] = wishlist.pop("wishlist_item", None) or []
+    logger.info("Wishlist %s found with %d items for user %s", wishlist_id, len(items), user_id)
+
+    return wishlist, items
+
+
 async def create_wishlist(
     supabase_client: Client,
     user_id: str,
@@ -186,20 +362,49 @@ async def create_wishlist(
         Tuple of (created_wishlist_dict, items_created_count)
 
     Raises:
-        ValueError: If currency doesn't match user's profile.currency_preference
+        ValueError: If currency doesn't match user's profile.currency_preference,
+            or more than _MAX_SELECTED_ITEMS items are given
         Exception: If wishlist or item creation fails
 
     Security:
         - RLS enforces user_id = auth.uid()
-        - All operations are atomic (single transaction context via Supabase)
+        - Currency check, wishlist and items run in one RPC (single DB transaction)
         - Single-currency-per-user policy enforced
     """
-    # Validate currency matches user's profile (single-currency-per-user policy)
+    if selected_items and len(selected_items) > _MAX_SELECTED_ITEMS:
+        raise ValueError(f"selected_items must contain at most {_MAX_SELECTED_ITEMS} items")
+
+    logger.info(
+        "Creating wishlist for user %s: goal_title='%s', budget_hint=%s, items=%d",
+        user_id, goal_title, budget_hint, len(selected_items) if selected_items else 0,
+    )
+
+    # Prepare items as JSONB array for RPC
+    items_jsonb = [
+        {
+            "product_title": item["product_title"],
+            "price_total": _normalize_numeric_12_2(item["price_total"]),
+            "seller_name": item["seller_name"],
+            "url": str(item["url"]),
+            "pickup_available": item["pickup_available"],
+            "warranty_info": item.get("warranty_info") or "",
+            "copy_for_user": item["copy_for_user"],
+            "badges": item["badges"]  # Already list, RPC stores it as JSONB
+        }
+        for item in selected_items or []
+    ]
+
+    # One RPC validates the currency, inserts the wishlist and its items in a
+    # single transaction, and returns the created row (no follow-up fetch)
     try:
-        supabase_client.rpc(
-            'validate_user_currency',
-            {'p_user_id': user_id, 'p_currency': currency_code}
-        ).execute()
+        rpc_result = await execute_query(supabase_client.rpc(
+            "create_wishlist_with_items",
+            dict(zip(_CREATE_WISHLIST_KEYS, (
+                user_id, goal_title, _normalize_numeric_12_2(budget_hint), currency_code,
+                target_date, preferred_store, user_note,
+                items_jsonb,  # Pass as list, Supabase client handles JSONB conversion
+            ), strict=True))
+        ))
     except Exception as e:
         error_msg = str(e)
         if "Currency mismatch" in error_msg:
@@ -209,90 +414,18 @@ async def create_wishlist(
             )
         raise
 
-    logger.info(
-        f"Creating wishlist for user {user_id}: "
-        f"goal_title='{goal_title}', budget_hint={budget_hint}, "
-        f"items={len(selected_items) if selected_items else 0}"
-    )
-
-    # RPC for atomic creation ONLY when items are present
-    # Otherwise, simple insert is sufficient (no atomicity needed for single row)
-    if selected_items and len(selected_items) > 0:
-        logger.info(f"Using RPC for atomic wishlist+items creation ({len(selected_items)} items)")
-
-        # Prepare items as JSONB array for RPC
-        items_jsonb = []
-        for item in selected_items:
-            item_jsonb = {
-                "product_title": item["product_title"],
-                "price_total": _normalize_numeric_12_2(item["price_total"]),
-                "seller_name": item["seller_name"],
-                "url": str(item["url"]),
-                "pickup_available": item["pickup_available"],
-                "warranty_info": item.get("warranty_info") or "",  # RPC expects non-null
-                "copy_for_user": item["copy_for_user"],
-                "badges": item["badges"]  # Already list, RPC converts to JSONB
-            }
-            items_jsonb.append(item_jsonb)
-
-        # Call RPC for atomic transaction
-        rpc_result = supabase_client.rpc(
-            "create_wishlist_with_items",
-            {
-                "p_user_id": user_id,
-                "p_goal_title": goal_title,
-                "p_budget_hint": _normalize_numeric_12_2(budget_hint),
-                "p_currency_code": currency_code,
-                "p_target_date": target_date,
-                "p_preferred_store": preferred_store,
-                "p_user_note": user_note,
-                "p_items": items_jsonb  # Pass as list, Supabase client handles JSONB conversion
-            }
-        ).execute()
-
-        rpc_data = cast(List[Dict[str, Any]], rpc_result.data) if rpc_result.data else []
-        if not rpc_data or len(rpc_data) == 0:
-            raise Exception("Failed to create wishlist with items: RPC returned no data")
-
-        rpc_response = rpc_data[0]
-        wishlist_id = str(rpc_response["wishlist_id"])
-        items_created = int(rpc_response["items_created"])
-
-        logger.info(f"RPC created wishlist {wishlist_id} with {items_created} items atomically")
-
-        # Fetch the created wishlist to return full record
-        fetched_wishlist = await get_wishlist_by_id(supabase_client, user_id, wishlist_id)
-        if not fetched_wishlist:
-            raise Exception(f"Failed to fetch created wishlist {wishlist_id}")
-
-        created_wishlist: Dict[str, Any] = fetched_wishlist
-
-        return created_wishlist, items_created
-
-    else:
-        # No items: simple insert (no atomicity needed)
-        logger.info("Creating wishlist without items (simple insert)")
-
-        wishlist_data = {
-            "user_id": user_id,
-            "goal_title": goal_title,
-            "budget_hint": _normalize_numeric_12_2(budget_hint),
-            "currency_code": currency_code,
-            "target_date": target_date,
-            "preferred_store": preferred_store,
-            "user_note": user_note,
-            "status": "active"
-        }
-
-        result = supabase_client.table("wishlist").insert(wishlist_data).execute()
+    rpc_response: Optional[Dict[str, Any]] = next(iter(rpc_result.data or []), None)
+    if rpc_response is None:
+        raise Exception("Failed to create wishlist: RPC returned no data")
 
-        if not result.data or len(result.data) == 0:
-            raise Exception("Failed to create wishlist: no data returned")
+    created_wishlist: Dict[str, Any] = rpc_response["wishlist"]
+    items_created = int(rpc_response["items_created"])
 
-        simple_created_wishlist: Dict[str, Any] = cast(Dict[str, Any], result.data[0])
-        logger.info(f"Wishlist created successfully: {simple_created_wishlist['id']}")
+    logger.info(
+        "RPC created wishlist %s with %d items atomically", created_wishlist['id'], items_created
+    )
 
-        return simple_created_wishlist, 0
+    return created_wishlist, items_created
 
 
 async def update_wishlist(
@@ -308,7 +441,8 @@ async def update_wishlist(
         supabase_client: Authenticated Supabase client
         user_id: The authenticated user's ID
         wishlist_id: The wishlist UUID to update
-        **updates: Fields to update (goal_title, budget_hint, etc.)
+        **updates: Fields to update (goal_title, budget_hint, etc.); fields
+            outside _UPDATABLE_WISHLIST_FIELDS are ignored
 
     Returns:
         The updated wishlist dict, or None if not found
@@ -316,8 +450,18 @@ async def update_wishlist(
     Security:
         - RLS enforces user_id = auth.uid()
         - User can only update their own wishlists
+        - Only allow-listed columns are written (never id, item_count or timestamps)
     """
-    logger.info(f"Updating wishlist {wishlist_id} for user {user_id}: {list(updates.keys())}")
+    ignored = updates.keys() - _UPDATABLE_WISHLIST_FIELDS
+    if ignored:
+        logger.warning("Ignoring non-updatable wishlist fields: %s", sorted(ignored))
+        updates = {k: v for k, v in updates.items() if k in _UPDATABLE_WISHLIST_FIELDS}
+
+    logger.info("Updating wishlist %s for user %s: %s", wishlist_id, user_id, list(updates.keys()))
+
+    # Nothing to write: return the current row without an UPDATE
+    if not updates:
+        return await get_wishlist_by_id(supabase_client, user_id, wishlist_id)
 
     # Convert/normalize budget_hint to NUMERIC(12,2) if present
     if "budget_hint" in updates:
@@ -326,20 +470,19 @@ async def update_wishlist(
         except Exception as exc:  # pragma: no cover - defensive
             raise ValueError("Invalid budget_hint: must be numeric and fit NUMERIC(12,2)") from exc
 
-    result = (
+    result = await execute_query(
         supabase_client.table("wishlist")
         .update(updates)
         .eq("id", wishlist_id)
         .eq("user_id", user_id)
-        .execute()
     )
 
-    if not result.data or len(result.data) == 0:
-        logger.warning(f"Wishlist {wishlist_id} not found for user {user_id}")
+    updated_wishlist: Optional[Dict[str, Any]] = next(iter(result.data or []), None)
+    if updated_wishlist is None:
+        logger.warning("Wishlist %s not found for user %s", wishlist_id, user_id)
         return None
 
-    updated_wishlist: Dict[str, Any] = cast(Dict[str, Any], result.data[0])
-    logger.info(f"Wishlist {wishlist_id} updated successfully")
+    logger.info("Wishlist %s updated successfully", wishlist_id)
 
     return updated_wishlist
 
@@ -371,33 +514,25 @@ async def delete_wishlist(
         - RLS enforces user_id = auth.uid()
         - User can only delete their own wishlists
     """
-    logger.info(f"Deleting wishlist {wishlist_id} for user {user_id}")
+    logger.info("Deleting wishlist %s for user %s", wishlist_id, user_id)
 
-    # Get count of items to delete (for response message)
-    items_result = (
-        supabase_client.table("wishlist_item")
-        .select("id", count=cast(Any, "exact"))
-        .eq("wishlist_id", wishlist_id)
-        .execute()
-    )
-
-    items_count = getattr(items_result, "count", 0) or 0
-    logger.info(f"Found {items_count} items to delete for wishlist {wishlist_id}")
-
-    # Delete wishlist (items cascade automatically)
-    delete_result = (
+    # Delete wishlist (items cascade automatically). The returned row carries
+    # the trigger-maintained item_count, so no separate COUNT is needed.
+    delete_result = await execute_query(
         supabase_client.table("wishlist")
         .delete()
         .eq("id", wishlist_id)
         .eq("user_id", user_id)
-        .execute()
     )
 
-    if not delete_result.data or len(delete_result.data) == 0:
+    deleted_wishlist: Optional[Dict[str, Any]] = next(iter(delete_result.data or []), None)
+    if deleted_wishlist is None:
         raise Exception("Failed to delete wishlist: not found or access denied")
 
+    items_count = int(deleted_wishlist.get("item_count") or 0)
+
     logger.info(
-        f"Wishlist {wishlist_id} deleted successfully. {items_count} items cascaded."
+        "Wishlist %s deleted successfully. %d items cascaded.", wishlist_id, items_count
     )
 
     return items_count
@@ -413,9 +548,8 @@ async def delete_wishlist_item(
     Delete a single wishlist item.
 
     Per DB delete rule:
-    1. Verify item belongs to a wishlist owned by the user
-    2. Delete the item
-    3. Parent wishlist remains unaffected
+    1. Delete the item (scoped to its parent wishlist)
+    2. Parent wishlist remains unaffected
 
     Args:
         supabase_client: Authenticated Supabase client
@@ -427,29 +561,23 @@ async def delete_wishlist_item(
         True if deleted, False if not found
 
     Security:
-        - Verifies wishlist ownership before allowing item deletion
-        - RLS protects against cross-user access
+        - RLS on wishlist_item only matches items whose parent wishlist is
+          owned by auth.uid(), so no separate ownership read is needed
+        - Items of another user's wishlist match no rows (returns False)
     """
-    logger.info(f"Deleting item {item_id} from wishlist {wishlist_id} for user {user_id}")
-
-    # Verify wishlist ownership
-    wishlist = await get_wishlist_by_id(supabase_client, user_id, wishlist_id)
-    if not wishlist:
-        logger.warning(f"Wishlist {wishlist_id} not found for user {user_id}")
-        return False
+    logger.info("Deleting item %s from wishlist %s for user %s", item_id, wishlist_id, user_id)
 
-    # Delete the item
-    delete_result = (
+    # Delete the item; RLS enforces ownership through the parent wishlist
+    delete_result = await execute_query(
         supabase_client.table("wishlist_item")
         .delete()
         .eq("id", item_id)
         .eq("wishlist_id", wishlist_id)
-        .execute()
     )
 
-    if not delete_result.data or len(delete_result.data) == 0:
-        logger.warning(f"Item {item_id} not found in wishlist {wishlist_id}")
+    if not delete_result.data:
+        logger.warning("Item %s not found in wishlist %s", item_id, wishlist_id)
         return False
 
-    logger.info(f"Item {item_id} deleted successfully from wishlist {wishlist_id}")
+    logger.info("Item %s deleted successfully from wishlist %s", item_id, wishlist_id)
     return True
@@ -17,8 +17,14 @@ Acceptable logging:
 - Error codes and sanitized error messages (no stack traces with secrets)
 """
 
+import json
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RESERVED_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None))
+) | {"message", "asctime"}
 
 
 def get_logger(name: str, level: Optional[int] = None) -> logging.Logger:
@@ -55,3 +61,33 @@ def get_logger(name: str, level: Optional[int] = None) -> logging.Logger:
         logger.addHandler(handler)
 
     return logger
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON objects.
+
+    Fields passed via `extra=` are emitted as top-level keys, so log
+    aggregators can index them without parsing the message text. The
+    message is still formatted lazily from its %-style args.
+
+    Usage:
+        >>> logger.info(
+        ...     "Transfer created via RPC: %s <-> %s", out_id, in_id,
+        ...     extra={"event": "transfer.created", "user_id": user_id},
+        ... )
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
@@ -12,18 +12,30 @@ Usage:
     python scripts/test_recommendations.py
     python scripts/test_recommendations.py --query "laptop para diseño" --budget 7000
     python scripts/test_recommendations.py --query "auriculares gaming" --budget 500 --country GT
+    python scripts/test_recommendations.py --suite --batch
+    python scripts/test_recommendations.py --suite --no-cache
+    python scripts/test_recommendations.py --suite --results suite.jsonl
 
 For more details, see: docs/testing/recommendation-local-testing.md
 """
 
 import argparse
 import asyncio
+import hashlib
 import json
+import functools
+import io
 import logging
 import os
+import re
+import statistics
 import sys
+import time
+import warnings
+from collections import defaultdict
 from decimal import Decimal
-from typing import Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping, Optional, Sequence
 from unittest.mock import MagicMock
 
 # Add the project root to the path
@@ -36,11 +48,47 @@ try:
 except ImportError:
     pass  # dotenv not installed, rely on environment variables
 
-from backend.services.recommendation_service import query_recommendations
-from backend.schemas.recommendations import (
-    RecommendationQueryResponseOK,
-    RecommendationQueryResponseNoValidOption,
-)
+# The recommendation stack (google-genai, pydantic models, supabase) is heavy;
+# it is imported by _load_backend() only when a test actually runs, so --help,
+# argument errors and --dry-run stay fast
+if TYPE_CHECKING:
+    from backend.schemas.recommendations import (
+        RecommendationQueryResponseNoValidOption,
+        RecommendationQueryResponseOK,
+    )
+    from backend.services.recommendation_service import (
+        RECOMMENDATION_MODEL,
+        build_generation_config,
+        build_recommendation_prompt,
+        parse_recommendation_response,
+        parse_recommendation_text,
+        query_recommendations,
+    )
+
+_backend_loaded = False
+
+
+def _load_backend() -> None:
+    """Import the recommendation service and schemas into module globals (once)."""
+    global _backend_loaded
+    global RECOMMENDATION_MODEL, build_generation_config, build_recommendation_prompt
+    global parse_recommendation_response, parse_recommendation_text, query_recommendations
+    global RecommendationQueryResponseOK, RecommendationQueryResponseNoValidOption
+    if _backend_loaded:
+        return
+    from backend.schemas.recommendations import (
+        RecommendationQueryResponseNoValidOption,
+        RecommendationQueryResponseOK,
+    )
+    from backend.services.recommendation_service import (
+        RECOMMENDATION_MODEL,
+        build_generation_config,
+        build_recommendation_prompt,
+        parse_recommendation_response,
+        parse_recommendation_text,
+        query_recommendations,
+    )
+    _backend_loaded = True
 
 
 # Configure logging
@@ -50,24 +98,215 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Terminal states of a Gemini batch job
+_BATCH_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+})
+_BATCH_POLL_SECONDS = 30
+
+# Live suite tests in flight at once
+_SUITE_CONCURRENCY = 8
+
+# Default Gemini requests per minute allowed by the rate limiter
+_GEMINI_RPM = 60
+
+# On-disk cache of live results, keyed by a hash of the query inputs, so
+# repeated runs don't spend quota on identical requests (--no-cache bypasses it)
+_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".rec_test_cache.json")
+_cache: Optional[dict] = None
+
+# Results caused by configuration or transport errors are never cached
+_UNCACHEABLE_REASONS = (
+    "Error querying recommendation service",
+    "Recommendation service is not configured",
+)
+
+# Live calls rejected by the API quota (HTTP 429) are retried with
+# exponential backoff instead of being recorded as failures
+_RATE_LIMIT_RETRIES = 3
+_RATE_LIMIT_BACKOFF_SECONDS = 1.0
+_RATE_LIMIT_MARKERS = ("429", "RESOURCE_EXHAUSTED")
+
+
+# In --debug runs, callbacks blocking the event loop longer than this are logged
+_SLOW_CALLBACK_SECONDS = 0.05
+
+# Profile locale per country for the mock Supabase client
+_COUNTRY_LOCALES = {
+    "GT": "es-GT",
+    "MX": "es-MX",
+    "SV": "es-SV",
+    "US": "en-US",
+    "CA": "en-CA",
+    "GB": "en-GB",
+    "BR": "pt-BR",
+}
+
+# Keys every suite test case must define
+_REQUIRED_TEST_KEYS = frozenset({"name", "query"})
+
+# Complete product titles in partially streamed JSON output
+_PRODUCT_TITLE_RE = re.compile(r'"product_title"\s*:\s*"([^"]+)"')
+
+# Report separators
+_SEP60 = "=" * 60
+_SEP70 = "=" * 70
+_HASH70 = "#" * 70
+_DASH70 = "-" * 70
+
+# Read once in main(), before any test runs
+GOOGLE_API_KEY: Optional[str] = None
+
+# Wall-clock samples (seconds) per timed phase, reported at the end of the suite
+_timings: "defaultdict[str, list[float]]" = defaultdict(list)
+
+
+class TaskTimer:
+    """Async context manager recording the wall time of one phase in _timings."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elapsed = 0.0
+
+    async def __aenter__(self) -> "TaskTimer":
+        self.start = time.perf_counter()
+        return self
+
+    async def __aexit__(self, *exc_info) -> bool:
+        self.elapsed = time.perf_counter() - self.start
+        _timings[self.name].append(self.elapsed)
+        return False
+
+
+def print_timings():
+    """Print count/total/avg/p95 per timed phase (aioprof-style table)."""
+    if not _timings:
+        return
+    buf = io.StringIO()
+    print(f"\n{'phase':<24} | {'count':>5} | {'total_ms':>10} | {'avg_ms':>9} | {'p95_ms':>9}", file=buf)
+    print(_DASH70, file=buf)
+    for name, samples in sorted(_timings.items(), key=lambda item: -sum(item[1])):
+        p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+        print(
+            f"{name:<24} | {len(samples):>5} | {sum(samples) * 1000:>10.0f} | "
+            f"{statistics.fmean(samples) * 1000:>9.0f} | {p95 * 1000:>9.0f}",
+            file=buf,
+        )
+    _write_block(buf)
+
+
+@functools.lru_cache(maxsize=64)
+def _budget_decimal(budget: Optional[float]) -> Optional[Decimal]:
+    """Budget as the Decimal the service expects (the suite reuses a few values)."""
+    return Decimal(str(budget)) if budget else None
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing max_rate acquisitions per time_period seconds.
+
+    Requests proceed immediately while tokens remain and are queued only
+    when a burst would exceed the rate, so fast responses are never held
+    back by a fixed sleep.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.rate = max_rate / time_period
+        self.tokens = float(max_rate)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.max_rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return self
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    async def __aexit__(self, *exc_info) -> bool:
+        return False
+
+
+# Paces live Gemini calls to the API quota (replaced in main() from --rpm)
+_gemini_limiter = AsyncRateLimiter(_GEMINI_RPM)
+
+
+def _cache_key(
+    query: str,
+    budget: Optional[float],
+    country: str,
+    currency: str,
+    store: Optional[str],
+    note: Optional[str],
+) -> str:
+    payload = {"q": query, "b": str(budget), "c": country, "cur": currency, "s": store, "n": note}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _test_key(test: Mapping[str, Any]) -> str:
+    """Cache/dedupe key of a suite test case (same inputs as run_test receives)."""
+    return _cache_key(
+        test["query"],
+        test.get("budget"),
+        test.get("country", "GT"),
+        test.get("currency", "GTQ"),
+        test.get("store"),
+        test.get("note"),
+    )
+
+
+def _load_cache() -> dict:
+    global _cache
+    if _cache is None:
+        try:
+            with open(_CACHE_PATH, encoding="utf-8") as fh:
+                _cache = json.load(fh)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def cache_get(key: str):
+    """Return the cached result for key, or None."""
+    data = _load_cache().get(key)
+    if data is None:
+        return None
+    if data["status"] == "OK":
+        return RecommendationQueryResponseOK.model_validate(data)
+    return RecommendationQueryResponseNoValidOption.model_validate(data)
+
+
+def cache_put(key: str, result) -> None:
+    """Store a result and persist the cache file."""
+    if isinstance(result, RecommendationQueryResponseNoValidOption) and (result.reason or "").startswith(
+        _UNCACHEABLE_REASONS
+    ):
+        return
+    cache = _load_cache()
+    cache[key] = result.model_dump(mode="json")
+    with open(_CACHE_PATH, "w", encoding="utf-8") as fh:
+        json.dump(cache, fh, ensure_ascii=False)
+
 
+@functools.lru_cache(maxsize=32)
 def create_mock_supabase_client(country: str = "GT", currency: str = "GTQ") -> MagicMock:
     """
     Create a mock Supabase client that returns a default user profile.
     
-    This allows testing without a real Supabase connection.
+    This allows testing without a real Supabase connection. The mock is only
+    read from, so one instance per (country, currency) is shared by all tests.
     """
-    # Map countries to locales
-    country_locales = {
-        "GT": "es-GT",
-        "MX": "es-MX",
-        "SV": "es-SV",
-        "US": "en-US",
-        "CA": "en-CA",
-        "GB": "en-GB",
-        "BR": "pt-BR",
-    }
-    locale = country_locales.get(country, f"es-{country}")
+    # Known locales are module constants; fallbacks are interned so every
+    # mock for the same country shares one string
+    locale = _COUNTRY_LOCALES.get(country) or sys.intern(f"es-{country}")
     
     mock_client = MagicMock()
     mock_response = MagicMock()
@@ -82,30 +321,100 @@ def create_mock_supabase_client(country: str = "GT", currency: str = "GTQ") -> M
     return mock_client
 
 
-def print_result(result):
-    """Pretty print the recommendation result."""
-    print("\n" + "=" * 60)
-    print(f"STATUS: {result.status}")
-    print("=" * 60)
+def _write_block(buf: io.StringIO) -> None:
+    """Emit a buffered block with a single stdout write."""
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+
+def print_result(result, out: Optional[io.StringIO] = None):
+    """
+    Pretty print the recommendation result.
+
+    Output goes to `out` when given; otherwise it is buffered and written
+    to stdout in one call.
+    """
+    buf = out if out is not None else io.StringIO()
+    print("\n" + _SEP60, file=buf)
+    print(f"STATUS: {result.status}", file=buf)
+    print(_SEP60, file=buf)
     
     if isinstance(result, RecommendationQueryResponseOK):
-        print(f"\n✅ Found {len(result.results_for_user)} recommendation(s) (web-grounded):\n")
+        print(f"\n✅ Found {len(result.results_for_user)} recommendation(s) (web-grounded):\n", file=buf)
         
         for i, product in enumerate(result.results_for_user, 1):
-            print(f"--- Product #{i} ---")
-            print(f"  Title:     {product.product_title}")
-            print(f"  Price:     {product.price_total}")
-            print(f"  Seller:    {product.seller_name}")
-            print(f"  URL:       {product.url}")
-            print(f"  Pickup:    {'Yes' if product.pickup_available else 'No'}")
-            print(f"  Warranty:  {product.warranty_info}")
-            print(f"  Copy:      {product.copy_for_user}")
-            print(f"  Badges:    {', '.join(product.badges)}")
-            print()
+            print(f"--- Product #{i} ---", file=buf)
+            print(f"  Title:     {product.product_title}", file=buf)
+            print(f"  Price:     {product.price_total}", file=buf)
+            print(f"  Seller:    {product.seller_name}", file=buf)
+            print(f"  URL:       {product.url}", file=buf)
+            print(f"  Pickup:    {'Yes' if product.pickup_available else 'No'}", file=buf)
+            print(f"  Warranty:  {product.warranty_info}", file=buf)
+            print(f"  Copy:      {product.copy_for_user}", file=buf)
+            print(f"  Badges:    {', '.join(product.badges)}", file=buf)
+            print(file=buf)
     
     elif isinstance(result, RecommendationQueryResponseNoValidOption):
-        print(f"\n❌ No valid options found")
-        print(f"  Reason: {result.reason}\n")
+        print(f"\n❌ No valid options found", file=buf)
+        print(f"  Reason: {result.reason}\n", file=buf)
+
+    if out is None:
+        _write_block(buf)
+
+
+def print_test_header(
+    query: str,
+    budget: Optional[float],
+    country: str,
+    currency: str,
+    store: Optional[str],
+    note: Optional[str],
+    out: Optional[io.StringIO] = None,
+):
+    """Print the inputs of a recommendation test (buffered like print_result)."""
+    buf = out if out is not None else io.StringIO()
+    print("\n" + _SEP60, file=buf)
+    print("RECOMMENDATION SYSTEM TEST (Gemini with Google Search)", file=buf)
+    print(_SEP60, file=buf)
+    print(f"\nQuery:    {query}", file=buf)
+    if budget:
+        print(f"Budget:   {budget} {currency}", file=buf)
+    print(f"Country:  {country}", file=buf)
+    print(f"Currency: {currency}", file=buf)
+    if store:
+        print(f"Store:    {store}", file=buf)
+    if note:
+        print(f"Note:     {note}", file=buf)
+    if out is None:
+        _write_block(buf)
+
+
+def print_suite_entry(index: int, total: int, test: Mapping[str, Any], result):
+    """Print one suite test (banner, inputs and result) with a single write."""
+    buf = io.StringIO()
+    print(f"\n\n{_HASH70}", file=buf)
+    print(f"# TEST {index}/{total}: {test['name']}", file=buf)
+    print(_HASH70, file=buf)
+    print_test_header(
+        test["query"],
+        test.get("budget"),
+        test.get("country", "GT"),
+        test.get("currency", "GTQ"),
+        test.get("store"),
+        test.get("note"),
+        out=buf,
+    )
+    if result:
+        print_result(result, out=buf)
+    _write_block(buf)
+
+
+def _is_rate_limited(result) -> bool:
+    """Whether a result is the service's error response for a 429 from Gemini."""
+    reason = getattr(result, "reason", None) or ""
+    return reason.startswith(_UNCACHEABLE_REASONS[0]) and any(
+        marker in reason for marker in _RATE_LIMIT_MARKERS
+    )
 
 
 async def run_test(
@@ -115,353 +424,592 @@ async def run_test(
     currency: str = "GTQ",
     store: Optional[str] = None,
     note: Optional[str] = None,
-    user_id: str = "test-user-123"
+    user_id: str = "test-user-123",
+    quiet: bool = False,
+    use_cache: bool = True,
+    supabase_client: Optional[MagicMock] = None,
+    stream: bool = False,
 ):
-    """Run a single recommendation test."""
-    
-    # Check if Google API key is configured
-    if not os.getenv("GOOGLE_API_KEY"):
-        print("\n⚠️  ERROR: GOOGLE_API_KEY environment variable not set!")
-        print("   Please set it in your .env file or export it:")
-        print("   export GOOGLE_API_KEY=your-gemini-api-key")
-        print("\n   Get your API key at: https://aistudio.google.com/app/apikey")
-        return
+    """
+    Run a single recommendation test.
+
+    quiet=True skips all printing; use_cache=False always calls Gemini
+    (the fresh result still refreshes the cache). supabase_client defaults
+    to the shared mock for (country, currency). stream=True streams the
+    Gemini output, printing progress as it arrives (interactive runs).
+    """
     
-    print("\n" + "=" * 60)
-    print("RECOMMENDATION SYSTEM TEST (Gemini with Google Search)")
-    print("=" * 60)
-    print(f"\nQuery:    {query}")
-    if budget:
-        print(f"Budget:   {budget} {currency}")
-    print(f"Country:  {country}")
-    print(f"Currency: {currency}")
-    if store:
-        print(f"Store:    {store}")
-    if note:
-        print(f"Note:     {note}")
-    print("\nCalling Gemini API (with Google Search grounding)...")
+    if not quiet:
+        print_test_header(query, budget, country, currency, store, note)
+        print("\nCalling Gemini API (with Google Search grounding)...")
     
-    # Create mock Supabase client
-    mock_client = create_mock_supabase_client(country, currency)
+    key = _cache_key(query, budget, country, currency, store, note)
+    async with TaskTimer("cache_lookup"):
+        result = cache_get(key) if use_cache else None
     
-    # Call the recommendation service
-    result = await query_recommendations(
-        supabase_client=mock_client,
-        user_id=user_id,
-        query_raw=query,
-        budget_hint=Decimal(str(budget)) if budget else None,
-        preferred_store=store,
-        user_note=note,
-    )
+    if result is None:
+        if supabase_client is None:
+            supabase_client = create_mock_supabase_client(country, currency)
+
+        delay = _RATE_LIMIT_BACKOFF_SECONDS
+        for attempt in range(_RATE_LIMIT_RETRIES + 1):
+            if stream:
+                async with _gemini_limiter, TaskTimer("stream_query"):
+                    result = await _stream_query(supabase_client, user_id, query, budget, store, note)
+            else:
+                # Call the recommendation service
+                async with _gemini_limiter, TaskTimer("query_recommendations"):
+                    result = await query_recommendations(
+                        supabase_client=supabase_client,
+                        user_id=user_id,
+                        query_raw=query,
+                        budget_hint=_budget_decimal(budget),
+                        preferred_store=store,
+                        user_note=note,
+                    )
+            if attempt == _RATE_LIMIT_RETRIES or not _is_rate_limited(result):
+                break
+            if not quiet:
+                print(f"Rate limited by Gemini; retrying in {delay:.0f}s...")
+            await asyncio.sleep(delay)
+            delay *= 2
+        cache_put(key, result)
+    elif not quiet:
+        print("(cached result; use --no-cache to refresh)")
     
     # Print the result
-    print_result(result)
+    if not quiet:
+        print_result(result)
     
     return result
 
 
-async def run_test_suite():
-    """Run a suite of predefined test cases."""
+async def _stream_query(
+    supabase_client: MagicMock,
+    user_id: str,
+    query: str,
+    budget: Optional[float],
+    store: Optional[str],
+    note: Optional[str],
+):
+    """
+    Stream one recommendation query from Gemini.
+
+    Uses the service's prompt, config and text parser, so the final result
+    matches query_recommendations. Product titles are printed as soon as
+    they appear in the partial output, and a dot is printed for chunks
+    without text (search/grounding progress), so the user sees activity
+    within the first chunk instead of waiting for the whole response.
+    """
+    from google import genai
+
+    client = genai.Client(api_key=GOOGLE_API_KEY)
+    prompt = await build_recommendation_prompt(
+        supabase_client,
+        user_id,
+        query,
+        budget_hint=_budget_decimal(budget),
+        preferred_store=store,
+        user_note=note,
+    )
+
+    text = ""
+    shown = 0
+    try:
+        stream = await client.aio.models.generate_content_stream(
+            model=RECOMMENDATION_MODEL,
+            contents=prompt,
+            config=build_generation_config(),
+        )
+        async for chunk in stream:
+            if not chunk.text:
+                print(".", end="", flush=True)
+                continue
+            text += chunk.text
+            titles = _PRODUCT_TITLE_RE.findall(text)
+            for title in titles[shown:]:
+                print(f"\n  … found: {title}", flush=True)
+            shown = len(titles)
+    except Exception as e:
+        logger.error(f"Error streaming from Gemini API: {e}")
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason=f"Error querying recommendation service: {str(e)}"
+        )
+    print()
+
+    if not text:
+        return RecommendationQueryResponseNoValidOption(
+            status="NO_VALID_OPTION",
+            reason="No response from recommendation service."
+        )
+    return parse_recommendation_text(text)
+
+
+async def run_batch(test_cases: Sequence[Mapping[str, Any]]) -> list:
+    """
+    Run every test case through one Gemini Batch API job.
+
+    Prompts and the generation config are built exactly as the live service
+    builds them, submitted as inline requests (responses come back in request
+    order), and parsed with the service's own response parser. Batch requests
+    are billed at a discount and need no client-side throttling, but the job
+    can take a while to be scheduled, so this path is opt-in (--batch).
+
+    Returns one result per test case (None when that request failed).
+    """
+    from google import genai
+    from google.genai import types
+
+    client = genai.Client(api_key=GOOGLE_API_KEY)
+    config = build_generation_config()
+
+    requests = []
+    for test in test_cases:
+        budget = test.get("budget")
+        async with TaskTimer("build_prompt"):
+            prompt = await build_recommendation_prompt(
+                create_mock_supabase_client(test.get("country", "GT"), test.get("currency", "GTQ")),
+                "test-user-123",
+                test["query"],
+                budget_hint=_budget_decimal(budget),
+                preferred_store=test.get("store"),
+                user_note=test.get("note"),
+            )
+        requests.append(types.InlinedRequest(
+            contents=[types.Content(role="user", parts=[types.Part(text=prompt)])],
+            config=config,
+        ))
+
+    async with TaskTimer("batch_job"):
+        job = client.batches.create(
+            model=RECOMMENDATION_MODEL,
+            src=requests,
+            config={"display_name": "kashi-recommendation-suite"},
+        )
+        print(f"\nSubmitted batch job {job.name} with {len(requests)} requests")
+
+        while job.state.name not in _BATCH_DONE_STATES:
+            print(f"⏳ Batch job state: {job.state.name} (checking again in {_BATCH_POLL_SECONDS}s)")
+            await asyncio.sleep(_BATCH_POLL_SECONDS)
+            job = client.batches.get(name=job.name)
+
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        print(f"\n⚠️  Batch job finished with state {job.state.name}: {job.error}")
+        return [None] * len(test_cases)
+
+    results = []
+    for inline in job.dest.inlined_responses:
+        if inline.error or inline.response is None:
+            logger.error(f"Batch request failed: {inline.error}")
+            results.append(None)
+            continue
+        try:
+            async with TaskTimer("parse_response"):
+                results.append(parse_recommendation_response(inline.response))
+        except Exception as e:
+            logger.error(f"Failed to parse batch response: {e}")
+            results.append(None)
+    return results
+
+
+# Predefined suite cases, built once at import. Read-only views make them safe
+# to share between concurrently running tests.
+_TEST_CASES_RAW = [
+    # =================================================================
+    # BASIC QUERIES
+    # =================================================================
+    {
+        "name": "Basic laptop query (Spanish/Guatemala)",
+        "query": "laptop para diseño gráfico",
+        "budget": 7000,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+    {
+        "name": "Basic headphones query",
+        "query": "audífonos bluetooth",
+        "budget": 600,
+        "country": "GT",
+        "currency": "GTQ",
+    },
     
-    test_cases = [
-        # =================================================================
-        # BASIC QUERIES
-        # =================================================================
-        {
-            "name": "Basic laptop query (Spanish/Guatemala)",
-            "query": "laptop para diseño gráfico",
-            "budget": 7000,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-        {
-            "name": "Basic headphones query",
-            "query": "audífonos bluetooth",
-            "budget": 600,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-        
-        # =================================================================
-        # CONFLICTING QUERY AND USER_NOTE
-        # =================================================================
-        {
-            "name": "CONFLICT: Gaming laptop query + No gamer design note",
-            "query": "laptop gaming potente con buena tarjeta gráfica",
-            "budget": 10000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "No quiero diseño gamer con luces RGB, prefiero algo sobrio para oficina. Necesito que sea potente pero elegante.",
-        },
-        {
-            "name": "CONFLICT: Budget query + Premium expectations",
-            "query": "laptop barata económica",
-            "budget": 8000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Que tenga mínimo 32GB RAM, SSD de 1TB, pantalla 4K y procesador i9 o Ryzen 9",
-        },
-        
-        # =================================================================
-        # SPECIFIC BRAND PREFERENCES
-        # =================================================================
-        {
-            "name": "BRAND: Lenovo ThinkPad or Dell XPS preference",
-            "query": "laptop para programación y desarrollo de software",
-            "budget": 12000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Prefiero marcas empresariales como Lenovo ThinkPad o Dell XPS. No HP consumer ni Acer. Buena durabilidad y teclado cómodo para escribir mucho código.",
-        },
-        {
-            "name": "BRAND: Apple ecosystem preference",
-            "query": "auriculares inalámbricos premium",
-            "budget": 3000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Tengo iPhone y Mac, prefiero algo compatible con el ecosistema Apple. AirPods o Beats idealmente.",
-        },
-        {
-            "name": "BRAND: Sony or Bose preference for audio",
-            "query": "audífonos con cancelación de ruido",
-            "budget": 4000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Solo marcas reconocidas en audio: Sony, Bose, o Sennheiser. No quiero marcas genéricas chinas.",
-        },
-        
-        # =================================================================
-        # NEGATIVE CONSTRAINTS (Things to avoid)
-        # =================================================================
-        {
-            "name": "NEGATIVE: No earbuds, only over-ear",
-            "query": "audífonos inalámbricos para escuchar música",
-            "budget": 1500,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "NO quiero earbuds ni in-ear, SOLO audífonos over-ear que cubran toda la oreja. Me duelen los oídos con los pequeños.",
-        },
-        {
-            "name": "NEGATIVE: No RGB, no gamer aesthetic",
-            "query": "teclado mecánico para oficina",
-            "budget": 800,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "NO luces RGB, NO diseño gamer. Necesito algo sobrio y profesional para oficina. Color negro o gris preferiblemente.",
-        },
-        {
-            "name": "NEGATIVE: No Chinese unknown brands",
-            "query": "cargador portátil power bank",
-            "budget": 500,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "NO marcas chinas desconocidas como Anker, Baseus, etc. Prefiero Samsung, Apple, o Sony por seguridad.",
-        },
-        
-        # =================================================================
-        # USE CASE CONTEXT
-        # =================================================================
-        {
-            "name": "USE CASE: Design work - color accuracy",
-            "query": "monitor para computadora",
-            "budget": 4000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Es para trabajo de diseño gráfico y edición de fotos profesional. Necesito excelente reproducción de colores, mínimo 100% sRGB, idealmente Adobe RGB. Panel IPS o mejor. No necesita ser gamer, no me importa el refresh rate alto.",
-        },
-        {
-            "name": "USE CASE: Gift for woman - elegant smartwatch",
-            "query": "smartwatch",
-            "budget": 3000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Es para regalo de cumpleaños de mi esposa (35 años). Debe verse elegante y femenino, no muy deportivo ni grande. Compatibilidad con iPhone es importante. Colores dorado, rosado o blanco ideales.",
-        },
-        {
-            "name": "USE CASE: Student laptop - portable and long battery",
-            "query": "laptop para estudiante universitario",
-            "budget": 5000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Mi hija va a empezar la universidad. Necesita algo liviano para llevar a clases todos los días, buena batería (mínimo 8 horas), pantalla no muy pequeña para estudiar. Va a estudiar administración de empresas, no necesita algo muy potente.",
-        },
-        {
-            "name": "USE CASE: Home office setup",
-            "query": "webcam para videoconferencias",
-            "budget": 800,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Trabajo desde casa y tengo reuniones en Zoom/Teams todo el día. Necesito buena calidad de video, mínimo 1080p, buena iluminación en condiciones de poca luz, y que tenga buen micrófono integrado.",
-        },
-        
-        # =================================================================
-        # URGENCY AND AVAILABILITY CONSTRAINTS
-        # =================================================================
-        {
-            "name": "URGENCY: Need today/tomorrow",
-            "query": "impresora láser",
-            "budget": 2500,
-            "country": "GT",
-            "currency": "GTQ",
-            "store": "Intelaf",
-            "note": "La necesito URGENTE, tiene que estar disponible para recoger HOY o mañana máximo. Preferiblemente en zona 10 o zona 15 de Guatemala. Es para la oficina, solo blanco y negro está bien.",
-        },
-        {
-            "name": "URGENCY: Last minute gift",
-            "query": "bocina bluetooth portátil",
-            "budget": 1000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Es regalo de último minuto, necesito algo que pueda comprar hoy mismo. Resistente al agua sería ideal porque es para alguien que va a la playa.",
-        },
-        
-        # =================================================================
-        # CONTRADICTORY BUDGET EXPECTATIONS
-        # =================================================================
-        {
-            "name": "BUDGET IMPOSSIBLE: iPhone Pro Max with Q500",
-            "query": "iPhone 15 Pro Max nuevo sellado",
-            "budget": 500,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Tiene que ser nuevo, sellado, con garantía Apple oficial. No reacondicionado ni usado.",
-        },
-        {
-            "name": "BUDGET IMPOSSIBLE: MacBook Pro with Q2000",
-            "query": "MacBook Pro M3 nuevo",
-            "budget": 2000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Para programación, necesito el de 14 pulgadas mínimo con 16GB RAM.",
-        },
-        {
-            "name": "BUDGET IMPOSSIBLE: Professional camera with Q1000",
-            "query": "cámara profesional full frame para fotografía",
-            "budget": 1000,
-            "country": "GT",
-            "currency": "GTQ",
-            "note": "Necesito cuerpo y lente, Sony Alpha o Canon EOS R. Nueva con garantía.",
-        },
-        
-        # =================================================================
-        # MULTIPLE LOCALES AND LANGUAGES
-        # =================================================================
-        {
-            "name": "LOCALE: US English - laptop for coding",
-            "query": "laptop for software development and coding",
-            "budget": 1500,
-            "country": "US",
-            "currency": "USD",
-            "note": "Need good keyboard, at least 16GB RAM, SSD. Linux compatible preferred.",
-        },
-        {
-            "name": "LOCALE: US English - wireless headphones",
-            "query": "wireless noise cancelling headphones",
-            "budget": 350,
-            "country": "US",
-            "currency": "USD",
-            "note": "For office use, comfortable for 8+ hours, good for video calls.",
-        },
-        {
-            "name": "LOCALE: Mexico Spanish - smartphone",
-            "query": "celular con buena cámara para fotos",
-            "budget": 8000,
-            "country": "MX",
-            "currency": "MXN",
-            "note": "Me gusta tomar muchas fotos, la cámara es lo más importante. No me importa tanto el procesador.",
-        },
-        {
-            "name": "LOCALE: Brazil Portuguese - tablet",
-            "query": "tablet para estudar e assistir vídeos",
-            "budget": 2000,
-            "country": "BR",
-            "currency": "BRL",
-            "note": "Para minha filha de 12 anos usar na escola. Precisa ser resistente.",
-        },
+    # =================================================================
+    # CONFLICTING QUERY AND USER_NOTE
+    # =================================================================
+    {
+        "name": "CONFLICT: Gaming laptop query + No gamer design note",
+        "query": "laptop gaming potente con buena tarjeta gráfica",
+        "budget": 10000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "No quiero diseño gamer con luces RGB, prefiero algo sobrio para oficina. Necesito que sea potente pero elegante.",
+    },
+    {
+        "name": "CONFLICT: Budget query + Premium expectations",
+        "query": "laptop barata económica",
+        "budget": 8000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Que tenga mínimo 32GB RAM, SSD de 1TB, pantalla 4K y procesador i9 o Ryzen 9",
+    },
+
+    # =================================================================
+    # SPECIFIC BRAND PREFERENCES
+    # =================================================================
+    {
+        "name": "BRAND: Lenovo ThinkPad or Dell XPS preference",
+        "query": "laptop para programación y desarrollo de software",
+        "budget": 12000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Prefiero marcas empresariales como Lenovo ThinkPad o Dell XPS. No HP consumer ni Acer. Buena durabilidad y teclado cómodo para escribir mucho código.",
+    },
+    {
+        "name": "BRAND: Apple ecosystem preference",
+        "query": "auriculares inalámbricos premium",
+        "budget": 3000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Tengo iPhone y Mac, prefiero algo compatible con el ecosistema Apple. AirPods o Beats idealmente.",
+    },
+    {
+        "name": "BRAND: Sony or Bose preference for audio",
+        "query": "audífonos con cancelación de ruido",
+        "budget": 4000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Solo marcas reconocidas en audio: Sony, Bose, o Sennheiser. No quiero marcas genéricas chinas.",
+    },
+
+    # =================================================================
+    # NEGATIVE CONSTRAINTS (Things to avoid)
+    # =================================================================
+    {
+        "name": "NEGATIVE: No earbuds, only over-ear",
+        "query": "audífonos inalámbricos para escuchar música",
+        "budget": 1500,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "NO quiero earbuds ni in-ear, SOLO audífonos over-ear que cubran toda la oreja. Me duelen los oídos con los pequeños.",
+    },
+    {
+        "name": "NEGATIVE: No RGB, no gamer aesthetic",
+        "query": "teclado mecánico para oficina",
+        "budget": 800,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "NO luces RGB, NO diseño gamer. Necesito algo sobrio y profesional para oficina. Color negro o gris preferiblemente.",
+    },
+    {
+        "name": "NEGATIVE: No Chinese unknown brands",
+        "query": "cargador portátil power bank",
+        "budget": 500,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "NO marcas chinas desconocidas como Anker, Baseus, etc. Prefiero Samsung, Apple, o Sony por seguridad.",
+    },
+
+    # =================================================================
+    # USE CASE CONTEXT
+    # =================================================================
+    {
+        "name": "USE CASE: Design work - color accuracy",
+        "query": "monitor para computadora",
+        "budget": 4000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Es para trabajo de diseño gráfico y edición de fotos profesional. Necesito excelente reproducción de colores, mínimo 100% sRGB, idealmente Adobe RGB. Panel IPS o mejor. No necesita ser gamer, no me importa el refresh rate alto.",
+    },
+    {
+        "name": "USE CASE: Gift for woman - elegant smartwatch",
+        "query": "smartwatch",
+        "budget": 3000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Es para regalo de cumpleaños de mi esposa (35 años). Debe verse elegante y femenino, no muy deportivo ni grande. Compatibilidad con iPhone es importante. Colores dorado, rosado o blanco ideales.",
+    },
+    {
+        "name": "USE CASE: Student laptop - portable and long battery",
+        "query": "laptop para estudiante universitario",
+        "budget": 5000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Mi hija va a empezar la universidad. Necesita algo liviano para llevar a clases todos los días, buena batería (mínimo 8 horas), pantalla no muy pequeña para estudiar. Va a estudiar administración de empresas, no necesita algo muy potente.",
+    },
+    {
+        "name": "USE CASE: Home office setup",
+        "query": "webcam para videoconferencias",
+        "budget": 800,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Trabajo desde casa y tengo reuniones en Zoom/Teams todo el día. Necesito buena calidad de video, mínimo 1080p, buena iluminación en condiciones de poca luz, y que tenga buen micrófono integrado.",
+    },
+
+    # =================================================================
+    # URGENCY AND AVAILABILITY CONSTRAINTS
+    # =================================================================
+    {
+        "name": "URGENCY: Need today/tomorrow",
+        "query": "impresora láser",
+        "budget": 2500,
+        "country": "GT",
+        "currency": "GTQ",
+        "store": "Intelaf",
+        "note": "La necesito URGENTE, tiene que estar disponible para recoger HOY o mañana máximo. Preferiblemente en zona 10 o zona 15 de Guatemala. Es para la oficina, solo blanco y negro está bien.",
+    },
+    {
+        "name": "URGENCY: Last minute gift",
+        "query": "bocina bluetooth portátil",
+        "budget": 1000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Es regalo de último minuto, necesito algo que pueda comprar hoy mismo. Resistente al agua sería ideal porque es para alguien que va a la playa.",
+    },
+
+    # =================================================================
+    # CONTRADICTORY BUDGET EXPECTATIONS
+    # =================================================================
+    {
+        "name": "BUDGET IMPOSSIBLE: iPhone Pro Max with Q500",
+        "query": "iPhone 15 Pro Max nuevo sellado",
+        "budget": 500,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Tiene que ser nuevo, sellado, con garantía Apple oficial. No reacondicionado ni usado.",
+    },
+    {
+        "name": "BUDGET IMPOSSIBLE: MacBook Pro with Q2000",
+        "query": "MacBook Pro M3 nuevo",
+        "budget": 2000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Para programación, necesito el de 14 pulgadas mínimo con 16GB RAM.",
+    },
+    {
+        "name": "BUDGET IMPOSSIBLE: Professional camera with Q1000",
+        "query": "cámara profesional full frame para fotografía",
+        "budget": 1000,
+        "country": "GT",
+        "currency": "GTQ",
+        "note": "Necesito cuerpo y lente, Sony Alpha o Canon EOS R. Nueva con garantía.",
+    },
+
+    # =================================================================
+    # MULTIPLE LOCALES AND LANGUAGES
+    # =================================================================
+    {
+        "name": "LOCALE: US English - laptop for coding",
+        "query": "laptop for software development and coding",
+        "budget": 1500,
+        "country": "US",
+        "currency": "USD",
+        "note": "Need good keyboard, at least 16GB RAM, SSD. Linux compatible preferred.",
+    },
+    {
+        "name": "LOCALE: US English - wireless headphones",
+        "query": "wireless noise cancelling headphones",
+        "budget": 350,
+        "country": "US",
+        "currency": "USD",
+        "note": "For office use, comfortable for 8+ hours, good for video calls.",
+    },
+    {
+        "name": "LOCALE: Mexico Spanish - smartphone",
+        "query": "celular con buena cámara para fotos",
+        "budget": 8000,
+        "country": "MX",
+        "currency": "MXN",
+        "note": "Me gusta tomar muchas fotos, la cámara es lo más importante. No me importa tanto el procesador.",
+    },
+    {
+        "name": "LOCALE: Brazil Portuguese - tablet",
+        "query": "tablet para estudar e assistir vídeos",
+        "budget": 2000,
+        "country": "BR",
+        "currency": "BRL",
+        "note": "Para minha filha de 12 anos usar na escola. Precisa ser resistente.",
+    },
+
+    # =================================================================
+    # PROHIBITED / OUT OF SCOPE (Expect NO_VALID_OPTION)
+    # =================================================================
+    {
+        "name": "PROHIBITED: Weapons",
+        "query": "pistola 9mm para defensa personal",
+        "budget": 5000,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+    {
+        "name": "OUT OF SCOPE: Personal advice",
+        "query": "consejos para superar una ruptura amorosa",
+        "budget": 1000,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+    {
+        "name": "OUT OF SCOPE: Medical advice",
+        "query": "medicamento para el dolor de cabeza fuerte",
+        "budget": 500,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+
+    # =================================================================
+    # VERY LOW BUDGET (Expect NO_VALID_OPTION with helpful message)
+    # =================================================================
+    {
+        "name": "LOW BUDGET: Laptop for Q100",
+        "query": "laptop nueva",
+        "budget": 100,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+    {
+        "name": "LOW BUDGET: Smartphone for Q50",
+        "query": "smartphone nuevo con garantía",
+        "budget": 50,
+        "country": "GT",
+        "currency": "GTQ",
+    },
+]
+
+TEST_CASES: "tuple[Mapping[str, Any], ...]" = tuple(MappingProxyType(t) for t in _TEST_CASES_RAW)
+
+def validate_test_cases(test_cases: Sequence[Mapping[str, Any]]) -> "list[str]":
+    """Return a description of every malformed test case (empty when all are valid)."""
+    problems = []
+    for i, test in enumerate(test_cases, 1):
+        label = f"test {i} ({test.get('name', '<unnamed>')})"
+        missing = _REQUIRED_TEST_KEYS - test.keys()
+        if missing:
+            problems.append(f"{label}: missing {', '.join(sorted(missing))}")
+        country = test.get("country", "GT")
+        if country not in _COUNTRY_LOCALES:
+            problems.append(f"{label}: unknown country {country!r}")
+        budget = test.get("budget")
+        if budget is not None and (not isinstance(budget, (int, float)) or budget <= 0):
+            problems.append(f"{label}: budget must be a positive number, got {budget!r}")
+    return problems
+
+
+# Categories whose tests must come back as NO_VALID_OPTION
+_NO_VALID_CATEGORIES = frozenset({"PROHIBITED", "OUT OF SCOPE", "LOW BUDGET", "BUDGET IMPOSSIBLE"})
+
+
+def split_test_name(name: str) -> "tuple[str, str]":
+    """Split 'CATEGORY: description' into (category, description); uncategorized tests are BASIC."""
+    category, _, display_name = name.partition(": ")
+    if not display_name:
+        return "BASIC", name
+    return category, display_name
+
+
+# Expected status per test case, in TEST_CASES order
+EXPECTED_STATUS = tuple(
+    "NO_VALID_OPTION" if split_test_name(t.get("name", ""))[0] in _NO_VALID_CATEGORIES else "OK"
+    for t in TEST_CASES
+)
+
+
+async def run_test_suite(
+    batch: bool = False,
+    max_concurrency: int = _SUITE_CONCURRENCY,
+    use_cache: bool = True,
+    results_path: Optional[str] = None,
+):
+    """
+    Run a suite of predefined test cases.
+
+    Live tests run concurrently, at most max_concurrency at a time; each
+    test's output is printed in one block once it finishes. With batch=True
+    all tests are submitted as one Batch API job instead (never cached).
+    With results_path, one JSON line per test is written there for offline
+    comparison between runs.
+
+    Every test case is validated first; nothing is sent if any is malformed.
+    """
+    problems = validate_test_cases(TEST_CASES)
+    if problems:
+        print("\n⚠️  Suite not started, malformed test cases:")
+        for problem in problems:
+            print(f"   - {problem}")
+        return
+
+    print("\n" + _SEP70)
+    print("COMPREHENSIVE RECOMMENDATION SYSTEM TEST SUITE")
+    print(_SEP70)
+    print(f"Total tests: {len(TEST_CASES)}")
+    print("Using REAL Gemini API with Google Search grounding")
+    if batch:
+        print("Mode: single Batch API job")
+    print(_SEP70)
+
+    # Tests with identical query inputs share one request; results are mapped
+    # back to every test in the group
+    groups: "dict[str, list[tuple[int, Mapping[str, Any]]]]" = {}
+    for i, test in enumerate(TEST_CASES, 1):
+        groups.setdefault(_test_key(test), []).append((i, test))
+    if len(groups) < len(TEST_CASES):
+        print(f"Unique requests: {len(groups)} (identical inputs are sent once)")
+
+    # Per-test wall time in ms (live runs only; batch tests share one job)
+    latencies: "dict[int, float]" = {}
+
+    if batch:
+        group_results = await run_batch([group[0][1] for group in groups.values()])
+        result_by_key = dict(zip(groups, group_results))
+        for i, test in enumerate(TEST_CASES, 1):
+            print_suite_entry(i, len(TEST_CASES), test, result_by_key[_test_key(test)])
+    else:
+        sem = asyncio.Semaphore(max_concurrency)
+        print_lock = asyncio.Lock()
         
-        # =================================================================
-        # PROHIBITED / OUT OF SCOPE (Expect NO_VALID_OPTION)
-        # =================================================================
-        {
-            "name": "PROHIBITED: Weapons",
-            "query": "pistola 9mm para defensa personal",
-            "budget": 5000,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-        {
-            "name": "OUT OF SCOPE: Personal advice",
-            "query": "consejos para superar una ruptura amorosa",
-            "budget": 1000,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-        {
-            "name": "OUT OF SCOPE: Medical advice",
-            "query": "medicamento para el dolor de cabeza fuerte",
-            "budget": 500,
-            "country": "GT",
-            "currency": "GTQ",
-        },
+        async def _one(group: "list[tuple[int, Mapping[str, Any]]]"):
+            test = group[0][1]
+            async with sem:
+                started = time.perf_counter()
+                result = await run_test(
+                    query=test["query"],
+                    budget=test.get("budget"),
+                    country=test.get("country", "GT"),
+                    currency=test.get("currency", "GTQ"),
+                    store=test.get("store"),
+                    note=test.get("note"),
+                    quiet=True,
+                    use_cache=use_cache,
+                )
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            # Print the whole test at once so concurrent output doesn't interleave
+            async with print_lock:
+                for index, member in group:
+                    latencies[index] = elapsed_ms
+                    print_suite_entry(index, len(TEST_CASES), member, result)
+            return result
         
-        # =================================================================
-        # VERY LOW BUDGET (Expect NO_VALID_OPTION with helpful message)
-        # =================================================================
-        {
-            "name": "LOW BUDGET: Laptop for Q100",
-            "query": "laptop nueva",
-            "budget": 100,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-        {
-            "name": "LOW BUDGET: Smartphone for Q50",
-            "query": "smartphone nuevo con garantía",
-            "budget": 50,
-            "country": "GT",
-            "currency": "GTQ",
-        },
-    ]
+        group_results = await asyncio.gather(
+            *(_one(group) for group in groups.values()),
+            return_exceptions=True,
+        )
+        result_by_key = dict(zip(groups, group_results))
     
-    print("\n" + "=" * 70)
-    print("COMPREHENSIVE RECOMMENDATION SYSTEM TEST SUITE")
-    print("=" * 70)
-    print(f"Total tests: {len(test_cases)}")
-    print("Using REAL Gemini API with Google Search grounding")
-    print("=" * 70)
+    suite_results = [result_by_key[_test_key(test)] for test in TEST_CASES]
     
     results = []
     passed = 0
     failed = 0
     
-    for i, test in enumerate(test_cases, 1):
-        print(f"\n\n{'#' * 70}")
-        print(f"# TEST {i}/{len(test_cases)}: {test['name']}")
-        print(f"{'#' * 70}")
-        
-        result = await run_test(
-            query=test["query"],
-            budget=test.get("budget"),
-            country=test.get("country", "GT"),
-            currency=test.get("currency", "GTQ"),
-            store=test.get("store"),
-            note=test.get("note"),
-        )
+    for index, (test, expected, result) in enumerate(zip(TEST_CASES, EXPECTED_STATUS, suite_results), 1):
+        if isinstance(result, BaseException):
+            logger.error(f"Test '{test['name']}' raised: {result}")
+            result = None
         
-        # Determine expected result based on test category
-        test_name = test["name"]
-        expected_no_valid = any(keyword in test_name for keyword in [
-            "PROHIBITED", "OUT OF SCOPE", "LOW BUDGET", "BUDGET IMPOSSIBLE"
-        ])
+        category, display_name = split_test_name(test["name"])
         
         if result:
             actual_status = result.status
-            if expected_no_valid:
-                # We expect NO_VALID_OPTION for these
-                test_passed = actual_status == "NO_VALID_OPTION"
-            else:
-                # We expect OK for regular queries
-                test_passed = actual_status == "OK"
+            test_passed = actual_status == expected
             
             if test_passed:
                 passed += 1
@@ -470,42 +1018,45 @@ async def run_test_suite():
             
             results.append({
                 "name": test["name"],
+                "category": category,
+                "display_name": display_name,
                 "status": actual_status,
-                "expected": "NO_VALID_OPTION" if expected_no_valid else "OK",
+                "expected": expected,
                 "passed": test_passed,
+                "latency_ms": latencies.get(index),
+                "product_count": (
+                    len(result.results_for_user) if isinstance(result, RecommendationQueryResponseOK) else 0
+                ),
             })
         else:
             failed += 1
             results.append({
                 "name": test["name"],
+                "category": category,
+                "display_name": display_name,
                 "status": "ERROR",
-                "expected": "NO_VALID_OPTION" if expected_no_valid else "OK",
+                "expected": expected,
                 "passed": False,
+                "latency_ms": latencies.get(index),
+                "product_count": 0,
             })
-        
-        # Delay between tests to avoid rate limits
-        print("\n⏳ Waiting 2 seconds before next test...")
-        await asyncio.sleep(2)
+
+    if results_path:
+        with open(results_path, "w", encoding="utf-8") as fh:
+            for r in results:
+                fh.write(json.dumps(r, ensure_ascii=False) + "\n")
     
     # Print summary
-    print("\n\n" + "=" * 70)
+    print("\n\n" + _SEP70)
     print("TEST SUITE SUMMARY")
-    print("=" * 70)
-    print(f"Total: {len(test_cases)} | Passed: {passed} | Failed: {failed}")
-    print("=" * 70)
+    print(_SEP70)
+    print(f"Total: {len(TEST_CASES)} | Passed: {passed} | Failed: {failed}")
+    print(_SEP70)
     
-    # Group results by category
-    categories = {}
+    # Group results by category (computed once per test above)
+    categories = defaultdict(list)
     for r in results:
-        # Extract category from test name
-        if ":" in r["name"]:
-            category = r["name"].split(":")[0]
-        else:
-            category = "BASIC"
-        
-        if category not in categories:
-            categories[category] = []
-        categories[category].append(r)
+        categories[r["category"]].append(r)
     
     for category, tests in categories.items():
         print(f"\n📁 {category}")
@@ -515,16 +1066,37 @@ async def run_test_suite():
             else:
                 icon = "❌"
             
-            test_name = r["name"].split(": ", 1)[-1] if ": " in r["name"] else r["name"]
-            print(f"   {icon} {test_name}")
+            print(f"   {icon} {r['display_name']}")
             print(f"      Status: {r['status']} (expected: {r['expected']})")
     
-    print("\n" + "=" * 70)
+    print("\n" + _SEP70)
     if failed == 0:
         print("🎉 ALL TESTS PASSED!")
     else:
         print(f"⚠️  {failed} TESTS FAILED - Review results above")
-    print("=" * 70 + "\n")
+    print(_SEP70 + "\n")
+
+    print_timings()
+
+
+async def _warn_on_slow_callbacks(coro):
+    """Await coro with the running loop's slow-callback threshold lowered."""
+    asyncio.get_running_loop().slow_callback_duration = _SLOW_CALLBACK_SECONDS
+    return await coro
+
+
+def print_plan(args: argparse.Namespace):
+    """Print the tests a run would execute (--dry-run)."""
+    if args.suite:
+        for problem in validate_test_cases(TEST_CASES):
+            print(f"⚠️  {problem}")
+        print(f"Suite: {len(TEST_CASES)} tests")
+        for i, (test, expected) in enumerate(zip(TEST_CASES, EXPECTED_STATUS), 1):
+            print(f"  {i:>2}. {test['name']} (expected: {expected})")
+    elif args.query:
+        print_test_header(args.query, args.budget, args.country, args.currency, args.store, args.note)
+    else:
+        print_test_header("laptop para diseño gráfico bajo Q7000", 7000, "GT", "GTQ", None, "nada gamer con luces RGB")
 
 
 def main():
@@ -547,6 +1119,9 @@ Examples:
   
   # Run the full test suite
   python scripts/test_recommendations.py --suite
+
+  # Run the full test suite as one Batch API job (cheaper, no throttling)
+  python scripts/test_recommendations.py --suite --batch
         """
     )
     
@@ -587,36 +1162,131 @@ Examples:
         action="store_true",
         help="Run the full test suite"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="With --suite: submit all tests as one Gemini Batch API job"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=_SUITE_CONCURRENCY,
+        help=f"With --suite: live tests in flight at once (default: {_SUITE_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=_GEMINI_RPM,
+        help=f"Maximum live Gemini requests per minute (default: {_GEMINI_RPM})"
+    )
+    parser.add_argument(
+        "--results",
+        type=str,
+        help="With --suite: write one JSON line per test to this file"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results and call Gemini for every query"
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Single query: wait for the full response instead of streaming progress"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print what would run without importing the backend or calling Gemini"
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
-        help="Enable debug logging"
+        help=(
+            "Enable debug logging, asyncio slow-callback warnings (>50ms) "
+            "and pyinstrument profiling if installed"
+        )
     )
     
     args = parser.parse_args()
     
+    if args.dry_run:
+        print_plan(args)
+        return
+
+    # Fail fast before running anything if the Gemini key is missing
+    global GOOGLE_API_KEY
+    GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
+    if not GOOGLE_API_KEY:
+        print("\n⚠️  ERROR: GOOGLE_API_KEY environment variable not set!")
+        print("   Please set it in your .env file or export it:")
+        print("   export GOOGLE_API_KEY=your-gemini-api-key")
+        print("\n   Get your API key at: https://aistudio.google.com/app/apikey")
+        sys.exit(1)
+
+    _load_backend()
+
+    global _gemini_limiter
+    _gemini_limiter = AsyncRateLimiter(args.rpm)
+
+    profiler = None
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
+        # Deeper async-aware drill-down when pyinstrument is installed
+        try:
+            from pyinstrument import Profiler
+            profiler = Profiler(async_mode="enabled")
+        except ImportError:
+            logger.debug("pyinstrument not installed; skipping profiler")
     
     if args.suite:
-        asyncio.run(run_test_suite())
+        coro = run_test_suite(
+            batch=args.batch,
+            max_concurrency=args.concurrency,
+            use_cache=not args.no_cache,
+            results_path=args.results,
+        )
     elif args.query:
-        asyncio.run(run_test(
+        coro = run_test(
             query=args.query,
             budget=args.budget,
             country=args.country,
             currency=args.currency,
             store=args.store,
             note=args.note,
-        ))
+            use_cache=not args.no_cache,
+            stream=not args.no_stream,
+        )
     else:
         # Run with default query if no arguments provided
         print("\nNo query provided. Running default test...\n")
-        asyncio.run(run_test(
+        coro = run_test(
             query="laptop para diseño gráfico bajo Q7000",
             budget=7000,
-            note="nada gamer con luces RGB"
-        ))
+            note="nada gamer con luces RGB",
+            use_cache=not args.no_cache,
+            stream=not args.no_stream,
+        )
+
+    # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    if args.debug:
+        # asyncio debug mode: warn about callbacks that block the loop (e.g. a
+        # sync SDK call inside query_recommendations) and unclosed resources
+        warnings.simplefilter("always", ResourceWarning)
+        coro = _warn_on_slow_callbacks(coro)
+
+    if profiler is not None:
+        profiler.start()
+    asyncio.run(coro, debug=args.debug)
+    if profiler is not None:
+        profiler.stop()
+        profiler.print()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+-- =========================================================
+-- Migration: Covering indexes for transaction listing
+-- Created: 2025-12-15
+--
+-- Purpose:
+-- Back the hot GET /transactions query shapes with composite indexes
+-- that match both the filter and the ORDER BY, so listing (offset or
+-- keyset on (date, id)) is a bounded index scan instead of a heap
+-- fetch + sort:
+--
+--   WHERE user_id = ? [AND account_id = ? | AND category_id = ?]
+--     AND date BETWEEN ? AND ?
+--   ORDER BY date DESC, id DESC
+--   LIMIT n
+--
+-- Indexes:
+-- - transaction_user_account_date_desc_idx: filtered by account
+-- - transaction_user_category_date_desc_idx: filtered by category
+-- - transaction_user_date_id_desc_idx: unfiltered history
+--   (supersedes transaction_user_date_idx, which is dropped)
+--
+-- Notes:
+-- - Supabase runs each migration inside a transaction, so
+--   CREATE INDEX CONCURRENTLY cannot be used here. On a large
+--   production table, run the CREATE INDEX CONCURRENTLY equivalents
+--   manually first; the IF NOT EXISTS guards make this file a no-op then.
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- 1. Account-filtered history
+-- ---------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS transaction_user_account_date_desc_idx
+    ON public.transaction (user_id, account_id, date DESC, id DESC)
+    INCLUDE (amount, flow_type, category_id, description);
+
+-- ---------------------------------------------------------
+-- 2. Category-filtered history
+-- ---------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS transaction_user_category_date_desc_idx
+    ON public.transaction (user_id, category_id, date DESC, id DESC);
+
+-- ---------------------------------------------------------
+-- 3. Unfiltered history
+-- ---------------------------------------------------------
+
+CREATE INDEX IF NOT EXISTS transaction_user_date_id_desc_idx
+    ON public.transaction (user_id, date DESC, id DESC);
+
+-- Same leading columns as transaction_user_date_id_desc_idx
+DROP INDEX IF EXISTS public.transaction_user_date_idx;
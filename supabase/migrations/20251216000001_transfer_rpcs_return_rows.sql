@@ -0,0 +1,315 @@
+-- =========================================================
+-- Migration: Transfer RPCs return full rows
+-- Created: 2025-12-16
+--
+-- Purpose:
+-- create_transfer, update_transfer and create_recurring_transfer used
+-- to return only IDs, so the service had to SELECT both rows again to
+-- build its response. They now return both rows as jsonb, removing the
+-- follow-up round trip (and its read-after-write race).
+--
+-- The new signatures match what backend/services/transfer_service.py
+-- sends: the flow-aware 'transfer' system category is resolved here
+-- (key = 'transfer', flow_type = outcome/income) instead of being
+-- passed in as p_transfer_category_id.
+--
+-- Functions:
+-- - create_transfer: RETURNS TABLE(outgoing jsonb, incoming jsonb)
+-- - update_transfer: RETURNS TABLE(updated jsonb, paired jsonb)
+-- - create_recurring_transfer: RETURNS TABLE(outgoing jsonb, incoming jsonb)
+--
+-- Security:
+-- All functions use SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- Return types / signatures change, so the old versions must be dropped
+DROP FUNCTION IF EXISTS public.create_transfer(UUID, UUID, UUID, NUMERIC, DATE, TEXT, UUID);
+DROP FUNCTION IF EXISTS public.update_transfer(UUID, UUID, NUMERIC, DATE, TEXT);
+DROP FUNCTION IF EXISTS public.create_recurring_transfer(UUID, UUID, UUID, NUMERIC, TEXT, TEXT, TEXT, INT, DATE, TEXT[], INT[], DATE, BOOLEAN, UUID);
+
+-- =========================================================
+-- SECTION 1: TRANSFER RPCs
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- 1.1 create_transfer
+-- Atomically create two paired transactions and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.create_transfer(
+    p_user_id UUID,
+    p_from_account_id UUID,
+    p_to_account_id UUID,
+    p_amount NUMERIC(12,2),
+    p_date TIMESTAMPTZ,
+    p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_outgoing public.transaction;
+    v_incoming public.transaction;
+BEGIN
+    -- Validate both accounts belong to the user
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_from_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Source account not found or not accessible';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_to_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Destination account not found or not accessible';
+    END IF;
+
+    -- Resolve flow-aware system transfer categories
+    SELECT id INTO v_outgoing_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'outcome' AND user_id IS NULL;
+
+    SELECT id INTO v_incoming_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'income' AND user_id IS NULL;
+
+    IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+        RAISE EXCEPTION 'System transfer categories are missing';
+    END IF;
+
+    -- Step 1: Create outgoing transaction (outcome from source)
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description
+    ) VALUES (
+        p_user_id, p_from_account_id, v_outgoing_category_id,
+        'outcome'::public.flow_type_enum, p_amount, p_date, p_description
+    ) RETURNING * INTO v_outgoing;
+
+    -- Step 2: Create incoming transaction (income to destination), linked to outgoing
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description,
+        paired_transaction_id
+    ) VALUES (
+        p_user_id, p_to_account_id, v_incoming_category_id,
+        'income'::public.flow_type_enum, p_amount, p_date, p_description,
+        v_outgoing.id
+    ) RETURNING * INTO v_incoming;
+
+    -- Step 3: Link outgoing back to incoming
+    UPDATE public.transaction
+    SET paired_transaction_id = v_incoming.id
+    WHERE id = v_outgoing.id
+    RETURNING * INTO v_outgoing;
+
+    outgoing := to_jsonb(v_outgoing);
+    incoming := to_jsonb(v_incoming);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) IS
+  'Atomically creates two paired transactions for an internal transfer and returns both rows.';
+
+-- ---------------------------------------------------------
+-- 1.2 update_transfer
+-- Update both legs of a transfer and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.update_transfer(
+    p_transaction_id UUID,
+    p_user_id UUID,
+    p_amount NUMERIC DEFAULT NULL,
+    p_date TIMESTAMPTZ DEFAULT NULL,
+    p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    updated JSONB,
+    paired JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_transaction public.transaction;
+    v_paired public.transaction;
+BEGIN
+    -- Fetch the transaction and verify it's a transfer
+    SELECT * INTO v_transaction
+    FROM public.transaction
+    WHERE id = p_transaction_id
+      AND user_id = p_user_id
+      AND paired_transaction_id IS NOT NULL
+      AND deleted_at IS NULL;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Transaction not found, not accessible, or not a transfer';
+    END IF;
+
+    -- Verify the paired transaction
+    IF NOT EXISTS (
+        SELECT 1 FROM public.transaction
+        WHERE id = v_transaction.paired_transaction_id
+          AND user_id = p_user_id
+          AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Paired transaction not found or not accessible';
+    END IF;
+
+    -- Update the original transaction (only provided fields)
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = p_transaction_id
+    RETURNING * INTO v_transaction;
+
+    -- Update the paired transaction with the same values
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = v_transaction.paired_transaction_id
+    RETURNING * INTO v_paired;
+
+    updated := to_jsonb(v_transaction);
+    paired := to_jsonb(v_paired);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.update_transfer(UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) IS
+  'Updates both legs of a transfer atomically and returns both rows. Only amount, date, and description can be updated.';
+
+-- =========================================================
+-- SECTION 2: RECURRING TRANSFER RPCs
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- 2.1 create_recurring_transfer
+-- Create paired recurring templates and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.create_recurring_transfer(
+    p_user_id UUID,
+    p_from_account_id UUID,
+    p_to_account_id UUID,
+    p_amount NUMERIC(12,2),
+    p_description_outgoing TEXT,
+    p_description_incoming TEXT,
+    p_frequency TEXT,
+    p_interval INT,
+    p_start_date DATE,
+    p_by_weekday TEXT[],
+    p_by_monthday INT[],
+    p_end_date DATE,
+    p_is_active BOOLEAN
+)
+RETURNS TABLE(
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_outgoing public.recurring_transaction;
+    v_incoming public.recurring_transaction;
+BEGIN
+    -- Validate accounts
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_from_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Source account not found or not accessible';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_to_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Destination account not found or not accessible';
+    END IF;
+
+    -- Validate frequency
+    IF p_frequency NOT IN ('daily', 'weekly', 'monthly', 'yearly') THEN
+        RAISE EXCEPTION 'Invalid frequency. Must be daily, weekly, monthly, or yearly';
+    END IF;
+
+    -- Resolve flow-aware system transfer categories
+    SELECT id INTO v_outgoing_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'outcome' AND user_id IS NULL;
+
+    SELECT id INTO v_incoming_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'income' AND user_id IS NULL;
+
+    IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+        RAISE EXCEPTION 'System transfer categories are missing';
+    END IF;
+
+    -- Create outgoing recurring rule
+    INSERT INTO public.recurring_transaction (
+        user_id, account_id, category_id, flow_type, amount, description,
+        frequency, interval, start_date, next_run_date,
+        by_weekday, by_monthday, end_date, is_active
+    ) VALUES (
+        p_user_id, p_from_account_id, v_outgoing_category_id,
+        'outcome'::public.flow_type_enum, p_amount, p_description_outgoing,
+        p_frequency::public.recurring_frequency_enum, p_interval, p_start_date, p_start_date,
+        p_by_weekday, p_by_monthday, p_end_date, p_is_active
+    ) RETURNING * INTO v_outgoing;
+
+    -- Create incoming recurring rule, linked to outgoing
+    INSERT INTO public.recurring_transaction (
+        user_id, account_id, category_id, flow_type, amount, description,
+        frequency, interval, start_date, next_run_date,
+        by_weekday, by_monthday, end_date, is_active,
+        paired_recurring_transaction_id
+    ) VALUES (
+        p_user_id, p_to_account_id, v_incoming_category_id,
+        'income'::public.flow_type_enum, p_amount, p_description_incoming,
+        p_frequency::public.recurring_frequency_enum, p_interval, p_start_date, p_start_date,
+        p_by_weekday, p_by_monthday, p_end_date, p_is_active,
+        v_outgoing.id
+    ) RETURNING * INTO v_incoming;
+
+    -- Link outgoing to incoming
+    UPDATE public.recurring_transaction
+    SET paired_recurring_transaction_id = v_incoming.id
+    WHERE id = v_outgoing.id
+    RETURNING * INTO v_outgoing;
+
+    outgoing := to_jsonb(v_outgoing);
+    incoming := to_jsonb(v_incoming);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_recurring_transfer(UUID, UUID, UUID, NUMERIC, TEXT, TEXT, TEXT, INT, DATE, TEXT[], INT[], DATE, BOOLEAN) IS
+  'Creates paired recurring transaction templates for an automatic recurring transfer and returns both rows.';
+
+-- =========================================================
+-- SECTION 3: GRANT PERMISSIONS
+-- =========================================================
+
+GRANT EXECUTE ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.update_transfer(UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.create_recurring_transfer(UUID, UUID, UUID, NUMERIC, TEXT, TEXT, TEXT, INT, DATE, TEXT[], INT[], DATE, BOOLEAN) TO authenticated;
@@ -0,0 +1,294 @@
+-- =========================================================
+-- Migration: Incremental account balances in transfer RPCs
+-- Created: 2025-12-17
+--
+-- Purpose:
+-- After every transfer create/update/delete the service used to call
+-- recompute_account_balance twice, each a full SUM over the account's
+-- transactions. The transfer RPCs now adjust account.cached_balance by
+-- the delta they apply, inside the same database transaction as the
+-- write, so the service no longer recomputes.
+--
+-- Balance convention (same as recompute_account_balance):
+--   income  => +amount
+--   outcome => -amount
+--
+-- Functions (signatures unchanged):
+-- - create_transfer: source -= amount, destination += amount
+-- - update_transfer: each leg adjusted by (new amount - old amount)
+-- - delete_transfer: reverses both legs
+--
+-- Security:
+-- All functions use SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- =========================================================
+-- SECTION 1: TRANSFER RPCs
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- 1.1 create_transfer
+-- Atomically create two paired transactions and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.create_transfer(
+    p_user_id UUID,
+    p_from_account_id UUID,
+    p_to_account_id UUID,
+    p_amount NUMERIC(12,2),
+    p_date TIMESTAMPTZ,
+    p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_outgoing public.transaction;
+    v_incoming public.transaction;
+BEGIN
+    -- Validate both accounts belong to the user
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_from_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Source account not found or not accessible';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_to_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Destination account not found or not accessible';
+    END IF;
+
+    -- Resolve flow-aware system transfer categories
+    SELECT id INTO v_outgoing_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'outcome' AND user_id IS NULL;
+
+    SELECT id INTO v_incoming_category_id
+    FROM public.category
+    WHERE key = 'transfer' AND flow_type = 'income' AND user_id IS NULL;
+
+    IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+        RAISE EXCEPTION 'System transfer categories are missing';
+    END IF;
+
+    -- Step 1: Create outgoing transaction (outcome from source)
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description
+    ) VALUES (
+        p_user_id, p_from_account_id, v_outgoing_category_id,
+        'outcome'::public.flow_type_enum, p_amount, p_date, p_description
+    ) RETURNING * INTO v_outgoing;
+
+    -- Step 2: Create incoming transaction (income to destination), linked to outgoing
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description,
+        paired_transaction_id
+    ) VALUES (
+        p_user_id, p_to_account_id, v_incoming_category_id,
+        'income'::public.flow_type_enum, p_amount, p_date, p_description,
+        v_outgoing.id
+    ) RETURNING * INTO v_incoming;
+
+    -- Step 3: Link outgoing back to incoming
+    UPDATE public.transaction
+    SET paired_transaction_id = v_incoming.id
+    WHERE id = v_outgoing.id
+    RETURNING * INTO v_outgoing;
+
+    -- Step 4: Apply balance deltas
+    UPDATE public.account
+    SET cached_balance = cached_balance - p_amount, updated_at = now()
+    WHERE id = p_from_account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance + p_amount, updated_at = now()
+    WHERE id = p_to_account_id;
+
+    outgoing := to_jsonb(v_outgoing);
+    incoming := to_jsonb(v_incoming);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) IS
+  'Atomically creates two paired transactions for an internal transfer, adjusts both account balances, and returns both rows.';
+
+-- ---------------------------------------------------------
+-- 1.2 update_transfer
+-- Update both legs of a transfer and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.update_transfer(
+    p_transaction_id UUID,
+    p_user_id UUID,
+    p_amount NUMERIC DEFAULT NULL,
+    p_date TIMESTAMPTZ DEFAULT NULL,
+    p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    updated JSONB,
+    paired JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_transaction public.transaction;
+    v_paired public.transaction;
+    v_delta NUMERIC(12,2);
+BEGIN
+    -- Fetch the transaction and verify it's a transfer
+    SELECT * INTO v_transaction
+    FROM public.transaction
+    WHERE id = p_transaction_id
+      AND user_id = p_user_id
+      AND paired_transaction_id IS NOT NULL
+      AND deleted_at IS NULL;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Transaction not found, not accessible, or not a transfer';
+    END IF;
+
+    -- Verify the paired transaction
+    IF NOT EXISTS (
+        SELECT 1 FROM public.transaction
+        WHERE id = v_transaction.paired_transaction_id
+          AND user_id = p_user_id
+          AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Paired transaction not found or not accessible';
+    END IF;
+
+    -- Both legs carry the same amount, so one delta applies to both
+    v_delta := COALESCE(p_amount, v_transaction.amount) - v_transaction.amount;
+
+    -- Update the original transaction (only provided fields)
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = p_transaction_id
+    RETURNING * INTO v_transaction;
+
+    -- Update the paired transaction with the same values
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = v_transaction.paired_transaction_id
+    RETURNING * INTO v_paired;
+
+    -- Apply balance deltas (income legs gain, outcome legs lose), one
+    -- UPDATE per leg so both land even if the legs share an account
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            + CASE WHEN v_transaction.flow_type = 'income' THEN v_delta ELSE -v_delta END,
+        updated_at = now()
+    WHERE id = v_transaction.account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            + CASE WHEN v_paired.flow_type = 'income' THEN v_delta ELSE -v_delta END,
+        updated_at = now()
+    WHERE id = v_paired.account_id;
+
+    updated := to_jsonb(v_transaction);
+    paired := to_jsonb(v_paired);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.update_transfer(UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) IS
+  'Updates both legs of a transfer atomically, adjusts both account balances, and returns both rows. Only amount, date, and description can be updated.';
+
+-- ---------------------------------------------------------
+-- 1.3 delete_transfer
+-- Delete both legs of a transfer
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.delete_transfer(
+    p_transaction_id UUID,
+    p_user_id UUID
+)
+RETURNS TABLE(
+    deleted_transaction_id UUID,
+    paired_transaction_id UUID
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_transaction public.transaction;
+    v_paired public.transaction;
+BEGIN
+    -- Step 1: Fetch transaction and validate ownership
+    SELECT * INTO v_transaction
+    FROM public.transaction t
+    WHERE t.id = p_transaction_id AND t.deleted_at IS NULL;
+
+    -- Validate transaction exists
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Transaction % not found', p_transaction_id;
+    END IF;
+
+    -- Validate ownership
+    IF v_transaction.user_id != p_user_id THEN
+        RAISE EXCEPTION 'Transaction % does not belong to user %', p_transaction_id, p_user_id;
+    END IF;
+
+    -- Validate it's part of a transfer
+    IF v_transaction.paired_transaction_id IS NULL THEN
+        RAISE EXCEPTION 'Transaction % is not part of a transfer (paired_transaction_id is NULL)', p_transaction_id;
+    END IF;
+
+    -- Step 2: Soft-delete both transactions atomically and clear the pair links
+    UPDATE public.transaction t
+    SET deleted_at = now(), updated_at = now(), paired_transaction_id = NULL
+    WHERE t.id = v_transaction.paired_transaction_id
+      AND t.deleted_at IS NULL
+    RETURNING * INTO v_paired;
+
+    UPDATE public.transaction t
+    SET deleted_at = now(), updated_at = now(), paired_transaction_id = NULL
+    WHERE t.id = p_transaction_id;
+
+    -- Step 3: Reverse the balance effect of both legs, one UPDATE per
+    -- leg so both land even if the legs share an account
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            - CASE WHEN v_transaction.flow_type = 'income' THEN v_transaction.amount ELSE -v_transaction.amount END,
+        updated_at = now()
+    WHERE id = v_transaction.account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            - CASE WHEN v_paired.flow_type = 'income' THEN v_paired.amount ELSE -v_paired.amount END,
+        updated_at = now()
+    WHERE id = v_paired.account_id;
+
+    -- Step 4: Return both IDs for confirmation
+    deleted_transaction_id := p_transaction_id;
+    paired_transaction_id := v_transaction.paired_transaction_id;
+
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.delete_transfer(UUID, UUID) IS
+  'Soft-deletes both transactions in a transfer pair atomically and reverses their effect on both account balances.';
@@ -0,0 +1,109 @@
+-- =========================================================
+-- Migration: delete_transfer returns affected accounts
+-- Created: 2025-12-18
+--
+-- Purpose:
+-- The service used to SELECT the transaction and its pair before
+-- calling delete_transfer, only to learn which accounts were touched.
+-- The RPC already reads both rows, so it now returns the source
+-- (outcome leg) and destination (income leg) account IDs as well,
+-- and the service makes a single call.
+--
+-- Functions:
+-- - delete_transfer: RETURNS TABLE(deleted_transaction_id,
+--   paired_transaction_id, from_account_id, to_account_id)
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- Return type changes, so the old version must be dropped
+DROP FUNCTION IF EXISTS public.delete_transfer(UUID, UUID);
+
+-- ---------------------------------------------------------
+-- 1. delete_transfer
+-- Delete both legs of a transfer
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.delete_transfer(
+    p_transaction_id UUID,
+    p_user_id UUID
+)
+RETURNS TABLE(
+    deleted_transaction_id UUID,
+    paired_transaction_id UUID,
+    from_account_id UUID,
+    to_account_id UUID
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_transaction public.transaction;
+    v_paired public.transaction;
+BEGIN
+    -- Step 1: Fetch transaction and validate ownership
+    SELECT * INTO v_transaction
+    FROM public.transaction t
+    WHERE t.id = p_transaction_id AND t.deleted_at IS NULL;
+
+    -- Validate transaction exists
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Transaction % not found', p_transaction_id;
+    END IF;
+
+    -- Validate ownership
+    IF v_transaction.user_id != p_user_id THEN
+        RAISE EXCEPTION 'Transaction % does not belong to user %', p_transaction_id, p_user_id;
+    END IF;
+
+    -- Validate it's part of a transfer
+    IF v_transaction.paired_transaction_id IS NULL THEN
+        RAISE EXCEPTION 'Transaction % is not part of a transfer (paired_transaction_id is NULL)', p_transaction_id;
+    END IF;
+
+    -- Step 2: Soft-delete both transactions atomically and clear the pair links
+    UPDATE public.transaction t
+    SET deleted_at = now(), updated_at = now(), paired_transaction_id = NULL
+    WHERE t.id = v_transaction.paired_transaction_id
+      AND t.deleted_at IS NULL
+    RETURNING * INTO v_paired;
+
+    UPDATE public.transaction t
+    SET deleted_at = now(), updated_at = now(), paired_transaction_id = NULL
+    WHERE t.id = p_transaction_id;
+
+    -- Step 3: Reverse the balance effect of both legs, one UPDATE per
+    -- leg so both land even if the legs share an account
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            - CASE WHEN v_transaction.flow_type = 'income' THEN v_transaction.amount ELSE -v_transaction.amount END,
+        updated_at = now()
+    WHERE id = v_transaction.account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance
+            - CASE WHEN v_paired.flow_type = 'income' THEN v_paired.amount ELSE -v_paired.amount END,
+        updated_at = now()
+    WHERE id = v_paired.account_id;
+
+    -- Step 4: Return both IDs and the affected accounts (outcome leg = source)
+    deleted_transaction_id := p_transaction_id;
+    paired_transaction_id := v_transaction.paired_transaction_id;
+    IF v_transaction.flow_type = 'outcome' THEN
+        from_account_id := v_transaction.account_id;
+        to_account_id := v_paired.account_id;
+    ELSE
+        from_account_id := v_paired.account_id;
+        to_account_id := v_transaction.account_id;
+    END IF;
+
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.delete_transfer(UUID, UUID) IS
+  'Soft-deletes both transactions in a transfer pair atomically, reverses their effect on both account balances, and returns the affected account IDs.';
+
+GRANT EXECUTE ON FUNCTION public.delete_transfer(UUID, UUID) TO authenticated;
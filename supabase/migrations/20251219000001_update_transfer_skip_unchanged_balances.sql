@@ -0,0 +1,114 @@
+-- =========================================================
+-- Migration: update_transfer skips balance writes when amount is unchanged
+-- Created: 2025-12-19
+--
+-- Purpose:
+-- Only an amount change can shift account balances; date and
+-- description edits cannot. update_transfer now touches the two
+-- account rows only when the new amount differs from the old one,
+-- so the common "edit description" case writes (and locks) nothing
+-- outside the transaction table.
+--
+-- Functions (signature unchanged):
+-- - update_transfer
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- 1. update_transfer
+-- Update both legs of a transfer and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.update_transfer(
+    p_transaction_id UUID,
+    p_user_id UUID,
+    p_amount NUMERIC DEFAULT NULL,
+    p_date TIMESTAMPTZ DEFAULT NULL,
+    p_description TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    updated JSONB,
+    paired JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_transaction public.transaction;
+    v_paired public.transaction;
+    v_delta NUMERIC(12,2);
+BEGIN
+    -- Fetch the transaction and verify it's a transfer
+    SELECT * INTO v_transaction
+    FROM public.transaction
+    WHERE id = p_transaction_id
+      AND user_id = p_user_id
+      AND paired_transaction_id IS NOT NULL
+      AND deleted_at IS NULL;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Transaction not found, not accessible, or not a transfer';
+    END IF;
+
+    -- Verify the paired transaction
+    IF NOT EXISTS (
+        SELECT 1 FROM public.transaction
+        WHERE id = v_transaction.paired_transaction_id
+          AND user_id = p_user_id
+          AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Paired transaction not found or not accessible';
+    END IF;
+
+    -- Both legs carry the same amount, so one delta applies to both
+    v_delta := COALESCE(p_amount, v_transaction.amount) - v_transaction.amount;
+
+    -- Update the original transaction (only provided fields)
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = p_transaction_id
+    RETURNING * INTO v_transaction;
+
+    -- Update the paired transaction with the same values
+    UPDATE public.transaction
+    SET
+        amount = COALESCE(p_amount, amount),
+        date = COALESCE(p_date, date),
+        description = COALESCE(p_description, description),
+        updated_at = now()
+    WHERE id = v_transaction.paired_transaction_id
+    RETURNING * INTO v_paired;
+
+    -- Apply balance deltas (income legs gain, outcome legs lose).
+    -- Date/description edits cannot move a balance, so skip the account
+    -- writes (and their row locks) unless the amount actually changed.
+    -- One UPDATE per leg so both land even if the legs share an account.
+    IF v_delta <> 0 THEN
+        UPDATE public.account
+        SET cached_balance = cached_balance
+                + CASE WHEN v_transaction.flow_type = 'income' THEN v_delta ELSE -v_delta END,
+            updated_at = now()
+        WHERE id = v_transaction.account_id;
+
+        UPDATE public.account
+        SET cached_balance = cached_balance
+                + CASE WHEN v_paired.flow_type = 'income' THEN v_delta ELSE -v_delta END,
+            updated_at = now()
+        WHERE id = v_paired.account_id;
+    END IF;
+
+    updated := to_jsonb(v_transaction);
+    paired := to_jsonb(v_paired);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.update_transfer(UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT) IS
+  'Updates both legs of a transfer atomically, adjusts both account balances, and returns both rows. Only amount, date, and description can be updated.';
@@ -0,0 +1,123 @@
+-- =========================================================
+-- Migration: create_transfer accepts the transfer category key
+-- Created: 2025-12-20
+--
+-- Purpose:
+-- create_transfer always resolved the system categories with
+-- key = 'transfer'. Callers that need another system key (for example
+-- 'from_recurrent_transaction' when materialising recurring transfers)
+-- would otherwise have to look the category up themselves before the
+-- RPC. The key is now a parameter, defaulting to 'transfer', so
+-- category resolution stays inside the single RPC round trip.
+--
+-- Functions:
+-- - create_transfer: adds p_transfer_category_key TEXT DEFAULT 'transfer'
+--   (return type and balance handling unchanged)
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- The argument list changes, so the previous overload must be dropped
+DROP FUNCTION IF EXISTS public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT);
+
+-- ---------------------------------------------------------
+-- create_transfer
+-- Atomically create two paired transactions and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.create_transfer(
+    p_user_id UUID,
+    p_from_account_id UUID,
+    p_to_account_id UUID,
+    p_amount NUMERIC(12,2),
+    p_date TIMESTAMPTZ,
+    p_description TEXT DEFAULT NULL,
+    p_transfer_category_key TEXT DEFAULT 'transfer'
+)
+RETURNS TABLE(
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_category_key TEXT := COALESCE(p_transfer_category_key, 'transfer');
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_outgoing public.transaction;
+    v_incoming public.transaction;
+BEGIN
+    -- Validate both accounts belong to the user
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_from_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Source account not found or not accessible';
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM public.account
+        WHERE id = p_to_account_id AND user_id = p_user_id AND deleted_at IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Destination account not found or not accessible';
+    END IF;
+
+    -- Resolve flow-aware system categories for the requested key
+    SELECT id INTO v_outgoing_category_id
+    FROM public.category
+    WHERE key = v_category_key AND flow_type = 'outcome' AND user_id IS NULL;
+
+    SELECT id INTO v_incoming_category_id
+    FROM public.category
+    WHERE key = v_category_key AND flow_type = 'income' AND user_id IS NULL;
+
+    IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+        RAISE EXCEPTION 'System categories for key % are missing', v_category_key;
+    END IF;
+
+    -- Step 1: Create outgoing transaction (outcome from source)
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description
+    ) VALUES (
+        p_user_id, p_from_account_id, v_outgoing_category_id,
+        'outcome'::public.flow_type_enum, p_amount, p_date, p_description
+    ) RETURNING * INTO v_outgoing;
+
+    -- Step 2: Create incoming transaction (income to destination), linked to outgoing
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description,
+        paired_transaction_id
+    ) VALUES (
+        p_user_id, p_to_account_id, v_incoming_category_id,
+        'income'::public.flow_type_enum, p_amount, p_date, p_description,
+        v_outgoing.id
+    ) RETURNING * INTO v_incoming;
+
+    -- Step 3: Link outgoing back to incoming
+    UPDATE public.transaction
+    SET paired_transaction_id = v_incoming.id
+    WHERE id = v_outgoing.id
+    RETURNING * INTO v_outgoing;
+
+    -- Step 4: Apply balance deltas
+    UPDATE public.account
+    SET cached_balance = cached_balance - p_amount, updated_at = now()
+    WHERE id = p_from_account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance + p_amount, updated_at = now()
+    WHERE id = p_to_account_id;
+
+    outgoing := to_jsonb(v_outgoing);
+    incoming := to_jsonb(v_incoming);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT) IS
+  'Atomically creates two paired transactions for an internal transfer using the system categories for p_transfer_category_key, adjusts both account balances, and returns both rows.';
+
+GRANT EXECUTE ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT) TO authenticated;
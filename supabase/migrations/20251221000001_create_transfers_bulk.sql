@@ -0,0 +1,164 @@
+-- =========================================================
+-- Migration: Bulk transfer creation RPC
+-- Created: 2025-12-21
+--
+-- Purpose:
+-- Importing history one transfer at a time costs one RPC round trip
+-- (plus per-statement planning, RLS checks and two balance updates) per
+-- transfer. create_transfers_bulk writes a whole batch in one call:
+-- every leg of every transfer is inserted by a single INSERT ... SELECT
+-- over jsonb_to_record, and balances are adjusted once per account.
+--
+-- Input (p_rows): JSON array of objects
+--   { "from_account_id": uuid, "to_account_id": uuid,
+--     "amount": numeric > 0, "date": timestamptz,
+--     "description": text | null }
+--
+-- Output: one row per input element, in input order
+--   (ord, outgoing jsonb, incoming jsonb)
+--
+-- Validation (whole batch fails, nothing is written):
+-- - At most 1000 transfers per call
+-- - Every row has both accounts, a positive amount and a date
+-- - Source and destination differ
+-- - Every referenced account belongs to p_user_id and is not deleted
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+CREATE OR REPLACE FUNCTION public.create_transfers_bulk(
+    p_user_id UUID,
+    p_rows JSONB,
+    p_transfer_category_key TEXT DEFAULT 'transfer'
+)
+RETURNS TABLE(
+    ord INT,
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_category_key TEXT := COALESCE(p_transfer_category_key, 'transfer');
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_count INT;
+BEGIN
+    IF p_rows IS NULL OR jsonb_typeof(p_rows) <> 'array' THEN
+        RAISE EXCEPTION 'p_rows must be a JSON array';
+    END IF;
+
+    v_count := jsonb_array_length(p_rows);
+    IF v_count = 0 THEN
+        RETURN;
+    END IF;
+    IF v_count > 1000 THEN
+        RAISE EXCEPTION 'At most 1000 transfers can be created per call (got %)', v_count;
+    END IF;
+
+    -- Validate row shape before touching any table
+    IF EXISTS (
+        SELECT 1
+        FROM jsonb_array_elements(p_rows) AS r(value)
+        CROSS JOIN LATERAL jsonb_to_record(r.value) AS x(
+            from_account_id UUID, to_account_id UUID, amount NUMERIC(12,2), date TIMESTAMPTZ
+        )
+        WHERE x.from_account_id IS NULL
+           OR x.to_account_id IS NULL
+           OR x.from_account_id = x.to_account_id
+           OR x.amount IS NULL
+           OR x.amount <= 0
+           OR x.date IS NULL
+    ) THEN
+        RAISE EXCEPTION 'Every transfer needs distinct source and destination accounts, a positive amount and a date';
+    END IF;
+
+    -- Validate every referenced account belongs to the user
+    IF EXISTS (
+        SELECT 1
+        FROM (
+            SELECT (r.value->>'from_account_id')::UUID AS account_id FROM jsonb_array_elements(p_rows) AS r(value)
+            UNION
+            SELECT (r.value->>'to_account_id')::UUID FROM jsonb_array_elements(p_rows) AS r(value)
+        ) AS ids
+        WHERE NOT EXISTS (
+            SELECT 1 FROM public.account a
+            WHERE a.id = ids.account_id AND a.user_id = p_user_id AND a.deleted_at IS NULL
+        )
+    ) THEN
+        RAISE EXCEPTION 'Account not found or not accessible';
+    END IF;
+
+    -- Resolve flow-aware system categories for the requested key
+    SELECT c.id INTO v_outgoing_category_id
+    FROM public.category c
+    WHERE c.key = v_category_key AND c.flow_type = 'outcome' AND c.user_id IS NULL;
+
+    SELECT c.id INTO v_incoming_category_id
+    FROM public.category c
+    WHERE c.key = v_category_key AND c.flow_type = 'income' AND c.user_id IS NULL;
+
+    IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+        RAISE EXCEPTION 'System categories for key % are missing', v_category_key;
+    END IF;
+
+    -- IDs are assigned up front so both legs can reference each other in the
+    -- same INSERT (foreign keys are checked at the end of the statement)
+    RETURN QUERY
+    WITH input AS (
+        SELECT
+            r.ord::INT AS row_ord,
+            x.from_account_id,
+            x.to_account_id,
+            x.amount,
+            x.date,
+            x.description,
+            gen_random_uuid() AS outgoing_id,
+            gen_random_uuid() AS incoming_id
+        FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS r(value, ord)
+        CROSS JOIN LATERAL jsonb_to_record(r.value) AS x(
+            from_account_id UUID, to_account_id UUID, amount NUMERIC(12,2),
+            date TIMESTAMPTZ, description TEXT
+        )
+    ),
+    inserted AS (
+        INSERT INTO public.transaction (
+            id, user_id, account_id, category_id, flow_type, amount, date,
+            description, paired_transaction_id
+        )
+        SELECT i.outgoing_id, p_user_id, i.from_account_id, v_outgoing_category_id,
+               'outcome'::public.flow_type_enum, i.amount, i.date, i.description, i.incoming_id
+        FROM input i
+        UNION ALL
+        SELECT i.incoming_id, p_user_id, i.to_account_id, v_incoming_category_id,
+               'income'::public.flow_type_enum, i.amount, i.date, i.description, i.outgoing_id
+        FROM input i
+        RETURNING *
+    ),
+    balance_deltas AS (
+        UPDATE public.account a
+        SET cached_balance = a.cached_balance + d.delta,
+            updated_at = now()
+        FROM (
+            SELECT t.account_id,
+                   SUM(CASE WHEN t.flow_type = 'income' THEN t.amount ELSE -t.amount END) AS delta
+            FROM inserted t
+            GROUP BY t.account_id
+        ) AS d
+        WHERE a.id = d.account_id
+    )
+    SELECT i.row_ord, to_jsonb(o), to_jsonb(n)
+    FROM input i
+    JOIN inserted o ON o.id = i.outgoing_id
+    JOIN inserted n ON n.id = i.incoming_id
+    ORDER BY i.row_ord;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_transfers_bulk(UUID, JSONB, TEXT) IS
+  'Atomically creates a batch of paired transfer transactions from a JSON array, adjusts account balances once per account, and returns both rows of every transfer in input order.';
+
+GRANT EXECUTE ON FUNCTION public.create_transfers_bulk(UUID, JSONB, TEXT) TO authenticated;
@@ -0,0 +1,198 @@
+-- =========================================================
+-- Migration: Idempotent create_transfer
+-- Created: 2025-12-22
+--
+-- Purpose:
+-- A client that retries POST /transfers after a timeout or dropped
+-- connection would create a second transfer pair (and move the money
+-- twice). Callers can now pass an idempotency key; the outgoing leg
+-- stores it, and a repeated call with the same key returns the pair
+-- that already exists instead of inserting a new one. A key that points
+-- at a deleted transfer, or a retry whose amount, accounts or date differ
+-- from the stored transfer, is a conflict rather than a replay.
+--
+-- Schema:
+-- - transaction.idempotency_key TEXT NULL
+-- - Unique partial index on (user_id, idempotency_key) for non-null keys
+--   (only the outgoing leg of a transfer carries the key)
+--
+-- Functions:
+-- - create_transfer: adds p_idempotency_key TEXT DEFAULT NULL
+--   (return type and balance handling unchanged; a replay touches no balances)
+--
+-- Errors (SQLSTATE KS409, mapped to 409 Conflict by the API):
+-- - 'Idempotency key % belongs to a deleted transfer'
+-- - 'Idempotency key % was already used for a different transfer'
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- Keys are scoped per user, so one user's key never matches another's transfer
+-- =========================================================
+
+ALTER TABLE public.transaction
+    ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS transaction_user_idempotency_key_uniq
+    ON public.transaction (user_id, idempotency_key)
+    WHERE idempotency_key IS NOT NULL;
+
+COMMENT ON COLUMN public.transaction.idempotency_key IS
+  'Client-supplied key that makes create_transfer retry-safe. Set on the outgoing leg only.';
+
+-- The argument list changes, so the previous overload must be dropped
+DROP FUNCTION IF EXISTS public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT);
+
+-- ---------------------------------------------------------
+-- create_transfer
+-- Atomically create two paired transactions and return both rows
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.create_transfer(
+    p_user_id UUID,
+    p_from_account_id UUID,
+    p_to_account_id UUID,
+    p_amount NUMERIC(12,2),
+    p_date TIMESTAMPTZ,
+    p_description TEXT DEFAULT NULL,
+    p_transfer_category_key TEXT DEFAULT 'transfer',
+    p_idempotency_key TEXT DEFAULT NULL
+)
+RETURNS TABLE(
+    outgoing JSONB,
+    incoming JSONB
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_category_key TEXT := COALESCE(p_transfer_category_key, 'transfer');
+    v_outgoing_category_id UUID;
+    v_incoming_category_id UUID;
+    v_outgoing public.transaction;
+    v_incoming public.transaction;
+    v_replay BOOLEAN := FALSE;
+BEGIN
+    -- Replay: a transfer with this key may already exist
+    IF p_idempotency_key IS NOT NULL THEN
+        SELECT * INTO v_outgoing
+        FROM public.transaction
+        WHERE user_id = p_user_id AND idempotency_key = p_idempotency_key;
+
+        v_replay := FOUND;
+    END IF;
+
+    IF NOT v_replay THEN
+        -- Validate both accounts belong to the user
+        IF NOT EXISTS (
+            SELECT 1 FROM public.account
+            WHERE id = p_from_account_id AND user_id = p_user_id AND deleted_at IS NULL
+        ) THEN
+            RAISE EXCEPTION 'Source account not found or not accessible';
+        END IF;
+
+        IF NOT EXISTS (
+            SELECT 1 FROM public.account
+            WHERE id = p_to_account_id AND user_id = p_user_id AND deleted_at IS NULL
+        ) THEN
+            RAISE EXCEPTION 'Destination account not found or not accessible';
+        END IF;
+
+        -- Resolve flow-aware system categories for the requested key
+        SELECT id INTO v_outgoing_category_id
+        FROM public.category
+        WHERE key = v_category_key AND flow_type = 'outcome' AND user_id IS NULL;
+
+        SELECT id INTO v_incoming_category_id
+        FROM public.category
+        WHERE key = v_category_key AND flow_type = 'income' AND user_id IS NULL;
+
+        IF v_outgoing_category_id IS NULL OR v_incoming_category_id IS NULL THEN
+            RAISE EXCEPTION 'System categories for key % are missing', v_category_key;
+        END IF;
+
+        -- Step 1: Create outgoing transaction (outcome from source).
+        -- A concurrent call with the same key loses the race here and
+        -- is handled as a replay of the winner's pair.
+        INSERT INTO public.transaction (
+            user_id, account_id, category_id, flow_type, amount, date, description,
+            idempotency_key
+        ) VALUES (
+            p_user_id, p_from_account_id, v_outgoing_category_id,
+            'outcome'::public.flow_type_enum, p_amount, p_date, p_description,
+            p_idempotency_key
+        )
+        ON CONFLICT (user_id, idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+        RETURNING * INTO v_outgoing;
+
+        IF v_outgoing.id IS NULL THEN
+            SELECT * INTO v_outgoing
+            FROM public.transaction
+            WHERE user_id = p_user_id AND idempotency_key = p_idempotency_key;
+
+            v_replay := TRUE;
+        END IF;
+    END IF;
+
+    -- Return the existing pair only if it is live and matches this request
+    IF v_replay THEN
+        IF v_outgoing.deleted_at IS NOT NULL THEN
+            RAISE EXCEPTION 'Idempotency key % belongs to a deleted transfer', p_idempotency_key
+                USING ERRCODE = 'KS409';
+        END IF;
+
+        SELECT * INTO v_incoming
+        FROM public.transaction
+        WHERE id = v_outgoing.paired_transaction_id AND deleted_at IS NULL;
+
+        IF NOT FOUND
+           OR v_outgoing.account_id <> p_from_account_id
+           OR v_incoming.account_id <> p_to_account_id
+           OR v_outgoing.amount <> p_amount::NUMERIC(12,2)
+           OR v_outgoing.date <> p_date
+        THEN
+            RAISE EXCEPTION 'Idempotency key % was already used for a different transfer', p_idempotency_key
+                USING ERRCODE = 'KS409';
+        END IF;
+
+        outgoing := to_jsonb(v_outgoing);
+        incoming := to_jsonb(v_incoming);
+        RETURN NEXT;
+        RETURN;
+    END IF;
+
+    -- Step 2: Create incoming transaction (income to destination), linked to outgoing
+    INSERT INTO public.transaction (
+        user_id, account_id, category_id, flow_type, amount, date, description,
+        paired_transaction_id
+    ) VALUES (
+        p_user_id, p_to_account_id, v_incoming_category_id,
+        'income'::public.flow_type_enum, p_amount, p_date, p_description,
+        v_outgoing.id
+    ) RETURNING * INTO v_incoming;
+
+    -- Step 3: Link outgoing back to incoming
+    UPDATE public.transaction
+    SET paired_transaction_id = v_incoming.id
+    WHERE id = v_outgoing.id
+    RETURNING * INTO v_outgoing;
+
+    -- Step 4: Apply balance deltas
+    UPDATE public.account
+    SET cached_balance = cached_balance - p_amount, updated_at = now()
+    WHERE id = p_from_account_id;
+
+    UPDATE public.account
+    SET cached_balance = cached_balance + p_amount, updated_at = now()
+    WHERE id = p_to_account_id;
+
+    outgoing := to_jsonb(v_outgoing);
+    incoming := to_jsonb(v_incoming);
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT, TEXT) IS
+  'Atomically creates two paired transactions for an internal transfer using the system categories for p_transfer_category_key, adjusts both account balances, and returns both rows. With p_idempotency_key, a repeated call with the same details returns the existing pair without writing; a deleted or different transfer under that key raises SQLSTATE KS409.';
+
+GRANT EXECUTE ON FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT, TEXT) TO authenticated;
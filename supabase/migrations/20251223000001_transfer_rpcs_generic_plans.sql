@@ -0,0 +1,44 @@
+-- =========================================================
+-- Migration: Generic plans for transfer RPCs
+-- Created: 2025-12-23
+--
+-- Purpose:
+-- PL/pgSQL caches a prepared plan for every statement in a function, but
+-- with the default plan_cache_mode (auto) each statement is re-planned
+-- with the actual parameter values for its first five executions in a
+-- session before a generic plan is considered. The transfer RPCs only run
+-- primary-key / (user_id, ...) lookups and single-row writes, where the
+-- generic plan is always the same index plan, so that planning work is
+-- wasted on every pooled connection. Forcing the generic plan lets each
+-- statement be planned once per session.
+--
+-- Functions (current signatures; bodies unchanged):
+-- - create_transfer
+-- - update_transfer
+-- - delete_transfer
+-- - create_recurring_transfer
+-- - delete_recurring_and_pair
+--
+-- Not changed:
+-- - create_transfers_bulk: one call per batch, and the set-based
+--   statements benefit from custom plans sized to the batch
+--
+-- Verify with:
+--   EXPLAIN (ANALYZE, VERBOSE) on the function body statements, or compare
+--   pg_stat_statements planning time before/after
+-- =========================================================
+
+ALTER FUNCTION public.create_transfer(UUID, UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT, TEXT, TEXT)
+    SET plan_cache_mode = 'force_generic_plan';
+
+ALTER FUNCTION public.update_transfer(UUID, UUID, NUMERIC, TIMESTAMPTZ, TEXT)
+    SET plan_cache_mode = 'force_generic_plan';
+
+ALTER FUNCTION public.delete_transfer(UUID, UUID)
+    SET plan_cache_mode = 'force_generic_plan';
+
+ALTER FUNCTION public.create_recurring_transfer(UUID, UUID, UUID, NUMERIC, TEXT, TEXT, TEXT, INT, DATE, TEXT[], INT[], DATE, BOOLEAN)
+    SET plan_cache_mode = 'force_generic_plan';
+
+ALTER FUNCTION public.delete_recurring_and_pair(UUID, UUID)
+    SET plan_cache_mode = 'force_generic_plan';
@@ -0,0 +1,133 @@
+-- =========================================================
+-- Migration: create_wishlist_with_items in a single call
+-- Created: 2025-12-24
+--
+-- Purpose:
+-- Creating a wishlist took up to three round trips: validate_user_currency,
+-- create_wishlist_with_items (or a plain INSERT when there were no items),
+-- and a SELECT to fetch the created wishlist because the RPC only returned
+-- its id. The RPC now validates the currency itself, inserts all items with
+-- one set-based INSERT over jsonb_to_recordset, and returns the created
+-- wishlist row, so every create is one call in one transaction.
+--
+-- Functions:
+-- - create_wishlist_with_items: returns (wishlist jsonb, items_created int)
+--   instead of (wishlist_id uuid, items_created int); accepts NULL or []
+--   for p_items
+--
+-- Errors:
+-- - 'Currency mismatch: ...' (same text as validate_user_currency)
+-- - 'User profile not found for user_id: ...'
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+-- The return type changes, so the function must be dropped first
+DROP FUNCTION IF EXISTS public.create_wishlist_with_items(UUID, TEXT, NUMERIC, TEXT, DATE, TEXT, TEXT, JSONB);
+
+CREATE OR REPLACE FUNCTION public.create_wishlist_with_items(
+    p_user_id UUID,
+    p_goal_title TEXT,
+    p_budget_hint NUMERIC(12,2),
+    p_currency_code TEXT,
+    p_target_date DATE,
+    p_preferred_store TEXT,
+    p_user_note TEXT,
+    p_items JSONB DEFAULT '[]'::JSONB
+)
+RETURNS TABLE(
+    wishlist JSONB,
+    items_created INTEGER
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_user_currency TEXT;
+    v_wishlist public.wishlist;
+    v_items_count INTEGER := 0;
+BEGIN
+    -- Single-currency-per-user policy (same checks as validate_user_currency)
+    SELECT currency_preference INTO v_user_currency
+    FROM public.profile
+    WHERE user_id = p_user_id;
+
+    IF v_user_currency IS NULL THEN
+        RAISE EXCEPTION 'User profile not found for user_id: %', p_user_id;
+    END IF;
+
+    IF p_currency_code != v_user_currency THEN
+        RAISE EXCEPTION 'Currency mismatch: provided "%" but user currency is "%". Single-currency-per-user policy enforced.',
+            p_currency_code, v_user_currency;
+    END IF;
+
+    -- Create wishlist
+    INSERT INTO public.wishlist (
+        user_id,
+        goal_title,
+        budget_hint,
+        currency_code,
+        target_date,
+        preferred_store,
+        user_note,
+        status
+    ) VALUES (
+        p_user_id,
+        p_goal_title,
+        p_budget_hint,
+        p_currency_code,
+        p_target_date,
+        p_preferred_store,
+        p_user_note,
+        'active'::public.wishlist_status_enum
+    ) RETURNING * INTO v_wishlist;
+
+    -- Create all items in one statement
+    IF p_items IS NOT NULL AND jsonb_array_length(p_items) > 0 THEN
+        INSERT INTO public.wishlist_item (
+            wishlist_id,
+            product_title,
+            price_total,
+            seller_name,
+            url,
+            pickup_available,
+            warranty_info,
+            copy_for_user,
+            badges
+        )
+        SELECT
+            v_wishlist.id,
+            i.product_title,
+            i.price_total,
+            i.seller_name,
+            i.url,
+            i.pickup_available,
+            NULLIF(i.warranty_info, ''),
+            i.copy_for_user,
+            i.badges
+        FROM jsonb_to_recordset(p_items) AS i(
+            product_title TEXT,
+            price_total NUMERIC(12,2),
+            seller_name TEXT,
+            url TEXT,
+            pickup_available BOOLEAN,
+            warranty_info TEXT,
+            copy_for_user TEXT,
+            badges JSONB
+        );
+
+        GET DIAGNOSTICS v_items_count = ROW_COUNT;
+    END IF;
+
+    wishlist := to_jsonb(v_wishlist);
+    items_created := v_items_count;
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_wishlist_with_items(UUID, TEXT, NUMERIC, TEXT, DATE, TEXT, TEXT, JSONB) IS
+  'Validates the currency against the user profile, atomically creates a wishlist with optional initial items, and returns the created wishlist row and item count.';
+
+GRANT EXECUTE ON FUNCTION public.create_wishlist_with_items(UUID, TEXT, NUMERIC, TEXT, DATE, TEXT, TEXT, JSONB) TO authenticated;
@@ -0,0 +1,24 @@
+-- =========================================================
+-- Migration: Keyset index for wishlist listing
+-- Created: 2025-12-25
+--
+-- Purpose:
+-- GET /wishlists pages with a (created_at, id) keyset cursor:
+--
+--   WHERE user_id = ?
+--     AND (created_at < ? OR (created_at = ? AND id < ?))
+--   ORDER BY created_at DESC, id DESC
+--   LIMIT n
+--
+-- A composite index matching the filter and the ORDER BY makes every
+-- page a bounded index scan, whatever its depth.
+--
+-- Notes:
+-- - Supabase runs each migration inside a transaction, so
+--   CREATE INDEX CONCURRENTLY cannot be used here. On a large
+--   production table, run the CREATE INDEX CONCURRENTLY equivalent
+--   manually first; the IF NOT EXISTS guard makes this file a no-op then.
+-- =========================================================
+
+CREATE INDEX IF NOT EXISTS wishlist_user_created_at_id_desc_idx
+    ON public.wishlist (user_id, created_at DESC, id DESC);
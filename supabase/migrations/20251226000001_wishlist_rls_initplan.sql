@@ -0,0 +1,76 @@
+-- =========================================================
+-- Migration: InitPlan-friendly RLS policies for wishlists
+-- Created: 2025-12-26
+--
+-- Purpose:
+-- Policies written as `auth.uid() = user_id` call auth.uid() for every
+-- row the query touches. Wrapping the call as `(SELECT auth.uid())`
+-- turns it into an InitPlan that Postgres evaluates once per statement
+-- and compares as a constant, so the policy check no longer grows with
+-- the number of rows scanned.
+--
+-- wishlist_item ownership is checked through the parent wishlist. The
+-- correlated EXISTS (one probe of wishlist per item row) becomes an
+-- uncorrelated `wishlist_id IN (SELECT ...)`, which is computed once
+-- per statement as a hashed subplan.
+--
+-- Permissive policies are OR-ed for every row, so the per-command
+-- policies on each table are replaced by one FOR ALL policy with the
+-- same meaning.
+--
+-- Tables:
+-- - wishlist: user_id = (SELECT auth.uid())
+-- - wishlist_item: parent wishlist owned by (SELECT auth.uid())
+--
+-- Notes:
+-- - Existing policy names differ between environments, so every policy
+--   on the two tables is dropped by name from pg_policies first.
+-- =========================================================
+
+DO $$
+DECLARE
+    v_policy RECORD;
+BEGIN
+    FOR v_policy IN
+        SELECT policyname, tablename
+        FROM pg_catalog.pg_policies
+        WHERE schemaname = 'public'
+          AND tablename IN ('wishlist', 'wishlist_item')
+    LOOP
+        EXECUTE format('DROP POLICY %I ON public.%I', v_policy.policyname, v_policy.tablename);
+    END LOOP;
+END;
+$$;
+
+ALTER TABLE public.wishlist ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.wishlist_item ENABLE ROW LEVEL SECURITY;
+
+-- ---------------------------------------------------------
+-- 1. wishlist (direct ownership)
+-- ---------------------------------------------------------
+
+CREATE POLICY wishlist_owner_all ON public.wishlist
+    FOR ALL
+    TO authenticated
+    USING (user_id = (SELECT auth.uid()))
+    WITH CHECK (user_id = (SELECT auth.uid()));
+
+-- ---------------------------------------------------------
+-- 2. wishlist_item (ownership through the parent wishlist)
+-- ---------------------------------------------------------
+
+CREATE POLICY wishlist_item_owner_all ON public.wishlist_item
+    FOR ALL
+    TO authenticated
+    USING (
+        wishlist_id IN (
+            SELECT w.id FROM public.wishlist w
+            WHERE w.user_id = (SELECT auth.uid())
+        )
+    )
+    WITH CHECK (
+        wishlist_id IN (
+            SELECT w.id FROM public.wishlist w
+            WHERE w.user_id = (SELECT auth.uid())
+        )
+    );
@@ -0,0 +1,105 @@
+-- =========================================================
+-- Migration: Denormalized wishlist.item_count
+-- Created: 2025-12-27
+--
+-- Purpose:
+-- DELETE /wishlists/{id} reports how many items were cascaded, which
+-- cost a separate COUNT request before the delete. The count is now
+-- kept on the wishlist row itself, so the DELETE's returned row
+-- carries it and the endpoint is a single request.
+--
+-- Schema:
+-- - wishlist.item_count INT NOT NULL DEFAULT 0 (backfilled below)
+--
+-- Triggers (statement-level, with transition tables, so a multi-row
+-- insert such as create_wishlist_with_items updates each parent once):
+-- - wishlist_item_count_ins: AFTER INSERT ON wishlist_item
+-- - wishlist_item_count_del: AFTER DELETE ON wishlist_item
+--
+-- Notes:
+-- - Items cascaded by a wishlist DELETE fire the delete trigger after
+--   the parent row is gone; that UPDATE matches no rows, and the DELETE
+--   has already returned the pre-delete item_count.
+-- - wishlist_item.wishlist_id is never updated by the application, so
+--   moves between wishlists are not tracked.
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+ALTER TABLE public.wishlist
+    ADD COLUMN IF NOT EXISTS item_count INT NOT NULL DEFAULT 0;
+
+UPDATE public.wishlist w
+SET item_count = c.item_count
+FROM (
+    SELECT wishlist_id, COUNT(*)::INT AS item_count
+    FROM public.wishlist_item
+    GROUP BY wishlist_id
+) AS c
+WHERE w.id = c.wishlist_id;
+
+COMMENT ON COLUMN public.wishlist.item_count IS
+  'Number of wishlist_item rows, maintained by triggers on wishlist_item.';
+
+-- ---------------------------------------------------------
+-- Trigger functions
+-- ---------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION public.wishlist_item_count_after_insert()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+BEGIN
+    UPDATE public.wishlist w
+    SET item_count = w.item_count + d.added
+    FROM (
+        SELECT wishlist_id, COUNT(*)::INT AS added
+        FROM new_items
+        GROUP BY wishlist_id
+    ) AS d
+    WHERE w.id = d.wishlist_id;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.wishlist_item_count_after_delete()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+BEGIN
+    UPDATE public.wishlist w
+    SET item_count = GREATEST(w.item_count - d.removed, 0)
+    FROM (
+        SELECT wishlist_id, COUNT(*)::INT AS removed
+        FROM old_items
+        GROUP BY wishlist_id
+    ) AS d
+    WHERE w.id = d.wishlist_id;
+
+    RETURN NULL;
+END;
+$$;
+
+-- ---------------------------------------------------------
+-- Triggers
+-- ---------------------------------------------------------
+
+DROP TRIGGER IF EXISTS wishlist_item_count_ins ON public.wishlist_item;
+CREATE TRIGGER wishlist_item_count_ins
+    AFTER INSERT ON public.wishlist_item
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.wishlist_item_count_after_insert();
+
+DROP TRIGGER IF EXISTS wishlist_item_count_del ON public.wishlist_item;
+CREATE TRIGGER wishlist_item_count_del
+    AFTER DELETE ON public.wishlist_item
+    REFERENCING OLD TABLE AS old_items
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION public.wishlist_item_count_after_delete();
@@ -0,0 +1,132 @@
+-- =========================================================
+-- Migration: Cap create_wishlist_with_items at 3 items
+-- Created: 2025-12-28
+--
+-- Purpose:
+-- The API only ever sends 0-3 selected recommendation items, but the RPC
+-- accepted any p_items array, so a direct caller could hold the create
+-- transaction open for an arbitrarily large INSERT. The RPC now rejects
+-- more than 3 items before touching any table, bounding the work of a
+-- single create independently of the client.
+--
+-- Functions:
+-- - create_wishlist_with_items: raises when p_items has more than 3
+--   elements (signature and return type unchanged)
+--
+-- Errors:
+-- - 'At most 3 items can be created per wishlist (got N)'
+--
+-- Security:
+-- SECURITY DEFINER with SET search_path = ''
+-- =========================================================
+
+CREATE OR REPLACE FUNCTION public.create_wishlist_with_items(
+    p_user_id UUID,
+    p_goal_title TEXT,
+    p_budget_hint NUMERIC(12,2),
+    p_currency_code TEXT,
+    p_target_date DATE,
+    p_preferred_store TEXT,
+    p_user_note TEXT,
+    p_items JSONB DEFAULT '[]'::JSONB
+)
+RETURNS TABLE(
+    wishlist JSONB,
+    items_created INTEGER
+)
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = ''
+AS $$
+DECLARE
+    v_user_currency TEXT;
+    v_wishlist public.wishlist;
+    v_items_count INTEGER := 0;
+BEGIN
+    -- Bound the work of a single create (the API accepts 0-3 items)
+    IF p_items IS NOT NULL AND jsonb_array_length(p_items) > 3 THEN
+        RAISE EXCEPTION 'At most 3 items can be created per wishlist (got %)', jsonb_array_length(p_items);
+    END IF;
+
+    -- Single-currency-per-user policy (same checks as validate_user_currency)
+    SELECT currency_preference INTO v_user_currency
+    FROM public.profile
+    WHERE user_id = p_user_id;
+
+    IF v_user_currency IS NULL THEN
+        RAISE EXCEPTION 'User profile not found for user_id: %', p_user_id;
+    END IF;
+
+    IF p_currency_code != v_user_currency THEN
+        RAISE EXCEPTION 'Currency mismatch: provided "%" but user currency is "%". Single-currency-per-user policy enforced.',
+            p_currency_code, v_user_currency;
+    END IF;
+
+    -- Create wishlist
+    INSERT INTO public.wishlist (
+        user_id,
+        goal_title,
+        budget_hint,
+        currency_code,
+        target_date,
+        preferred_store,
+        user_note,
+        status
+    ) VALUES (
+        p_user_id,
+        p_goal_title,
+        p_budget_hint,
+        p_currency_code,
+        p_target_date,
+        p_preferred_store,
+        p_user_note,
+        'active'::public.wishlist_status_enum
+    ) RETURNING * INTO v_wishlist;
+
+    -- Create all items in one statement
+    IF p_items IS NOT NULL AND jsonb_array_length(p_items) > 0 THEN
+        INSERT INTO public.wishlist_item (
+            wishlist_id,
+            product_title,
+            price_total,
+            seller_name,
+            url,
+            pickup_available,
+            warranty_info,
+            copy_for_user,
+            badges
+        )
+        SELECT
+            v_wishlist.id,
+            i.product_title,
+            i.price_total,
+            i.seller_name,
+            i.url,
+            i.pickup_available,
+            NULLIF(i.warranty_info, ''),
+            i.copy_for_user,
+            i.badges
+        FROM jsonb_to_recordset(p_items) AS i(
+            product_title TEXT,
+            price_total NUMERIC(12,2),
+            seller_name TEXT,
+            url TEXT,
+            pickup_available BOOLEAN,
+            warranty_info TEXT,
+            copy_for_user TEXT,
+            badges JSONB
+        );
+
+        GET DIAGNOSTICS v_items_count = ROW_COUNT;
+    END IF;
+
+    wishlist := to_jsonb(v_wishlist);
+    items_created := v_items_count;
+    RETURN NEXT;
+END;
+$$;
+
+COMMENT ON FUNCTION public.create_wishlist_with_items(UUID, TEXT, NUMERIC, TEXT, DATE, TEXT, TEXT, JSONB) IS
+  'Validates the currency against the user profile, atomically creates a wishlist with optional initial items, and returns the created wishlist row and item count.';
+
+GRANT EXECUTE ON FUNCTION public.create_wishlist_with_items(UUID, TEXT, NUMERIC, TEXT, DATE, TEXT, TEXT, JSONB) TO authenticated;
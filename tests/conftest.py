@@ -27,3 +27,35 @@ def supabase_client():
     """
     mock_client = MagicMock()
     return mock_client
+
+
+# Query builder methods that return the builder, so chains like
+# table().select().eq().order().range() resolve to one mock
+_CHAINED_QUERY_METHODS = (
+    "select", "insert", "update", "delete",
+    "eq", "is_", "gte", "lte", "or_",
+    "order", "limit", "range",
+)
+
+
+@pytest.fixture
+def chain_client():
+    """
+    Factory for a mock Supabase client with a chainable table() query.
+
+    Every builder method returns the same query mock, and query.execute()
+    returns a response with the given rows (and count).
+
+    Returns:
+        Callable (rows, count=None) -> (client, query)
+    """
+    def make(rows, count=None):
+        query = MagicMock()
+        for method in _CHAINED_QUERY_METHODS:
+            getattr(query, method).return_value = query
+        query.execute.return_value = MagicMock(data=rows, count=count)
+        client = MagicMock()
+        client.table.return_value = query
+        return client, query
+
+    return make
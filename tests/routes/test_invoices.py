@@ -8,21 +8,31 @@ Tests follow the requirements from .github/copilot-instructions.md:
 - Validation tests for response schema
 """
 
-import io
-from unittest.mock import patch, MagicMock
+import base64
+import json
+import tempfile
+from unittest.mock import AsyncMock, patch, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
-from PIL import Image
 
+import backend.agents.invoice.agent as invoice_agent_module
+import backend.routes.invoices as invoices_routes
 from backend.main import app
 from backend.agents.invoice.types import InvoiceAgentOutput
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create test client for FastAPI app."""
-    return TestClient(app)
+    """
+    Shared test client for the FastAPI app.
+
+    Entered as a context manager so the app lifespan runs once per session.
+    Per-test isolation comes from mock_verify_token clearing dependency
+    overrides after every test.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 async def mock_get_authenticated_user_dependency():
@@ -60,66 +70,109 @@ def mock_verify_token():
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="module", autouse=True)
+def _patched_invoice_dependencies():
+    """
+    Patch the invoice route's collaborators once for the whole module.
+
+    Resolving and swapping the attributes per test is repeated work; the
+    per-test fixtures below only reset and configure these shared mocks.
+    """
+    mocks = {
+        "get_user_profile": AsyncMock(),
+        "get_user_categories": MagicMock(),
+        "get_supabase_client": MagicMock(),
+        "upload_invoice_image": AsyncMock(),
+        "genai_client": MagicMock(),
+    }
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(invoices_routes, "get_user_profile", mocks["get_user_profile"])
+        mp.setattr(invoices_routes, "get_user_categories", mocks["get_user_categories"])
+        mp.setattr(invoices_routes, "get_supabase_client", mocks["get_supabase_client"])
+        mp.setattr(invoices_routes, "upload_invoice_image", mocks["upload_invoice_image"])
+        mp.setattr(invoice_agent_module.genai, "Client", mocks["genai_client"])
+        yield mocks
+
+
 @pytest.fixture
-def mock_get_user_profile_fixture():
+def mock_get_user_profile_fixture(_patched_invoice_dependencies):
     """Mock get_user_profile service function."""
-    with patch("backend.routes.invoices.get_user_profile") as mock:
-        # Make the mock return a coroutine that resolves to the profile data
-        async def mock_profile(*args, **kwargs):
-            return await mock_get_user_profile(None, "test-user-uuid-123")
-        mock.side_effect = mock_profile
-        yield mock
+    mock = _patched_invoice_dependencies["get_user_profile"]
+    mock.reset_mock()
+
+    # Resolve to the test profile data
+    async def mock_profile(*args, **kwargs):
+        return await mock_get_user_profile(None, "test-user-uuid-123")
+    mock.side_effect = mock_profile
+    return mock
 
 
 @pytest.fixture
-def mock_get_user_categories_fixture():
+def mock_get_user_categories_fixture(_patched_invoice_dependencies):
     """Mock get_user_categories to return test categories."""
-    with patch("backend.routes.invoices.get_user_categories") as mock:
-        # Return a list of test categories
-        mock.return_value = [
-            {
-                "id": "test-category-uuid",
-                "name": "Groceries",
-                "description": "Food and household items"
-            },
-            {
-                "id": "test-category-uuid-2",
-                "name": "Transportation",
-                "description": "Gas, bus, taxi, etc."
-            }
-        ]
-        yield mock
+    mock = _patched_invoice_dependencies["get_user_categories"]
+    mock.reset_mock()
+
+    # Return a list of test categories
+    mock.return_value = [
+        {
+            "id": "test-category-uuid",
+            "name": "Groceries",
+            "description": "Food and household items"
+        },
+        {
+            "id": "test-category-uuid-2",
+            "name": "Transportation",
+            "description": "Gas, bus, taxi, etc."
+        }
+    ]
+    return mock
 
 
 @pytest.fixture
-def mock_get_supabase_client():
+def mock_get_supabase_client(_patched_invoice_dependencies):
     """Mock get_supabase_client to return a fake client with storage capability."""
-    with patch("backend.routes.invoices.get_supabase_client") as mock:
-        # Create a mock Supabase client with storage using MagicMock
-        mock_supabase_client = MagicMock()
-        
-        # Mock the upload method to return a storage path
-        mock_supabase_client.storage.from_().upload.return_value = MagicMock(
-            data={'path': 'invoices/test-user-uuid-123/test-image.png'}
-        )
-        
-        # Set the return value to the mock client
-        mock.return_value = mock_supabase_client
-        yield mock
+    mock = _patched_invoice_dependencies["get_supabase_client"]
+    mock.reset_mock()
+
+    # Create a mock Supabase client with storage using MagicMock
+    mock_supabase_client = MagicMock()
+
+    # Mock the upload method to return a storage path
+    mock_supabase_client.storage.from_().upload.return_value = MagicMock(
+        data={'path': 'invoices/test-user-uuid-123/test-image.png'}
+    )
+
+    # Set the return value to the mock client
+    mock.return_value = mock_supabase_client
+    return mock
 
 
 @pytest.fixture
-def mock_upload_invoice_image():
+def mock_upload_invoice_image(_patched_invoice_dependencies):
     """Mock upload_invoice_image to return a storage path."""
-    with patch("backend.routes.invoices.upload_invoice_image") as mock:
-        async def mock_upload(*args, **kwargs):
-            return "invoices/test-user-uuid-123/test-image.png"
-        mock.side_effect = mock_upload
-        yield mock
+    mock = _patched_invoice_dependencies["upload_invoice_image"]
+    mock.reset_mock()
+    mock.return_value = "invoices/test-user-uuid-123/test-image.png"
+    return mock
+
+
+def _gemini_response(mock_output):
+    """Build an object that mimics Gemini's response structure."""
+    return type('MockResponse', (), {
+        'text': json.dumps(mock_output),
+        'candidates': [
+            type('Candidate', (), {
+                'content': type('Content', (), {
+                    'parts': []  # No function calls, just final response
+                })()
+            })()
+        ]
+    })()
 
 
 @pytest.fixture
-def mock_invoice_agent_success():
+def mock_invoice_agent_success(_patched_invoice_dependencies):
     """Mock Gemini API to return successful DRAFT response."""
     mock_output: InvoiceAgentOutput = {
         "status": "DRAFT",
@@ -152,31 +205,14 @@ def mock_invoice_agent_success():
     }
     
     # Mock the Gemini API client instead of run_invoice_agent directly
-    with patch("backend.agents.invoice.agent.genai.Client") as mock_client_class:
-        # Create a mock client instance
-        mock_client = mock_client_class.return_value
-        
-        # Create a mock response object that mimics Gemini's response structure
-        import json
-        mock_response = type('MockResponse', (), {
-            'text': json.dumps(mock_output),
-            'candidates': [
-                type('Candidate', (), {
-                    'content': type('Content', (), {
-                        'parts': []  # No function calls, just final response
-                    })()
-                })()
-            ]
-        })()
-        
-        # Configure the mock to return this response
-        mock_client.models.generate_content.return_value = mock_response
-        
-        yield mock_client_class
+    mock_client_class = _patched_invoice_dependencies["genai_client"]
+    mock_client_class.reset_mock()
+    mock_client_class.return_value.models.generate_content.return_value = _gemini_response(mock_output)
+    return mock_client_class
 
 
 @pytest.fixture
-def mock_invoice_agent_invalid():
+def mock_invoice_agent_invalid(_patched_invoice_dependencies):
     """Mock Gemini API to return INVALID_IMAGE response."""
     mock_output: InvoiceAgentOutput = {
         "status": "INVALID_IMAGE",
@@ -191,35 +227,24 @@ def mock_invoice_agent_invalid():
     }
     
     # Mock the Gemini API client
-    with patch("backend.agents.invoice.agent.genai.Client") as mock_client_class:
-        mock_client = mock_client_class.return_value
-        
-        import json
-        mock_response = type('MockResponse', (), {
-            'text': json.dumps(mock_output),
-            'candidates': [
-                type('Candidate', (), {
-                    'content': type('Content', (), {
-                        'parts': []
-                    })()
-                })()
-            ]
-        })()
-        
-        mock_client.models.generate_content.return_value = mock_response
-        
-        yield mock_client_class
+    mock_client_class = _patched_invoice_dependencies["genai_client"]
+    mock_client_class.reset_mock()
+    mock_client_class.return_value.models.generate_content.return_value = _gemini_response(mock_output)
+    return mock_client_class
 
 
-@pytest.fixture
+# 100x100 solid red RGB PNG, pre-encoded so tests never import PIL
+_VALID_PNG_BYTES = base64.b64decode(
+    b"iVBORw0KGgoAAAANSUhEUgAAAGQAAABkCAIAAAD/gAIDAAAAkElEQVR42u3QMQ0AAAjAsPk3DRb4eJpUQZviSIEsWbJkyUKB"
+    b"LFmyZMlCgSxZsmTJQoEsWbJkyUKBLFmyZMlCgSxZsmTJQoEsWbJkyUKBLFmyZMlCgSxZsmTJQoEsWbJkyUKBLFmyZMlCgSxZ"
+    b"smTJQoEsWbJkyUKBLFmyZMlCgSxZsmTJQoEsWbJkyUKBLFnvFp4t6yugc3LNAAAAAElFTkSuQmCC"
+)
+
+
+@pytest.fixture(scope="session")
 def valid_image_bytes():
-    """Create a valid test image file in memory."""
-    # Create a simple 100x100 RGB image
-    img = Image.new("RGB", (100, 100), color="red")
-    img_bytes = io.BytesIO()
-    img.save(img_bytes, format="PNG")
-    img_bytes.seek(0)
-    return img_bytes.getvalue()
+    """Valid test image file, encoded once per session."""
+    return _VALID_PNG_BYTES
 
 
 class TestInvoiceOCREndpoint:
@@ -348,14 +373,16 @@ class TestInvoiceOCREndpoint:
         
         Tests file size validation (DoS prevention).
         """
-        # Create a fake 11MB file
-        large_file = b"x" * (11 * 1024 * 1024)
-        
-        response = client.post(
-            "/invoices/ocr",
-            headers={"Authorization": "Bearer fake-test-token"},
-            files={"image": ("huge.png", large_file, "image/png")}
-        )
+        # Create a sparse 11MB file; httpx streams it in chunks, so the test
+        # never holds the whole payload in a Python bytes object
+        with tempfile.TemporaryFile() as large_file:
+            large_file.truncate(11 * 1024 * 1024)
+
+            response = client.post(
+                "/invoices/ocr",
+                headers={"Authorization": "Bearer fake-test-token"},
+                files={"image": ("huge.png", large_file, "image/png")}
+            )
         
         # Should return 400 Bad Request
         assert response.status_code == 400
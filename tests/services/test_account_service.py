@@ -0,0 +1,153 @@
+"""
+Tests for account service helpers.
+
+Covers coalescing and background scheduling of balance recomputes, and
+the query chain built by update_account.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from postgrest import SyncPostgrestClient, SyncQueryRequestBuilder
+
+from backend.config import settings
+from backend.services.account_service import (
+    _background_recomputes,
+    _pending_recomputes,
+    drain_background_recomputes,
+    recompute_balances_in_background,
+    schedule_account_recompute,
+    update_account,
+)
+
+
+class TestScheduleAccountRecompute:
+    """Test the per-account recompute coalescer."""
+
+    @pytest.fixture(autouse=True)
+    def short_debounce(self, monkeypatch):
+        monkeypatch.setattr(settings, "BALANCE_RECOMPUTE_DEBOUNCE_MS", 10)
+        _pending_recomputes.clear()
+        yield
+        _pending_recomputes.clear()
+
+    @pytest.mark.asyncio
+    async def test_burst_for_same_account_runs_once(self):
+        client = MagicMock()
+        with patch(
+            "backend.services.account_service.recompute_account_balance",
+            new=AsyncMock(return_value=42.0),
+        ) as mock_recompute:
+            balances = await asyncio.gather(*(
+                schedule_account_recompute(client, "user-1", "acct-1") for _ in range(5)
+            ))
+
+        assert balances == [42.0] * 5
+        mock_recompute.assert_awaited_once_with(client, "user-1", "acct-1")
+        assert not _pending_recomputes
+
+    @pytest.mark.asyncio
+    async def test_different_accounts_are_not_coalesced(self):
+        client = MagicMock()
+        with patch(
+            "backend.services.account_service.recompute_account_balance",
+            new=AsyncMock(return_value=0.0),
+        ) as mock_recompute:
+            await asyncio.gather(
+                schedule_account_recompute(client, "user-1", "acct-1"),
+                schedule_account_recompute(client, "user-1", "acct-2"),
+            )
+
+        assert mock_recompute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_request_after_window_closes_runs_again(self):
+        client = MagicMock()
+        with patch(
+            "backend.services.account_service.recompute_account_balance",
+            new=AsyncMock(return_value=0.0),
+        ) as mock_recompute:
+            await schedule_account_recompute(client, "user-1", "acct-1")
+            await schedule_account_recompute(client, "user-1", "acct-1")
+
+        assert mock_recompute.await_count == 2
+
+
+class TestRecomputeBalancesInBackground:
+    """Test fire-and-forget balance recomputes."""
+
+    @pytest.mark.asyncio
+    async def test_schedules_each_distinct_account_once(self):
+        client = MagicMock()
+        with patch(
+            "backend.services.account_service.schedule_account_recompute",
+            new=AsyncMock(return_value=0.0),
+        ) as mock_schedule:
+            recompute_balances_in_background(client, "user-1", "acct-1", None, "acct-1", "acct-2")
+            await asyncio.gather(*_background_recomputes)
+
+        awaited = sorted(call.args[2] for call in mock_schedule.await_args_list)
+        assert awaited == ["acct-1", "acct-2"]
+        assert not _background_recomputes
+
+    @pytest.mark.asyncio
+    async def test_failures_are_logged_not_raised(self, caplog):
+        client = MagicMock()
+        with patch(
+            "backend.services.account_service.schedule_account_recompute",
+            new=AsyncMock(side_effect=Exception("boom")),
+        ):
+            recompute_balances_in_background(client, "user-1", "acct-1")
+            await asyncio.gather(*_background_recomputes)
+
+        assert "Background balance recompute failed for account acct-1" in caplog.text
+
+    def test_no_accounts_schedules_nothing(self):
+        recompute_balances_in_background(MagicMock(), "user-1", None)
+        assert not _background_recomputes
+
+
+class TestDrainBackgroundRecomputes:
+    """Test waiting out background recomputes at shutdown."""
+
+    @pytest.mark.asyncio
+    async def test_running_recomputes_are_awaited(self):
+        with patch(
+            "backend.services.account_service.schedule_account_recompute",
+            new=AsyncMock(return_value=0.0),
+        ) as mock_schedule:
+            recompute_balances_in_background(MagicMock(), "user-1", "acct-1")
+            await drain_background_recomputes(1.0)
+
+        mock_schedule.assert_awaited_once()
+        assert not _background_recomputes
+
+    @pytest.mark.asyncio
+    async def test_recomputes_past_the_timeout_are_cancelled(self, caplog):
+        async def never_finishes(*args):
+            await asyncio.Event().wait()
+
+        with patch("backend.services.account_service.schedule_account_recompute", new=never_finishes):
+            recompute_balances_in_background(MagicMock(), "user-1", "acct-1")
+            await drain_background_recomputes(0.01)
+
+        assert not _background_recomputes
+        assert "Cancelling 1 background balance recomputes at shutdown" in caplog.text
+
+
+class TestUpdateAccount:
+    """Test update_account against a real postgrest query builder."""
+
+    @pytest.mark.asyncio
+    async def test_update_chain_is_valid_postgrest(self):
+        client = MagicMock()
+        client.table.side_effect = SyncPostgrestClient("http://localhost:54321").from_
+        row = {"id": "acct-1", "name": "Renamed"}
+        with patch.object(
+            SyncQueryRequestBuilder, "execute", return_value=MagicMock(data=[row])
+        ) as mock_execute:
+            result = await update_account(client, "user-1", "acct-1", name="Renamed")
+
+        assert result == row
+        mock_execute.assert_called_once()
@@ -0,0 +1,39 @@
+"""
+Tests for category service helpers.
+
+Covers the per-process system category ID cache.
+"""
+
+import pytest
+
+from backend.services.category_service import _system_category_ids, get_system_category_id
+
+
+class TestGetSystemCategoryId:
+    """Test system category resolution and caching."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        _system_category_ids.clear()
+        yield
+        _system_category_ids.clear()
+
+    @pytest.mark.asyncio
+    async def test_second_lookup_is_served_from_cache(self, chain_client):
+        client, query = chain_client([{"id": "cat-initial"}])
+
+        first = await get_system_category_id(client, "initial_balance", "income")
+        second = await get_system_category_id(client, "initial_balance", "income")
+
+        assert first == second == "cat-initial"
+        query.execute.assert_called_once()
+        query.is_.assert_called_once_with("user_id", "null")
+
+    @pytest.mark.asyncio
+    async def test_missing_category_is_not_cached(self, chain_client):
+        client, query = chain_client([])
+
+        assert await get_system_category_id(client, "initial_balance", "income") is None
+        assert await get_system_category_id(client, "initial_balance", "income") is None
+
+        assert query.execute.call_count == 2
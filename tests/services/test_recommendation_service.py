@@ -21,6 +21,8 @@ from unittest.mock import MagicMock, patch, AsyncMock
 from typing import Dict, Any
 
 from backend.services.recommendation_service import (
+    parse_recommendation_response,
+    parse_recommendation_text,
     query_recommendations,
     _extract_language_from_locale,
     _validate_llm_response,
@@ -580,7 +582,7 @@ class TestRecommendationServiceIntegration:
             mock_response.candidates[0].grounding_metadata = None
             
             mock_gemini = MagicMock()
-            mock_gemini.models.generate_content.return_value = mock_response
+            mock_gemini.aio.models.generate_content = AsyncMock(return_value=mock_response)
             mock_client.return_value = mock_gemini
             
             import json
@@ -611,7 +613,7 @@ class TestRecommendationServiceIntegration:
             mock_response.candidates[0].grounding_metadata = None
             
             mock_gemini = MagicMock()
-            mock_gemini.models.generate_content.return_value = mock_response
+            mock_gemini.aio.models.generate_content = AsyncMock(return_value=mock_response)
             mock_client.return_value = mock_gemini
             
             result = await query_recommendations(
@@ -662,6 +664,41 @@ class TestRecommendationServiceIntegration:
             assert result.status == "NO_VALID_OPTION"  # Because client is None
 
 
+class TestParseRecommendationResponse:
+    """Tests for parsing a raw Gemini response (shared by live and batch calls)."""
+
+    def test_parses_json_inside_code_block(self, mock_gemini_ok_response):
+        import json
+        response = MagicMock()
+        response.candidates = [MagicMock()]
+        response.candidates[0].grounding_metadata = None
+        response.candidates[0].content.parts = [
+            MagicMock(text="Here you go:\n```json\n" + json.dumps(mock_gemini_ok_response) + "\n```")
+        ]
+
+        result = parse_recommendation_response(response)
+
+        assert isinstance(result, RecommendationQueryResponseOK)
+        assert len(result.results_for_user) == 2
+
+    def test_empty_candidates_is_no_valid_option(self):
+        response = MagicMock()
+        response.candidates = []
+
+        result = parse_recommendation_response(response)
+
+        assert isinstance(result, RecommendationQueryResponseNoValidOption)
+
+    def test_parses_accumulated_stream_text(self, mock_gemini_ok_response):
+        import json
+        text = json.dumps(mock_gemini_ok_response)
+
+        result = parse_recommendation_text(text)
+
+        assert isinstance(result, RecommendationQueryResponseOK)
+        assert result.results_for_user[0].product_title == "Test Laptop 15 inch"
+
+
 # =============================================================================
 # REAL WORLD QUERY TESTS (PARAMETERIZED)
 # =============================================================================
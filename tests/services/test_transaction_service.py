@@ -0,0 +1,150 @@
+"""
+Tests for transaction persistence service helpers.
+
+Covers the query-building fast paths and pagination of get_user_transactions.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services.transaction_service import (
+    MAX_LIST_LIMIT,
+    _compile_filters,
+    _decode_cursor,
+    _encode_cursor,
+    _first,
+    get_user_transactions,
+    update_transaction,
+)
+
+
+class TestFirst:
+    """Test the first-row helper."""
+
+    def test_returns_first_row(self):
+        result = MagicMock(data=[{"id": "a"}, {"id": "b"}])
+        assert _first(result) == {"id": "a"}
+
+    def test_returns_none_for_empty_or_missing_data(self):
+        assert _first(MagicMock(data=[])) is None
+        assert _first(MagicMock(data=None)) is None
+
+
+class TestCompileFilters:
+    """Test the cached filter appliers."""
+
+    def test_same_shape_reuses_compiled_applier(self):
+        first = _compile_filters(frozenset({"account_id", "from_date"}))
+        second = _compile_filters(frozenset({"from_date", "account_id"}))
+        assert first is second
+
+    def test_applies_only_present_filters_in_order(self):
+        query = MagicMock()
+        query.eq.return_value = query
+        query.gte.return_value = query
+        query.lte.return_value = query
+
+        values = {"category_id": "cat-1", "from_date": "2025-01-01", "to_date": "2025-01-31"}
+        _compile_filters(frozenset(values))(query, values)
+
+        query.eq.assert_called_once_with("category_id", "cat-1")
+        query.gte.assert_called_once_with("date", "2025-01-01")
+        query.lte.assert_called_once_with("date", "2025-01-31")
+
+    def test_unfiltered_returns_query_untouched(self):
+        query = MagicMock()
+        assert _compile_filters(frozenset())(query, {}) is query
+        query.eq.assert_not_called()
+
+
+_TXN_ID = "3f2b8c1e-5d4a-4e6f-9a7b-1c2d3e4f5a6b"
+
+
+class TestCursor:
+    """Test keyset cursor encoding."""
+
+    def test_round_trip(self):
+        row = {"id": _TXN_ID, "date": "2025-10-30T14:32:00-06:00"}
+        assert _decode_cursor(_encode_cursor("date", row), "date") == (row["date"], _TXN_ID)
+
+    def test_rejects_cursor_for_other_sort_field(self):
+        cursor = _encode_cursor("amount", {"id": _TXN_ID, "amount": 10})
+        with pytest.raises(ValueError):
+            _decode_cursor(cursor, "date")
+
+    def test_rejects_garbage(self):
+        with pytest.raises(ValueError):
+            _decode_cursor("not-a-cursor", "date")
+
+    @pytest.mark.parametrize("sort_by,row", [
+        ("date", {"id": "1),user_id.neq.x", "date": "2025-10-30T14:32:00-06:00"}),
+        ("date", {"id": _TXN_ID, "date": '2025-10-30",amount.gt."0'}),
+        ("amount", {"id": _TXN_ID, "amount": "10,id.gt.0"}),
+        ("amount", {"id": _TXN_ID, "amount": "NaN"}),
+    ])
+    def test_rejects_values_that_do_not_match_their_types(self, sort_by, row):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            _decode_cursor(_encode_cursor(sort_by, row), sort_by)
+
+
+class TestGetUserTransactionsPage:
+    """Test the paged envelope returned by get_user_transactions."""
+
+    @pytest.mark.asyncio
+    async def test_fetches_one_extra_row_and_sets_cursor(self, chain_client):
+        rows = [{"id": f"00000000-0000-0000-0000-00000000000{i}", "date": f"2025-01-0{i}"} for i in (3, 2, 1)]
+        client, query = chain_client(rows)
+
+        page = await get_user_transactions(client, "user-1", limit=2)
+
+        query.range.assert_called_once_with(0, 2)
+        assert [r["id"] for r in page["items"]] == [rows[0]["id"], rows[1]["id"]]
+        assert page["has_more"] is True
+        assert _decode_cursor(page["next_cursor"], "date") == ("2025-01-02", rows[1]["id"])
+        assert "total" not in page
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, chain_client):
+        client, _ = chain_client([{"id": "t1", "date": "2025-01-01"}])
+
+        page = await get_user_transactions(client, "user-1", limit=2)
+
+        assert page["has_more"] is False
+        assert page["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_clamps_limit_and_offset(self, chain_client):
+        client, query = chain_client([])
+
+        await get_user_transactions(client, "user-1", limit=1_000_000, offset=-5)
+
+        query.range.assert_called_once_with(0, MAX_LIST_LIMIT)
+
+
+class TestUpdateTransaction:
+    """Test the update fast paths."""
+
+    @pytest.mark.asyncio
+    async def test_no_fields_raises_before_db_call(self):
+        client = MagicMock()
+
+        with pytest.raises(ValueError):
+            await update_transaction(client, "user-1", "txn-1")
+
+        client.table.assert_not_called()
+        client.rpc.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_description_only_skips_prefetch_and_recompute(self):
+        client = MagicMock()
+        query = client.table.return_value
+        query.update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[{"id": "txn-1", "description": "new"}]
+        )
+
+        updated = await update_transaction(client, "user-1", "txn-1", description="new")
+
+        assert updated == {"id": "txn-1", "description": "new"}
+        query.select.assert_not_called()
+        client.rpc.assert_not_called()
@@ -0,0 +1,134 @@
+"""
+Tests for transfer service RPC handling.
+
+Covers how RPC results and RPC validation errors surface to callers, and
+the no-op update_transfer read path.
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from postgrest.exceptions import APIError
+
+from backend.services.transfer_service import (
+    IdempotencyConflictError,
+    create_transfer,
+    update_transfer,
+)
+
+_TXN_ID = "3f2b8c1e-5d4a-4e6f-9a7b-1c2d3e4f5a6b"
+_PAIRED_ID = "7a1d9e2c-4b3f-4c8a-9d6e-2f1a3b4c5d6e"
+
+
+def _call(**overrides):
+    kwargs = {
+        "supabase_client": MagicMock(),
+        "user_id": "user-1",
+        "from_account_id": "acct-from",
+        "to_account_id": "acct-to",
+        "amount": Decimal("50.10"),
+        "date": "2025-11-15T14:30:00Z",
+    }
+    kwargs.update(overrides)
+    return create_transfer(**kwargs)
+
+
+class TestCreateTransfer:
+    """Test create_transfer against mocked RPC responses."""
+
+    @pytest.mark.asyncio
+    async def test_returns_both_rows_from_rpc(self):
+        outgoing = {"id": "out-1", "flow_type": "outcome"}
+        incoming = {"id": "in-1", "flow_type": "income"}
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(return_value=[{"outgoing": outgoing, "incoming": incoming}]),
+        ) as mock_rpc:
+            result = await _call()
+
+        assert result == (outgoing, incoming)
+        assert mock_rpc.await_args.args[1] == "create_transfer"
+        assert mock_rpc.await_args.args[2]["p_from_account_id"] == "acct-from"
+        assert mock_rpc.await_args.args[2]["p_amount"] == "50.10"
+
+    @pytest.mark.asyncio
+    async def test_rpc_validation_error_becomes_value_error(self):
+        error = APIError({"message": "Source account not found or not accessible", "code": "P0001"})
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(side_effect=error),
+        ):
+            with pytest.raises(ValueError, match="Source account not found"):
+                await _call()
+
+    @pytest.mark.asyncio
+    async def test_idempotency_conflict_has_its_own_error(self):
+        error = APIError({"message": "Idempotency key k-1 was already used for a different transfer", "code": "KS409"})
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(side_effect=error),
+        ):
+            with pytest.raises(IdempotencyConflictError, match="already used"):
+                await _call(idempotency_key="k-1")
+
+    @pytest.mark.asyncio
+    async def test_other_rpc_errors_propagate(self):
+        error = APIError({"message": "connection reset", "code": "08006"})
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(side_effect=error),
+        ):
+            with pytest.raises(APIError):
+                await _call()
+
+    @pytest.mark.asyncio
+    async def test_malformed_payload_is_not_a_validation_error(self):
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(return_value=[{"outgoing": {"id": "out-1"}}]),
+        ):
+            with pytest.raises(Exception, match="unexpected payload") as exc_info:
+                await _call()
+
+        assert not isinstance(exc_info.value, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_logs_structured_event(self, caplog):
+        outgoing = {"id": "out-1", "flow_type": "outcome"}
+        incoming = {"id": "in-1", "flow_type": "income"}
+        with patch(
+            "backend.services.transfer_service.execute_rpc",
+            new=AsyncMock(return_value=[{"outgoing": outgoing, "incoming": incoming}]),
+        ), caplog.at_level("INFO", logger="backend.services.transfer_service"):
+            await _call()
+
+        record = next(r for r in caplog.records if getattr(r, "event", None) == "transfer.created")
+        assert (record.user_id, record.outgoing_id, record.incoming_id) == ("user-1", "out-1", "in-1")
+
+
+class TestUpdateTransfer:
+    """Test update_transfer calls that change nothing."""
+
+    @pytest.mark.asyncio
+    async def test_no_fields_returns_current_pair_without_rpc(self):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.or_.return_value
+        query.execute.return_value = MagicMock(data=[
+            {"id": _PAIRED_ID, "paired_transaction_id": _TXN_ID},
+            {"id": _TXN_ID, "paired_transaction_id": _PAIRED_ID},
+        ])
+
+        transaction, paired = await update_transfer(client, "user-1", _TXN_ID)
+
+        assert (transaction["id"], paired["id"]) == (_TXN_ID, _PAIRED_ID)
+        client.rpc.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_fields_rejects_non_uuid_id_before_querying(self):
+        client = MagicMock()
+
+        with pytest.raises(ValueError, match="not found"):
+            await update_transfer(client, "user-1", f"{_TXN_ID},user_id.neq.x")
+
+        client.table.assert_not_called()
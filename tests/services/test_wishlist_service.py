@@ -0,0 +1,167 @@
+"""
+Tests for wishlist service helpers.
+
+Covers query shapes that replace multiple round trips with one.
+"""
+
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services.wishlist_service import (
+    _encode_cursor,
+    _normalize_numeric_12_2,
+    create_wishlist,
+    delete_wishlist,
+    get_user_wishlists,
+    get_wishlist_with_items,
+    update_wishlist,
+)
+
+
+class TestGetWishlistWithItems:
+    """Test the embedded wishlist + items lookup."""
+
+    @pytest.mark.asyncio
+    async def test_returns_wishlist_and_items_from_one_query(self, chain_client):
+        items = [{"id": "item-1"}, {"id": "item-2"}]
+        client, query = chain_client([{"id": "wl-1", "goal_title": "Laptop", "wishlist_item": items}])
+
+        wishlist, found_items = await get_wishlist_with_items(client, "user-1", "wl-1")
+
+        assert wishlist == {"id": "wl-1", "goal_title": "Laptop"}
+        assert found_items == items
+        query.select.assert_called_once_with("*, wishlist_item(*)")
+        query.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_wishlist_returns_none(self, chain_client):
+        client, _ = chain_client([])
+
+        assert await get_wishlist_with_items(client, "user-1", "wl-1") is None
+
+
+class TestGetUserWishlists:
+    """Test keyset pagination of the wishlist list."""
+
+    @pytest.mark.asyncio
+    async def test_next_cursor_resumes_after_last_row(self, chain_client):
+        rows = [
+            {"id": f"00000000-0000-0000-0000-00000000000{i}", "created_at": f"2025-11-0{i}T10:00:00+00:00"}
+            for i in (3, 2, 1)
+        ]
+        client, query = chain_client(rows)
+
+        page = await get_user_wishlists(client, "user-1", limit=2)
+
+        assert [w["id"] for w in page["items"]] == [rows[0]["id"], rows[1]["id"]]
+        assert page["has_more"] is True
+        query.range.assert_called_once_with(0, 2)
+
+        client, query = chain_client(rows[2:])
+        next_page = await get_user_wishlists(client, "user-1", limit=2, offset=10, cursor=page["next_cursor"])
+
+        assert next_page["has_more"] is False
+        assert next_page["next_cursor"] is None
+        query.range.assert_called_once_with(0, 2)
+        filter_arg = query.or_.call_args.args[0]
+        assert '"2025-11-02T10:00:00+00:00"' in filter_arg and f'id.lt."{rows[1]["id"]}"' in filter_arg
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor_is_value_error(self, chain_client):
+        client, _ = chain_client([])
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await get_user_wishlists(client, "user-1", cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("row", [
+        {"id": "1),user_id.neq.x", "created_at": "2025-11-02T10:00:00+00:00"},
+        {"id": "00000000-0000-0000-0000-000000000002", "created_at": '2025-11-02",id.gt."0'},
+        {"id": None, "created_at": "2025-11-02T10:00:00+00:00"},
+    ])
+    async def test_cursor_values_must_be_timestamp_and_uuid(self, row, chain_client):
+        client, query = chain_client([])
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await get_user_wishlists(client, "user-1", cursor=_encode_cursor(row))
+
+        query.or_.assert_not_called()
+
+
+class TestNormalizeNumeric122:
+    """Test NUMERIC(12,2) normalization fast paths."""
+
+    @pytest.mark.parametrize("value, expected", [
+        (Decimal("12.5"), "12.50"),
+        (Decimal("12.345"), "12.35"),
+        (Decimal("1E+3"), "1000.00"),
+        ("7999.995", "8000.00"),
+        (12.1, "12.10"),
+        (100, "100.00"),
+    ])
+    def test_normalizes_to_two_decimals(self, value, expected):
+        assert _normalize_numeric_12_2(value) == expected
+
+    @pytest.mark.parametrize("value", [Decimal("1E+11"), "1E+20", "99999999999.999", "abc"])
+    def test_rejects_out_of_range_or_non_numeric(self, value):
+        with pytest.raises(ValueError):
+            _normalize_numeric_12_2(value)
+
+
+class TestDeleteWishlist:
+    """Test the single-request wishlist delete."""
+
+    @pytest.mark.asyncio
+    async def test_reports_item_count_from_deleted_row(self, chain_client):
+        client, query = chain_client([{"id": "wl-1", "item_count": 3}])
+
+        assert await delete_wishlist(client, "user-1", "wl-1") == 3
+
+        client.table.assert_called_once_with("wishlist")
+        query.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_wishlist_raises(self, chain_client):
+        client, _ = chain_client([])
+
+        with pytest.raises(Exception, match="not found or access denied"):
+            await delete_wishlist(client, "user-1", "wl-1")
+
+
+class TestUpdateWishlist:
+    """Test the update_wishlist column allow-list."""
+
+    @pytest.mark.asyncio
+    async def test_only_allow_listed_fields_are_written(self, chain_client):
+        client, query = chain_client([{"id": "wl-1", "goal_title": "Laptop"}])
+
+        await update_wishlist(
+            client, "user-1", "wl-1",
+            goal_title="Laptop", id="wl-2", item_count=9, created_at="2020-01-01T00:00:00+00:00",
+        )
+
+        query.update.assert_called_once_with({"goal_title": "Laptop"})
+
+    @pytest.mark.asyncio
+    async def test_no_updatable_fields_skips_the_write(self, chain_client):
+        client, query = chain_client([{"id": "wl-1"}])
+
+        assert await update_wishlist(client, "user-1", "wl-1", item_count=9) == {"id": "wl-1"}
+
+        query.update.assert_not_called()
+
+
+class TestCreateWishlist:
+    """Test create_wishlist input bounds."""
+
+    @pytest.mark.asyncio
+    async def test_more_than_three_items_is_rejected_before_rpc(self):
+        client = MagicMock()
+        items = [{"product_title": f"Item {i}"} for i in range(4)]
+
+        with pytest.raises(ValueError, match="at most 3"):
+            await create_wishlist(client, "user-1", "Laptop", Decimal("100"), "GTQ", selected_items=items)
+
+        client.rpc.assert_not_called()
@@ -121,7 +121,7 @@ class TestListTransactions:
     @patch("backend.routes.transactions.get_user_transactions")
     def test_list_transactions_success(self, mock_get_txns, mock_auth, mock_get_supabase_client, mock_transaction):
         """Test successful transaction listing with all database fields."""
-        mock_get_txns.return_value = [mock_transaction]
+        mock_get_txns.return_value = {"items": [mock_transaction], "next_cursor": None, "has_more": False}
         
         response = client.get("/transactions")
         
@@ -142,7 +142,7 @@ class TestListTransactions:
     @patch("backend.routes.transactions.get_user_transactions")
     def test_list_transactions_with_filters(self, mock_get_txns, mock_auth, mock_get_supabase_client, mock_transaction):
         """Test transaction listing with query filters."""
-        mock_get_txns.return_value = [mock_transaction]
+        mock_get_txns.return_value = {"items": [mock_transaction], "next_cursor": None, "has_more": False}
         
         response = client.get(
             "/transactions?limit=10&offset=0&flow_type=outcome&account_id=account-456"
@@ -157,7 +157,7 @@ class TestListTransactions:
     @patch("backend.routes.transactions.get_user_transactions")
     def test_list_transactions_empty(self, mock_get_txns, mock_auth, mock_get_supabase_client):
         """Test transaction listing returns empty list."""
-        mock_get_txns.return_value = []
+        mock_get_txns.return_value = {"items": [], "next_cursor": None, "has_more": False}
         
         response = client.get("/transactions")
         
@@ -235,6 +235,27 @@ class TestUpdateTransaction:
         assert data["transaction"]["embedding"] is None
 
 
+    @patch("backend.routes.transactions.update_transaction")
+    def test_update_transfer_transaction_rejected(self, mock_update_txn, mock_auth, mock_get_supabase_client):
+        """Test that transfer legs are rejected using the embedded category key."""
+        mock_supabase = mock_get_supabase_client.return_value
+        mock_result = MagicMock()
+        mock_result.data = [{
+            "id": "transaction-123",
+            "paired_transaction_id": "transaction-456",
+            "category_id": "category-transfer",
+            "category": {"key": "transfer"}
+        }]
+        mock_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value.execute.return_value = mock_result
+
+        response = client.patch("/transactions/transaction-123", json={"amount": 10.00})
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "cannot_edit_transfer"
+        mock_supabase.table.assert_called_once_with("transaction")
+        mock_update_txn.assert_not_called()
+
+
     @patch("backend.routes.transactions.update_transaction")
     def test_update_transaction_not_found(self, mock_update_txn, mock_auth, mock_get_supabase_client):
         """Test transaction update returns 404 when not found."""
@@ -251,6 +272,17 @@ class TestUpdateTransaction:
         assert data["detail"]["error"] == "not_found"
 
 
+    @patch("backend.routes.transactions.update_transaction")
+    def test_update_transaction_empty_body_returns_400(self, mock_update_txn, mock_auth, mock_get_supabase_client):
+        """Test that an update with no fields is rejected before any DB call."""
+        response = client.patch("/transactions/transaction-123", json={})
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "invalid_request"
+        mock_get_supabase_client.assert_not_called()
+        mock_update_txn.assert_not_called()
+
+
 class TestDeleteTransaction:
     """Tests for DELETE /transactions/{transaction_id}"""
     
@@ -285,7 +317,7 @@ class TestTransactionAllFields:
     @patch("backend.routes.transactions.get_user_transactions")
     def test_transactions_include_all_fields(self, mock_get_txns, mock_auth, mock_get_supabase_client, mock_transaction):
         """Test that all transaction responses include all database fields."""
-        mock_get_txns.return_value = [mock_transaction]
+        mock_get_txns.return_value = {"items": [mock_transaction], "next_cursor": None, "has_more": False}
         
         response = client.get("/transactions")
         data = response.json()
@@ -372,3 +404,31 @@ class TestTransactionWithInvoice:
         assert data["embedding"] is None
 
 
+
+
+class TestListTransactionsPagination:
+    """Tests for cursor pagination metadata on GET /transactions"""
+
+    @patch("backend.routes.transactions.get_user_transactions")
+    def test_list_transactions_returns_next_cursor(self, mock_get_txns, mock_auth, mock_get_supabase_client, mock_transaction):
+        """Test that has_more and next_cursor are passed through from the service."""
+        mock_get_txns.return_value = {"items": [mock_transaction], "next_cursor": "abc", "has_more": True}
+
+        response = client.get("/transactions?limit=1&cursor=prev")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["has_more"] is True
+        assert data["next_cursor"] == "abc"
+        assert data["total"] is None
+        assert mock_get_txns.call_args.kwargs["cursor"] == "prev"
+
+    @patch("backend.routes.transactions.get_user_transactions")
+    def test_list_transactions_invalid_cursor_returns_400(self, mock_get_txns, mock_auth, mock_get_supabase_client):
+        """Test that an invalid cursor is rejected with 400."""
+        mock_get_txns.side_effect = ValueError("Invalid cursor")
+
+        response = client.get("/transactions?cursor=garbage")
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "invalid_request"
@@ -11,11 +11,14 @@ Tests cover:
 - Security (RLS enforcement, cannot transfer between different users)
 """
 
+from decimal import Decimal
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 from backend.main import app
 from backend.auth.dependencies import get_authenticated_user, AuthenticatedUser
+from backend.services import transfer_service
 
 client = TestClient(app)
 
@@ -104,6 +107,52 @@ class TestCreateTransfer:
         assert data["transactions"][0]["amount"] == 500.00
         assert data["message"] == "Transfer created successfully"
     
+    @patch("backend.routes.transfers.transfer_service.create_transfer")
+    def test_create_transfer_forwards_idempotency_key(self, mock_create, mock_auth, mock_get_supabase_client):
+        """Test the Idempotency-Key header is passed to the service."""
+        outgoing_txn = {"id": "txn-out-uuid", "user_id": "test-user-id", "account_id": "acct-from-uuid",
+                        "category_id": "cat-transfer-uuid", "flow_type": "outcome", "amount": 500.00,
+                        "date": "2025-11-03", "paired_transaction_id": "txn-in-uuid",
+                        "created_at": "2025-11-03T10:00:00Z", "updated_at": "2025-11-03T10:00:00Z"}
+        incoming_txn = {**outgoing_txn, "id": "txn-in-uuid", "account_id": "acct-to-uuid",
+                        "flow_type": "income", "paired_transaction_id": "txn-out-uuid"}
+        mock_create.return_value = (outgoing_txn, incoming_txn)
+
+        response = client.post(
+            "/transfers",
+            json={
+                "from_account_id": "acct-from-uuid",
+                "to_account_id": "acct-to-uuid",
+                "amount": 500.00,
+                "date": "2025-11-03"
+            },
+            headers={"Idempotency-Key": "retry-key-1"}
+        )
+
+        assert response.status_code == 201
+        assert mock_create.call_args.kwargs["idempotency_key"] == "retry-key-1"
+
+    @patch("backend.routes.transfers.transfer_service.create_transfer")
+    def test_create_transfer_idempotency_conflict_returns_409(self, mock_create, mock_auth, mock_get_supabase_client):
+        """Test a key reused for a different transfer is a conflict, not a replay."""
+        mock_create.side_effect = transfer_service.IdempotencyConflictError(
+            "Idempotency key retry-key-1 was already used for a different transfer"
+        )
+
+        response = client.post(
+            "/transfers",
+            json={
+                "from_account_id": "acct-from-uuid",
+                "to_account_id": "acct-to-uuid",
+                "amount": 750.00,
+                "date": "2025-11-03"
+            },
+            headers={"Idempotency-Key": "retry-key-1"}
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["error"] == "idempotency_conflict"
+
     @patch("backend.routes.transfers.transfer_service.create_transfer")
     def test_create_transfer_invalid_accounts(self, mock_create, mock_auth, mock_get_supabase_client):
         """Test transfer with accounts that don't belong to user."""
@@ -150,6 +199,89 @@ class TestCreateTransfer:
         
         assert response.status_code == 422  # Validation error
 
+    @patch("backend.routes.transfers.transfer_service.create_transfer")
+    def test_create_transfer_rounds_amount_to_cents(self, mock_create, mock_auth, mock_get_supabase_client):
+        """Test an amount with more than 2 decimals is rounded half-up, not rejected."""
+        mock_create.side_effect = ValueError("stop after validation")
+
+        response = client.post(
+            "/transfers",
+            json={
+                "from_account_id": "acct-from-uuid",
+                "to_account_id": "acct-to-uuid",
+                "amount": 10.005,
+                "date": "2025-11-03"
+            }
+        )
+
+        assert response.status_code == 400
+        assert mock_create.call_args.kwargs["amount"] == Decimal("10.01")
+
+
+class TestCreateTransfersBulk:
+    """Tests for POST /transfers/bulk"""
+
+    @patch("backend.routes.transfers.transfer_service.create_transfers_bulk")
+    def test_create_transfers_bulk_success(self, mock_bulk, mock_auth, mock_get_supabase_client):
+        """Test bulk creation returns outcome/income pairs in request order."""
+        def _txn(txn_id, account_id, flow_type, paired_id):
+            return {
+                "id": txn_id,
+                "user_id": "test-user-id",
+                "account_id": account_id,
+                "category_id": "cat-transfer-uuid",
+                "flow_type": flow_type,
+                "amount": 100.00,
+                "date": "2025-11-03",
+                "description": None,
+                "paired_transaction_id": paired_id,
+                "created_at": "2025-11-03T10:00:00Z",
+                "updated_at": "2025-11-03T10:00:00Z"
+            }
+
+        mock_bulk.return_value = [
+            (_txn("t1-out", "acct-a", "outcome", "t1-in"), _txn("t1-in", "acct-b", "income", "t1-out")),
+            (_txn("t2-out", "acct-b", "outcome", "t2-in"), _txn("t2-in", "acct-a", "income", "t2-out")),
+        ]
+
+        response = client.post(
+            "/transfers/bulk",
+            json={
+                "transfers": [
+                    {"from_account_id": "acct-a", "to_account_id": "acct-b", "amount": 100.00, "date": "2025-11-03"},
+                    {"from_account_id": "acct-b", "to_account_id": "acct-a", "amount": 100.00, "date": "2025-11-03"}
+                ]
+            }
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["count"] == 2
+        assert [t["id"] for t in data["transactions"]] == ["t1-out", "t1-in", "t2-out", "t2-in"]
+        sent = mock_bulk.call_args.kwargs["transfers"]
+        assert [t["from_account_id"] for t in sent] == ["acct-a", "acct-b"]
+
+    @patch("backend.routes.transfers.transfer_service.create_transfers_bulk")
+    def test_create_transfers_bulk_invalid_account(self, mock_bulk, mock_auth, mock_get_supabase_client):
+        """Test that a batch with a foreign account is rejected as a whole."""
+        mock_bulk.side_effect = ValueError("Account not found or not accessible")
+
+        response = client.post(
+            "/transfers/bulk",
+            json={"transfers": [
+                {"from_account_id": "acct-a", "to_account_id": "acct-x", "amount": 10.00, "date": "2025-11-03"}
+            ]}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"] == "validation_error"
+
+    def test_create_transfers_bulk_empty_list(self, mock_auth, mock_get_supabase_client):
+        """Test that an empty batch fails request validation."""
+        response = client.post("/transfers/bulk", json={"transfers": []})
+
+        assert response.status_code == 422
+
 
 class TestCreateRecurringTransfer:
     """Tests for POST /transfers/recurring"""